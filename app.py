@@ -1,12 +1,18 @@
 import os
-import uuid
-import numpy as np
-import re
 import streamlit as st
-import requests
-import PyPDF2
-import docx
-from sentence_transformers import SentenceTransformer
+from jdcv.embeddings import EmbeddingService, load_encoder
+from jdcv.ann import ANNRetriever
+from jdcv.cache import ExtractionCache
+from jdcv.extraction import DocumentExtractor
+from jdcv.llm import MistralClient
+from jdcv.metrics import diagnostics
+from jdcv.parsing import DocumentParser, kind_for
+from jdcv.store import DocumentStore
+from jdcv.tasks import DocumentPipeline, TaskQueue
+from jdcv.ranking_book import RankingBook
+from jdcv.sharding import ShardedRanker
+from jdcv.skills import SkillIndex, hybrid_rank
+from jdcv.ranking import rank, WEIGHT_SKILLS, WEIGHT_EDUCATION, WEIGHT_REQUIREMENT, WEIGHT_EXPERIENCE
 
 # For local development, load .env only if not in production.
 if os.getenv("STREAMLIT_ENV") != "production":
@@ -20,13 +26,6 @@ if not API_KEY:
     st.error("MISTRAL_API_KEY not set in environment variables!")
     st.stop()
 
-# Mistral API configuration
-MISTRAL_URL = "https://api.mistral.ai/v1/chat/completions"
-HEADERS = {
-    "Authorization": f"Bearer {API_KEY}",
-    "Content-Type": "application/json"
-}
-
 # Set page configuration at the very beginning
 st.set_page_config(layout="wide", page_title="CV & Job Matching Platform", initial_sidebar_state="expanded")
 
@@ -125,179 +124,325 @@ notice_text = (
 st.markdown(f"<div class='notice-banner'>{notice_text}</div>", unsafe_allow_html=True)
 st.sidebar.markdown(f"<div class='sidebar-notice'>{notice_text}</div>", unsafe_allow_html=True)
 
-# Cache and load the embedding model so it only loads once
-@st.cache_resource
+# Local directory for persistent data (document store, extraction cache), shared with the FastAPI backend.
+DATA_DIR = os.environ.get("JDCV_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "jdcv_data"))
+
+# Encoder backend: "torch" (default), "onnx" or "onnx-int8" (quantized ONNX weights, CPU).
+EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "torch")
+EMBEDDING_ONNX_FILE = os.environ.get("EMBEDDING_ONNX_FILE")
+
 def load_model():
-    return SentenceTransformer("all-MiniLM-L6-v2")
-
-with st.spinner("Loading embedding model... This might take a moment."):
-    model = load_model()
-st.success("Embedding model loaded successfully!")
-
-# Initialize session_state storage for CVs and Jobs if not already present.
-if "cv_dict" not in st.session_state:
-    st.session_state.cv_dict = {}
-if "phone_cv_map" not in st.session_state:
-    st.session_state.phone_cv_map = {}
-if "job_dict" not in st.session_state:
-    st.session_state.job_dict = {}
-if "phone_job_map" not in st.session_state:
-    st.session_state.phone_job_map = {}
+    return load_encoder(EMBEDDING_BACKEND, EMBEDDING_ONNX_FILE)
+
+# Micro-batches encode calls from all sessions into one model.encode per time window.
+EMBEDDING_MAX_BATCH_SIZE = int(os.environ.get("EMBEDDING_MAX_BATCH_SIZE", "64"))
+EMBEDDING_MAX_WAIT = float(os.environ.get("EMBEDDING_MAX_WAIT", "0.005"))
+
+# The model loads and warms up on the service's worker thread, so the first page
+# renders immediately; only embedding calls wait for it.
+@st.cache_resource
+def get_embedding_service():
+    return EmbeddingService(loader=load_model, max_batch_size=EMBEDDING_MAX_BATCH_SIZE, max_wait=EMBEDDING_MAX_WAIT)
+
+embedding_service = get_embedding_service()
+
+# Opt-in: ask for all four facets in one JSON reply instead of four separate prompts.
+EXTRACTION_MODE = os.environ.get("EXTRACTION_MODE", "per_facet")
+STRUCTURED_EXTRACTION = EXTRACTION_MODE == "structured"
+# Upper bound (approximate tokens) on document text sent with each extraction prompt.
+LLM_MAX_INPUT_TOKENS = int(os.environ.get("LLM_MAX_INPUT_TOKENS", "8000"))
+
+# One pooled, retrying Mistral client shared by all sessions.
+@st.cache_resource
+def get_llm_client():
+    return MistralClient(API_KEY)
+
+llm_client = get_llm_client()
+
+# Process pool for PDF/DOCX parsing, so large resumes don't stall the script thread.
+@st.cache_resource
+def get_document_parser():
+    return DocumentParser()
+
+document_parser = get_document_parser()
+
+# Facet answers + embeddings keyed by document content, shared by all sessions.
+@st.cache_resource
+def get_extraction_cache():
+    return ExtractionCache(os.path.join(DATA_DIR, "extraction_cache.sqlite3"))
+
+extraction_cache = get_extraction_cache()
+
+# CVs and Jobs live in one on-disk store (memory-mapped facet matrices + metadata
+# table) shared by every session and by the FastAPI backend.
+# JDCV_EMBEDDING_DTYPE picks compact storage ("float16" / "int8") for a new data
+# directory; opening an existing store with a different dtype raises ValueError.
+@st.cache_resource
+def get_document_store():
+    return DocumentStore(DATA_DIR, dtype=os.environ.get("JDCV_EMBEDDING_DTYPE"))
+
+document_store = get_document_store()
+
+# Optional approximate shortlist (skills facet) + exact re-rank for very large CV pools.
+# ANN_BACKEND: "off", "ivf" (NumPy) or "hnsw" (needs hnswlib).
+ANN_BACKEND = os.environ.get("ANN_BACKEND", "off")
+ANN_MIN_POOL = int(os.environ.get("ANN_MIN_POOL", "50000"))
+ANN_SHORTLIST = int(os.environ.get("ANN_SHORTLIST", "2000"))
+ANN_NPROBE = int(os.environ.get("ANN_NPROBE", "8"))
+
+@st.cache_resource
+def get_cv_retriever():
+    if ANN_BACKEND == "off":
+        return None
+    params = {"n_probe": ANN_NPROBE} if ANN_BACKEND == "ivf" else {}
+    return ANNRetriever(document_store.cvs, backend=ANN_BACKEND, shortlist=ANN_SHORTLIST, **params)
+
+cv_retriever = get_cv_retriever()
+
+@st.cache_resource
+def get_job_retriever():
+    if ANN_BACKEND == "off":
+        return None
+    params = {"n_probe": ANN_NPROBE} if ANN_BACKEND == "ivf" else {}
+    return ANNRetriever(document_store.jobs, backend=ANN_BACKEND, shortlist=ANN_SHORTLIST, **params)
+
+job_retriever = get_job_retriever()
+
+# Exact ranking split over RANKING_SHARDS worker processes for CV pools of at least
+# SHARD_MIN_POOL documents (0 = off). Below that, one process is faster than the hand-off.
+RANKING_SHARDS = int(os.environ.get("RANKING_SHARDS", "0"))
+SHARD_MIN_POOL = int(os.environ.get("SHARD_MIN_POOL", "200000"))
+
+@st.cache_resource
+def get_sharded_ranker():
+    if RANKING_SHARDS <= 0:
+        return None
+    return ShardedRanker(document_store.cvs, shards=RANKING_SHARDS)
+
+sharded_ranker = get_sharded_ranker()
+
+# Number of matching jobs shown to a candidate right after CV submission.
+REVERSE_MATCH_TOP_K = int(os.environ.get("REVERSE_MATCH_TOP_K", "10"))
+
+MATCHING_WEIGHTS = {
+    "skills": WEIGHT_SKILLS,
+    "education": WEIGHT_EDUCATION,
+    "requirement": WEIGHT_REQUIREMENT,
+    "experience": WEIGHT_EXPERIENCE,
+}
+
+# Top RANKING_TOP_K candidates per job, kept current as CVs arrive instead of
+# re-ranking the whole pool each time a job's ranking is viewed.
+RANKING_TOP_K = int(os.environ.get("RANKING_TOP_K", "100"))
+
+@st.cache_resource
+def get_ranking_book():
+    return RankingBook(document_store, k=RANKING_TOP_K, weights=MATCHING_WEIGHTS)
+
+ranking_book = get_ranking_book()
+
+# Inverted index over the CVs' skills facet, for must-have skill filters and hybrid scoring.
+# HYBRID_ALPHA: share of BM25 skill-keyword score in the final score (0 = embeddings only).
+HYBRID_ALPHA = float(os.environ.get("HYBRID_ALPHA", "0"))
+
+@st.cache_resource
+def get_skill_index():
+    return SkillIndex(document_store.cvs)
+
+skill_index = get_skill_index()
+
+@st.cache_resource
+def get_document_extractor():
+    return DocumentExtractor(llm_client, embedding_service, extraction_cache, structured=STRUCTURED_EXTRACTION,
+                             max_input_tokens=LLM_MAX_INPUT_TOKENS)
+
+document_extractor = get_document_extractor()
 
 # For resetting forms using a unique key.
 if "cv_form_key" not in st.session_state:
     st.session_state.cv_form_key = 0
 if "job_form_key" not in st.session_state:
     st.session_state.job_form_key = 0
-
-# Shortcuts for session_state storage
-cv_dict = st.session_state.cv_dict
-job_dict = st.session_state.job_dict
-
-# Matching weights
-WEIGHT_SKILLS = 0.4
-WEIGHT_EDUCATION = 0.2
-WEIGHT_REQUIREMENT = 0.2
-WEIGHT_EXPERIENCE = 0.2
+# Background tasks submitted from this session.
+if "tasks" not in st.session_state:
+    st.session_state.tasks = []
 
 # -----------------------------
 # Utility Functions
 # -----------------------------
-def clean_text(text: str) -> str:
-    """Convert multiple spaces/newlines to a single space."""
-    text = re.sub(r'\n+', ' ', text)
-    text = re.sub(r' +', ' ', text).strip()
-    return text
-
-def format_llm_response(text: str) -> str:
+def perform_job_matching(job_entry: dict, top_k: int = None, must_have: list = None) -> list:
     """
-    Format the response from the LLM by splitting sentences and adding line breaks.
-    This function assumes the text is a plain string and improves its readability.
+    For the given job entry, match all submitted CVs.
+    Scores the whole CV pool with one matmul per facet (WEIGHT_* mix) and
+    returns a sorted list of candidate rankings (all CVs unless top_k is given).
+    With must_have skills, only CVs listing all of them are scored; with
+    HYBRID_ALPHA > 0, BM25 skill-keyword relevance is blended into the score.
+    Otherwise pools of SHARD_MIN_POOL CVs or more are scored exactly across the
+    shard worker processes, and top_k rankings of pools of ANN_MIN_POOL CVs or
+    more go through the ANN shortlist; ranking all CVs (top_k=None) is always exact.
     """
-    # Replace multiple spaces and ensure each sentence starts on a new line
-    sentences = text.split('. ')
-    sentences = [s.strip() for s in sentences if s]
-    formatted = '.<br>'.join(sentences)
-    return formatted
-
-def get_embedding(text: str):
-    """Generate an embedding for the given text."""
-    return model.encode(text).tolist()
-
-def cosine_similarity(vec1, vec2) -> float:
-    """Compute cosine similarity between two vectors."""
-    v1 = np.array(vec1)
-    v2 = np.array(vec2)
-    norm1 = np.linalg.norm(v1)
-    norm2 = np.linalg.norm(v2)
-    if norm1 == 0 or norm2 == 0:
-        return 0.0
-    return float(np.dot(v1, v2) / (norm1 * norm2))
-
-def query_extraction(question: str, text: str) -> str:
-    """Call the Mistral API to extract info from a CV."""
-    data = {
-        "model": "mistral-large-2411",
-        "messages": [
-            {"role": "system", "content": "You are an AI assistant that extracts useful insights from a CV."},
-            {"role": "user", "content": f"My CV:\n\n{text}\n\n{question}"}
-        ]
-    }
-    response = requests.post(MISTRAL_URL, headers=HEADERS, json=data)
-    if response.status_code == 200:
-        return response.json()["choices"][0]["message"]["content"]
-    else:
-        return None
-
-def query_extraction_jd(question: str, text: str) -> str:
-    """Call the Mistral API to extract info from a Job Description."""
-    data = {
-        "model": "mistral-large-2411",
-        "messages": [
-            {"role": "system", "content": "You are an AI assistant that extracts useful insights from a Job Description (JD)."},
-            {"role": "user", "content": f"My Job Description:\n\n{text}\n\n{question}"}
-        ]
-    }
-    response = requests.post(MISTRAL_URL, headers=HEADERS, json=data)
-    if response.status_code == 200:
-        return response.json()["choices"][0]["message"]["content"]
-    else:
-        return None
+    if must_have or HYBRID_ALPHA:
+        return hybrid_rank(document_store.cvs, job_entry, skill_index, must_have=must_have, alpha=HYBRID_ALPHA,
+                           k=top_k, weights=MATCHING_WEIGHTS)
+    if sharded_ranker is not None and len(document_store.cvs) >= SHARD_MIN_POOL:
+        return sharded_ranker.rank(job_entry, k=top_k, weights=MATCHING_WEIGHTS)
+    if top_k is not None and cv_retriever is not None and len(document_store.cvs) >= ANN_MIN_POOL:
+        return cv_retriever.rank(job_entry, k=top_k, weights=MATCHING_WEIGHTS)
+    return rank(document_store.cvs, job_entry, k=top_k, weights=MATCHING_WEIGHTS)
 
-def perform_job_matching(job_entry: dict) -> list:
+def perform_cv_matching(cv_entry: dict, top_k: int = REVERSE_MATCH_TOP_K) -> list:
     """
-    For the given job entry, match all submitted CVs.
-    Returns a sorted list of candidate rankings (all CVs included).
+    Reverse of perform_job_matching: rank all open jobs for the given CV entry with
+    the same weighted four-facet score. Returns [{"job_id", "score"}, ...], best first.
     """
-    ranking = []
-    for cv_id, cv_entry in cv_dict.items():
-        score = (
-            WEIGHT_SKILLS * cosine_similarity(job_entry["skills"]["embedding"], cv_entry["skills"]["embedding"]) +
-            WEIGHT_EDUCATION * cosine_similarity(job_entry["education"]["embedding"], cv_entry["education"]["embedding"]) +
-            WEIGHT_REQUIREMENT * cosine_similarity(job_entry["requirement"]["embedding"], cv_entry["requirement"]["embedding"]) +
-            WEIGHT_EXPERIENCE * cosine_similarity(job_entry["experience"]["embedding"], cv_entry["experience"]["embedding"])
-        )
-        ranking.append({"cv_id": cv_id, "score": score})
-    return sorted(ranking, key=lambda x: x["score"], reverse=True)
-
-cv_extraction_questions = {
-    "skills": "What are the skills from this CV?",
-    "education": "What are the educations from this CV?",
-    "requirement": "What are the requirements from this CV?",
-    "experience": "What are the experiences mentioned in this CV?"
-}
+    if top_k is not None and job_retriever is not None and len(document_store.jobs) >= ANN_MIN_POOL:
+        return job_retriever.rank(cv_entry, k=top_k, weights=MATCHING_WEIGHTS, id_key="job_id")
+    return rank(document_store.jobs, cv_entry, k=top_k, weights=MATCHING_WEIGHTS, id_key="job_id")
 
-job_extraction_questions = {
-    "skills": "What are the skills from this Job Description?",
-    "education": "What are the required educations for this job?",
-    "requirement": "What are the requirements for this job?",
-    "experience": "What are the required experiences for this job?"
-}
+def match_new_cv(cv_entry: dict, **options) -> list:
+    """Task-queue matcher for a freshly stored CV: update the indexes, then rank open jobs."""
+    if cv_retriever is not None:
+        cv_retriever.sync()
+    # Merge the new CV into every open job's top-k.
+    ranking_book.sync()
+    return perform_cv_matching(cv_entry)
 
-def extract_text_from_file(uploaded_file):
+def match_new_job(job_entry: dict, must_have: list = None) -> list:
     """
-    Extract text from an uploaded file.
-    Supports PDF, DOCX, and TXT.
+    Task-queue matcher for a freshly stored JD: rank CVs and seed the job's ranking.
+    The ranking book keeps the unfiltered embedding top-k, so a must-have or hybrid
+    ranking is returned to the uploader without replacing it.
     """
-    if uploaded_file is not None:
-        file_type = uploaded_file.type
-        if file_type == "application/pdf":
-            try:
-                pdf_reader = PyPDF2.PdfReader(uploaded_file)
-                text = ""
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                return text
-            except Exception:
-                st.error("Error reading PDF file.")
-                return None
-        elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            try:
-                doc = docx.Document(uploaded_file)
-                text = "\n".join([para.text for para in doc.paragraphs])
-                return text
-            except Exception:
-                st.error("Error reading DOCX file.")
-                return None
-        elif file_type == "text/plain":
-            try:
-                return uploaded_file.read().decode("utf-8")
-            except Exception:
-                st.error("Error reading text file.")
-                return None
-        else:
-            st.error("Unsupported file type!")
-            return None
-    return None
+    if job_retriever is not None:
+        job_retriever.sync()
+    ranking = perform_job_matching(job_entry, top_k=RANKING_TOP_K, must_have=must_have)
+    if must_have or HYBRID_ALPHA:
+        ranking_book.sync()
+    else:
+        ranking_book.merge_ranking(job_entry["id"], ranking)
+    return ranking
+
+# Uploads are processed by background workers; the forms only queue them.
+TASK_WORKERS = int(os.environ.get("TASK_WORKERS", "4"))
+# Interactive uploads go ahead of API / bulk submissions sharing the queue.
+UPLOAD_PRIORITY = 10
+
+@st.cache_resource
+def get_task_queue():
+    pipeline = DocumentPipeline(document_store, document_extractor, document_parser,
+                                matchers={"cv": match_new_cv, "jd": match_new_job})
+    return TaskQueue(os.path.join(DATA_DIR, "tasks.sqlite3"), pipeline, workers=TASK_WORKERS)
+
+task_queue = get_task_queue()
+
+def render_document_card(title: str, facets: dict):
+    st.markdown(
+        f"""
+        <div class="card">
+            <h4>{title}</h4>
+            <p><strong>Skills:</strong> {facets['skills']}</p>
+            <p><strong>Education:</strong> {facets['education']}</p>
+            <p><strong>Requirements:</strong> {facets['requirement']}</p>
+            <p><strong>Experience:</strong> {facets['experience']}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+# Result cards rendered per page of a ranking.
+RESULTS_PAGE_SIZE = int(os.environ.get("RESULTS_PAGE_SIZE", "10"))
+
+def turn_page(page_key: str, step: int):
+    # Button callbacks run before the rerun, so the page renders already turned.
+    st.session_state[page_key] += step
+
+def render_ranking(ranking: list, id_key: str, id_label: str, empty_message: str, key: str,
+                   min_score: float = None):
+    """Render one page of `ranking` (items scoring at least `min_score`) with previous / next buttons."""
+    if min_score is not None:
+        ranking = [item for item in ranking if item["score"] >= min_score]
+    if not ranking:
+        st.info(empty_message)
+        return
+    pages = -(-len(ranking) // RESULTS_PAGE_SIZE)
+    page_key = f"ranking_page_{key}"
+    page = st.session_state[page_key] = min(st.session_state.get(page_key, 0), pages - 1)
+    if pages > 1:
+        previous_col, position_col, next_col = st.columns([1, 2, 1])
+        previous_col.button("Previous", key=f"{page_key}_previous", disabled=page == 0,
+                            on_click=turn_page, args=(page_key, -1))
+        next_col.button("Next", key=f"{page_key}_next", disabled=page == pages - 1,
+                        on_click=turn_page, args=(page_key, 1))
+        position_col.caption(f"Page {page + 1} of {pages} ({len(ranking)} results)")
+    for item in ranking[page * RESULTS_PAGE_SIZE:(page + 1) * RESULTS_PAGE_SIZE]:
+        st.markdown(
+            f"""
+            <div class="card">
+                <p><strong>{id_label}:</strong> {item[id_key]}</p>
+                <p><strong>Matching Score:</strong> {item['score']:.3f}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+def parse_skills(text: str) -> list:
+    """Comma-separated skills from a form field, blanks dropped."""
+    return [skill.strip() for skill in text.split(",") if skill.strip()]
+
+def submit_upload(kind: str, phone: str, uploaded_file, label: str, options: dict = None):
+    """Queue an uploaded CV (kind="cv") or JD (kind="jd"); returns True if it was accepted."""
+    file_kind = kind_for(uploaded_file.name, uploaded_file.type)
+    if file_kind is None:
+        st.error("Unsupported file type!")
+        return False
+    task_id = task_queue.submit(kind, uploaded_file.getvalue(), file_kind, phone=phone, priority=UPLOAD_PRIORITY,
+                                options=options)
+    st.session_state.tasks.append({"task_id": task_id, "kind": kind, "label": f"{label}: {uploaded_file.name}"})
+    st.success(f"{label} received! It is being processed in the background; results appear below.")
+    return True
+
+@st.fragment(run_every=2)
+def show_tasks(kind: str):
+    """This session's uploads of one kind, newest first; refreshed every 2 seconds."""
+    for item in reversed([t for t in st.session_state.tasks if t["kind"] == kind]):
+        task = task_queue.status(item["task_id"])
+        if task is None:
+            continue
+        with st.expander(item["label"], expanded=task["status"] != "failed"):
+            if task["status"] == "failed":
+                st.error(task["error"])
+            elif task["status"] != "done":
+                retry = f" (retry {task['attempts'] - 1}: {task['error']})" if task["error"] else ""
+                st.info(f"{task['status'].capitalize()}: {task['stage'] or 'waiting'}{retry}")
+            elif kind == "cv":
+                render_document_card(f"CV ID: {task['doc_id']}", task["result"]["facets"])
+                st.subheader("Top Matching Jobs")
+                render_ranking(task["result"]["matches"], "job_id", "Job ID", "No matching jobs found.",
+                               key=item["task_id"])
+            else:
+                render_document_card(f"Job ID: {task['doc_id']}", task["result"]["facets"])
+                st.subheader("Candidate Ranking")
+                render_ranking(task["result"]["matches"], "cv_id", "CV ID", "No matching CVs found.",
+                               key=item["task_id"])
 
 # -----------------------------
 # User Interface
 # -----------------------------
 st.markdown("<h1 class='title'>Professional CV & Job Matching Platform</h1>", unsafe_allow_html=True)
 st.sidebar.title("Navigation")
-app_mode = st.sidebar.selectbox("Choose Mode", ["Submit CV", "Upload Job Description"])
+app_mode = st.sidebar.selectbox("Choose Mode", ["Submit CV", "Upload Job Description", "View Job Rankings"])
+st.sidebar.caption(f"Embedding model: {embedding_service.status}")
+cache_stats = extraction_cache.stats()
+st.sidebar.caption(
+    f"Extraction cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses, "
+    f"{cache_stats['entries']} documents"
+)
+if st.sidebar.checkbox("Show diagnostics", key="show_diagnostics"):
+    # Timings and counters of this Streamlit server process (see jdcv.metrics).
+    st.sidebar.dataframe(
+        [
+            {"metric": name, "labels": labels, "count": count,
+             "mean": mean, "p50 <=": p50, "p95 <=": p95}
+            for name, labels, count, mean, p50, p95 in diagnostics()
+        ],
+        hide_index=True,
+    )
 
 if app_mode == "Submit CV":
     st.markdown("<h2 class='section-header'>Submit Your CV</h2>", unsafe_allow_html=True)
@@ -311,54 +456,11 @@ if app_mode == "Submit CV":
         
         if submitted:
             if phone and cv_file:
-                extracted_text = extract_text_from_file(cv_file)
-                if not extracted_text:
-                    st.error("Failed to extract text from the uploaded file.")
-                else:
-                    cv_id = str(uuid.uuid4())
-                    cleaned_text = clean_text(extracted_text)
-                    extracted_info = {}
-                    extraction_failed = False
-                    
-                    for key, question in cv_extraction_questions.items():
-                        with st.spinner(f"Extracting {key} from CV..."):
-                            response_text = query_extraction(question, cleaned_text)
-                        if response_text is None:
-                            st.error(f"Extraction failed for {key}.")
-                            extraction_failed = True
-                            break
-                        # Clean, then format the response text for better readability.
-                        cleaned_response = clean_text(response_text)
-                        formatted_response = format_llm_response(cleaned_response)
-                        embedding = get_embedding(formatted_response)
-                        extracted_info[key] = {"text": formatted_response, "embedding": embedding}
-                    
-                    if not extraction_failed:
-                        cv_entry = {
-                            "id": cv_id,
-                            "cv_text": cleaned_text,
-                            "skills": extracted_info["skills"],
-                            "education": extracted_info["education"],
-                            "requirement": extracted_info["requirement"],
-                            "experience": extracted_info["experience"]
-                        }
-                        cv_dict[cv_id] = cv_entry
-                        st.session_state.phone_cv_map.setdefault(phone, []).append(cv_id)
-                        
-                        st.success("CV submitted successfully!")
-                        st.markdown(
-                            f"""
-                            <div class="card">
-                                <h4>CV ID: {cv_id}</h4>
-                                <p><strong>Skills:</strong> {cv_entry['skills']['text']}</p>
-                                <p><strong>Education:</strong> {cv_entry['education']['text']}</p>
-                                <p><strong>Requirements:</strong> {cv_entry['requirement']['text']}</p>
-                                <p><strong>Experience:</strong> {cv_entry['experience']['text']}</p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        st.session_state.cv_form_key += 1  # Reset form by incrementing key
+                if submit_upload("cv", phone, cv_file, "CV"):
+                    st.session_state.cv_form_key += 1  # Reset form by incrementing key
             else:
                 st.warning("Please fill in all fields and upload a file before submitting.")
+    show_tasks("cv")
                 
 elif app_mode == "Upload Job Description":
     st.markdown("<h2 class='section-header'>Upload Job Description</h2>", unsafe_allow_html=True)
@@ -368,71 +470,37 @@ elif app_mode == "Upload Job Description":
             job_phone = st.text_input("Phone Number", key="job_phone_input")
         with col2:
             jd_file = st.file_uploader("Upload Job Description (PDF, DOCX, or TXT)", type=["pdf", "docx", "txt"], key="jd_file_input")
+        must_have = st.text_input("Must-have skills (comma-separated, optional)", key="jd_must_have_input")
         submitted_job = st.form_submit_button("Submit Job Description")
         
         if submitted_job:
             if job_phone and jd_file:
-                extracted_text = extract_text_from_file(jd_file)
-                if not extracted_text:
-                    st.error("Failed to extract text from the uploaded file.")
-                else:
-                    job_id = str(uuid.uuid4())
-                    cleaned_text = clean_text(extracted_text)
-                    extracted_info = {}
-                    extraction_failed = False
-                    
-                    for key, question in job_extraction_questions.items():
-                        with st.spinner(f"Extracting {key} from Job Description..."):
-                            response_text = query_extraction_jd(question, cleaned_text)
-                        if response_text is None:
-                            st.error(f"Extraction failed for {key}.")
-                            extraction_failed = True
-                            break
-                        cleaned_response = clean_text(response_text)
-                        formatted_response = format_llm_response(cleaned_response)
-                        embedding = get_embedding(formatted_response)
-                        extracted_info[key] = {"text": formatted_response, "embedding": embedding}
-                    
-                    if not extraction_failed:
-                        job_entry = {
-                            "id": job_id,
-                            "jd_text": cleaned_text,
-                            "skills": extracted_info["skills"],
-                            "education": extracted_info["education"],
-                            "requirement": extracted_info["requirement"],
-                            "experience": extracted_info["experience"],
-                            "ranking": []
-                        }
-                        job_dict[job_id] = job_entry
-                        st.session_state.phone_job_map.setdefault(job_phone, []).append(job_id)
-                        
-                        ranking = perform_job_matching(job_entry)
-                        job_entry["ranking"] = ranking
-                        
-                        st.success("Job Description submitted successfully!")
-                        st.markdown(
-                            f"""
-                            <div class="card">
-                                <h4>Job ID: {job_id}</h4>
-                                <p><strong>Skills:</strong> {job_entry['skills']['text']}</p>
-                                <p><strong>Education:</strong> {job_entry['education']['text']}</p>
-                                <p><strong>Requirements:</strong> {job_entry['requirement']['text']}</p>
-                                <p><strong>Experience:</strong> {job_entry['experience']['text']}</p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        st.subheader("Candidate Ranking")
-                        if ranking:
-                            for candidate in ranking:
-                                st.markdown(
-                                    f"""
-                                    <div class="card">
-                                        <p><strong>CV ID:</strong> {candidate['cv_id']}</p>
-                                        <p><strong>Matching Score:</strong> {candidate['score']:.3f}</p>
-                                    </div>
-                                    """, unsafe_allow_html=True)
-                        else:
-                            st.info("No matching CVs found.")
-                        st.session_state.job_form_key += 1  # Reset form by incrementing key
+                skills = parse_skills(must_have)
+                options = {"must_have": skills} if skills else None
+                if submit_upload("jd", job_phone, jd_file, "Job Description", options=options):
+                    st.session_state.job_form_key += 1  # Reset form by incrementing key
             else:
                 st.warning("Please fill in all fields and upload a file before submitting.")
+    show_tasks("jd")
+
+elif app_mode == "View Job Rankings":
+    st.markdown("<h2 class='section-header'>Job Rankings</h2>", unsafe_allow_html=True)
+    rankings_phone = st.text_input("Phone Number used for the Job Description", key="rankings_phone_input")
+    rankings_must_have = parse_skills(
+        st.text_input("Must-have skills (comma-separated, optional)", key="rankings_must_have_input"))
+    rankings_min_score = st.number_input("Minimum matching score", min_value=0.0, max_value=1.0, value=0.0,
+                                         step=0.05, key="rankings_min_score_input")
+    if rankings_phone:
+        job_ids = document_store.jobs.ids_for_phone(rankings_phone)
+        if not job_ids:
+            st.info("No job descriptions found for this phone number.")
+        for job_id in job_ids:
+            st.subheader(f"Job ID: {job_id}")
+            if rankings_must_have:
+                # Filtered rankings are computed on demand; only CVs listing every skill are scored.
+                job_entry = document_store.jobs.get(job_id)
+                ranking = perform_job_matching(job_entry, top_k=RANKING_TOP_K, must_have=rankings_must_have)
+            else:
+                ranking = ranking_book.ranking(job_id)
+            render_ranking(ranking, "cv_id", "CV ID", "No matching CVs found.", key=job_id,
+                           min_score=rankings_min_score or None)
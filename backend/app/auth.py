@@ -1,4 +1,51 @@
-import random
+import os
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.otp import OTPDeliveryError, get_otp_sender, get_otp_store
+
+# Bearer token for operator-only routes (bulk import); those routes are disabled while unset.
+ADMIN_TOKEN = os.environ.get("JDCV_ADMIN_TOKEN")
+
 
 def generate_otp():
-    return str(random.randint(100000, 999999))
+    return str(100000 + secrets.randbelow(900000))
+
+
+async def send_login_otp(role: str, email: str) -> dict:
+    """Issue a fresh code for this login and deliver it; the login route's response body."""
+    otp = generate_otp()
+    await get_otp_store().issue(role, email, otp)
+    try:
+        delivered = await get_otp_sender().send(role, email, otp)
+    except OTPDeliveryError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    return {"message": "OTP sent", **delivered}
+
+
+async def ensure_user(db, model, email: str):
+    """
+    Create the Candidate / Recruiter row on first login. Returning users only cost
+    an indexed read; a concurrent first login for the same email loses the insert race
+    harmlessly.
+    """
+    if await db.scalar(select(model.id).where(model.email == email)) is not None:
+        return
+    db.add(model(email=email))
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+
+
+def require_admin(authorization: Optional[str] = Header(None)):
+    """FastAPI dependency: `Authorization: Bearer <JDCV_ADMIN_TOKEN>`."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=503, detail="Admin routes are disabled; set JDCV_ADMIN_TOKEN")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token", headers={"WWW-Authenticate": "Bearer"})
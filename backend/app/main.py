@@ -1,11 +1,27 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routers import recruiter, candidate, matching, extraction
-from app.database import engine
-from app import models
+from fastapi.responses import PlainTextResponse
+from app.routers import recruiters, candidates, matching, extractions
+from app.database import engine, init_models
+from app import models, services
+from jdcv.metrics import REGISTRY
 
-models.Base.metadata.create_all(bind=engine)
-app = FastAPI()
-app.include_router(recruiter.router, prefix="/recruiter", tags=["Recruiter"])
-app.include_router(candidate.router, prefix="/candidate", tags=["Candidate"])
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_models()
+    # Start loading the embedding model in the background; startup does not wait for it.
+    services.get_embedding_service()
+    yield
+    await engine.dispose()
+
+app = FastAPI(lifespan=lifespan)
+app.include_router(recruiters.router, prefix="/recruiter", tags=["Recruiter"])
+app.include_router(candidates.router, prefix="/candidate", tags=["Candidate"])
 app.include_router(matching.router, prefix="/matching", tags=["Matching"])
-app.include_router(extraction.router, prefix="/extraction", tags=["Extraction"])
+app.include_router(extractions.router, prefix="/extraction", tags=["Extraction"])
+@app.get("/health")
+def health():
+    return {"status": "ok", "embedding_model": services.get_embedding_service().status}
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -5,10 +5,12 @@ class Candidate(Base):
     __tablename__ = "candidates"
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True)
+    # Unused since OTPs moved to app.otp; kept so existing databases still match the model.
     otp = Column(String, index=True)
 
 class Recruiter(Base):
     __tablename__ = "recruiters"
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True)
+    # Unused since OTPs moved to app.otp; kept so existing databases still match the model.
     otp = Column(String, index=True)
@@ -0,0 +1,223 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import smtplib
+import sqlite3
+import threading
+import time
+from email.message import EmailMessage
+from functools import lru_cache
+
+# Seconds an issued OTP stays valid, and wrong guesses allowed before it is revoked.
+OTP_TTL_SECONDS = int(os.environ.get("OTP_TTL_SECONDS", "300"))
+OTP_MAX_ATTEMPTS = int(os.environ.get("OTP_MAX_ATTEMPTS", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+class OTPDeliveryError(RuntimeError):
+    """The code could not be sent (delivery not configured or the mail server failed)."""
+
+
+def _digest(otp: str) -> str:
+    return hashlib.sha256(otp.encode()).hexdigest()
+
+
+class MemoryOTPStore:
+    """
+    OTPs in a dict, for a single worker process (or tests). Expired entries are
+    dropped lazily and on every `issue`, so the dict stays bounded by active logins.
+    """
+
+    def __init__(self, ttl: float = OTP_TTL_SECONDS, max_attempts: int = OTP_MAX_ATTEMPTS):
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self._codes = {}
+        self._lock = threading.Lock()
+
+    async def issue(self, role: str, email: str, otp: str):
+        now = time.time()
+        with self._lock:
+            for key in [key for key, (_, expires_at, _) in self._codes.items() if expires_at <= now]:
+                del self._codes[key]
+            self._codes[(role, email)] = (_digest(otp), now + self.ttl, 0)
+
+    async def verify(self, role: str, email: str, otp: str) -> bool:
+        """True (and the OTP is used up) if `otp` is the live code for this login."""
+        with self._lock:
+            entry = self._codes.get((role, email))
+            if entry is None or entry[1] <= time.time():
+                self._codes.pop((role, email), None)
+                return False
+            digest, expires_at, attempts = entry
+            if hmac.compare_digest(digest, _digest(otp)):
+                del self._codes[(role, email)]
+                return True
+            if attempts + 1 >= self.max_attempts:
+                del self._codes[(role, email)]
+            else:
+                self._codes[(role, email)] = (digest, expires_at, attempts + 1)
+            return False
+
+
+class SQLiteOTPStore:
+    """
+    OTPs in their own SQLite file (WAL), shared by every API worker process and
+    kept out of the candidates / recruiters tables. Only a digest of each code is
+    stored; `expires_at` is indexed so the periodic purge is a range delete.
+    Calls run in a thread so the event loop never waits on the file lock.
+    """
+
+    def __init__(self, path: str, ttl: float = OTP_TTL_SECONDS, max_attempts: int = OTP_MAX_ATTEMPTS,
+                 purge_interval: float = 60.0):
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self.purge_interval = purge_interval
+        self._last_purge = 0.0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS otp_codes ("
+            " role TEXT NOT NULL,"
+            " email TEXT NOT NULL,"
+            " digest TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (role, email))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS otp_codes_expiry ON otp_codes (expires_at)")
+
+    def _issue(self, role: str, email: str, otp: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO otp_codes (role, email, digest, expires_at, attempts) VALUES (?, ?, ?, ?, 0)"
+                " ON CONFLICT (role, email) DO UPDATE SET digest = excluded.digest,"
+                " expires_at = excluded.expires_at, attempts = 0",
+                (role, email, _digest(otp), now + self.ttl),
+            )
+            if now - self._last_purge >= self.purge_interval:
+                self._conn.execute("DELETE FROM otp_codes WHERE expires_at <= ?", (now,))
+                self._last_purge = now
+
+    def _verify(self, role: str, email: str, otp: str) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT digest, expires_at, attempts FROM otp_codes WHERE role = ? AND email = ?", (role, email)
+                ).fetchone()
+                ok = False
+                if row is not None:
+                    digest, expires_at, attempts = row
+                    expired = expires_at <= time.time()
+                    ok = not expired and hmac.compare_digest(digest, _digest(otp))
+                    if ok or expired or attempts + 1 >= self.max_attempts:
+                        self._conn.execute("DELETE FROM otp_codes WHERE role = ? AND email = ?", (role, email))
+                    else:
+                        self._conn.execute(
+                            "UPDATE otp_codes SET attempts = attempts + 1 WHERE role = ? AND email = ?", (role, email))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return ok
+
+    async def issue(self, role: str, email: str, otp: str):
+        await asyncio.to_thread(self._issue, role, email, otp)
+
+    async def verify(self, role: str, email: str, otp: str) -> bool:
+        """True (and the OTP is used up) if `otp` is the live code for this login."""
+        return await asyncio.to_thread(self._verify, role, email, otp)
+
+
+@lru_cache(maxsize=None)
+def get_otp_store():
+    """OTP_STORE=sqlite (default, shared by all workers; file OTP_DB_PATH) or memory (single process)."""
+    if os.environ.get("OTP_STORE", "sqlite") == "memory":
+        return MemoryOTPStore()
+    return SQLiteOTPStore(os.environ.get("OTP_DB_PATH", "./otp.db"))
+
+
+class EmailOTPSender:
+    """Mails the code through an SMTP server (STARTTLS unless SMTP_STARTTLS=0)."""
+
+    def __init__(self, host: str, port: int = 587, sender: str = None, username: str = None, password: str = None,
+                 starttls: bool = True, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.sender = sender or username
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def _send(self, role: str, email: str, otp: str):
+        message = EmailMessage()
+        message["Subject"] = "Your login code"
+        message["From"] = self.sender
+        message["To"] = email
+        message.set_content(f"Your {role} login code is {otp}. It expires in {OTP_TTL_SECONDS // 60} minutes.")
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            smtp.send_message(message)
+
+    async def send(self, role: str, email: str, otp: str) -> dict:
+        try:
+            await asyncio.to_thread(self._send, role, email, otp)
+        except (OSError, smtplib.SMTPException) as exc:
+            raise OTPDeliveryError(f"Could not send the login code: {exc}") from exc
+        return {}
+
+
+class LogOTPSender:
+    """Development only: writes the code to the server log."""
+
+    async def send(self, role: str, email: str, otp: str) -> dict:
+        logger.warning("Login code for %s %s: %s", role, email, otp)
+        return {}
+
+
+class ResponseOTPSender:
+    """Development and load testing only: returns the code in the login response as `otp`."""
+
+    async def send(self, role: str, email: str, otp: str) -> dict:
+        return {"otp": otp}
+
+
+class UnconfiguredOTPSender:
+    async def send(self, role: str, email: str, otp: str) -> dict:
+        raise OTPDeliveryError("OTP delivery is not configured; set SMTP_HOST (or OTP_DELIVERY=log in development)")
+
+
+@lru_cache(maxsize=None)
+def get_otp_sender():
+    """
+    OTP_DELIVERY=email (default; SMTP_HOST, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD,
+    SMTP_FROM), or the development-only log / response modes.
+    """
+    delivery = os.environ.get("OTP_DELIVERY", "email")
+    if delivery == "log":
+        return LogOTPSender()
+    if delivery == "response":
+        logger.warning("OTP_DELIVERY=response: login codes are returned to the client; never use in production")
+        return ResponseOTPSender()
+    if delivery != "email":
+        raise ValueError(f"Unknown OTP_DELIVERY {delivery!r}; expected email, log or response")
+    if not os.environ.get("SMTP_HOST"):
+        return UnconfiguredOTPSender()
+    return EmailOTPSender(
+        os.environ["SMTP_HOST"],
+        int(os.environ.get("SMTP_PORT", "587")),
+        sender=os.environ.get("SMTP_FROM"),
+        username=os.environ.get("SMTP_USERNAME"),
+        password=os.environ.get("SMTP_PASSWORD"),
+        starttls=os.environ.get("SMTP_STARTTLS", "1") != "0",
+    )
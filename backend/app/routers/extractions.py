@@ -1,7 +1,56 @@
-from fastapi import APIRouter
-from app import schemas
+import os
+from fastapi import APIRouter, Depends, HTTPException
+from app import auth, schemas, services
 router = APIRouter()
-@router.post("/process", response_model=schemas.ExtractionResponse)
+# Longest a status request may block waiting for its task to finish.
+MAX_WAIT_SECONDS = 30.0
+def get_task_queue():
+    try:
+        return services.get_task_queue()
+    except RuntimeError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+@router.post("/process", response_model=schemas.TaskResponse, status_code=202)
 def process_extraction(data: schemas.ExtractionRequest):
-    extracted = {"skills": "extracted", "experience": "extracted", "qualifications": "extracted"}
-    return {"extracted_data": extracted}
+    """Queue a CV/JD text for extraction, embedding, storage and matching; returns at once."""
+    if data.kind not in ("cv", "jd"):
+        raise HTTPException(status_code=400, detail="kind must be 'cv' or 'jd'")
+    queue = get_task_queue()
+    options = {"must_have": data.must_have} if data.must_have else None
+    task_id = queue.submit(data.kind, data.document.encode("utf-8"), "txt", phone=data.phone, priority=data.priority,
+                           options=options)
+    return queue.status(task_id)
+@router.get("/tasks/{task_id}", response_model=schemas.TaskResponse)
+def task_status(task_id: str, wait: float = 0.0):
+    """Task status and, once done, its result; `wait` long-polls up to MAX_WAIT_SECONDS."""
+    queue = get_task_queue()
+    task = queue.wait(task_id, timeout=min(wait, MAX_WAIT_SECONDS)) if wait > 0 else queue.status(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+@router.post("/bulk-import", response_model=schemas.BulkImportJob, status_code=202,
+             dependencies=[Depends(auth.require_admin)])
+def bulk_import(data: schemas.BulkImportRequest):
+    """
+    Start importing a directory or zip of CVs/JDs under BULK_IMPORT_ROOT (`path` is
+    relative to it) in the background; poll GET /bulk-import/{run_id} for the report.
+    """
+    if data.kind not in ("cv", "jd"):
+        raise HTTPException(status_code=400, detail="kind must be 'cv' or 'jd'")
+    try:
+        path = services.resolve_import_path(data.path)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Path not found")
+    try:
+        run_id = services.submit_bulk_import(path, data.kind, data.phone)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    return services.get_import_journal().get_run(run_id)
+@router.get("/bulk-import/{run_id}", response_model=schemas.BulkImportJob, dependencies=[Depends(auth.require_admin)])
+def bulk_import_status(run_id: str):
+    """Status of an import run and, once done, its throughput / stage latency / failure report."""
+    run = services.get_import_journal().get_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Import run not found")
+    return run
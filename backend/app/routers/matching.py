@@ -1,10 +1,87 @@
-from fastapi import APIRouter
-from app import schemas
-import numpy as np
+import itertools
+import json
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from app import schemas, services
+from jdcv.pagination import RankedResults
+from jdcv.ranking import rank, score_pair
+from jdcv.skills import hybrid_rank
+from jdcv.tasks import FacetExtractionError
 router = APIRouter()
+# Handlers are plain `def`, so FastAPI runs the LLM calls, encoder and matrix math
+# in its threadpool instead of on the event loop.
+def job_entry_for(job_description: str) -> dict:
+    """The JD's extracted facets, scored facet to facet against each CV's."""
+    try:
+        return services.extract_job_description(job_description)
+    except FacetExtractionError as exc:
+        raise HTTPException(status_code=502, detail=str(exc))
+    except RuntimeError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
 @router.post("/run", response_model=schemas.MatchingResponse)
 def run_matching(data: schemas.MatchingRequest):
-    vec1 = np.random.rand(768)
-    vec2 = np.random.rand(768)
-    cosine_similarity = np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
-    return {"similarity_score": float(cosine_similarity)}
+    candidate = services.get_store().cvs.get(data.candidate_id)
+    if candidate is None:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    job_entry = job_entry_for(data.job_description)
+    return {"similarity_score": score_pair(job_entry, candidate)}
+@router.post("/rank", response_model=schemas.MatchingBatchResponse)
+def rank_candidates(data: schemas.MatchingBatchRequest):
+    cvs = services.get_store().cvs
+    rows = cvs.rows_for(data.candidate_ids) if data.candidate_ids is not None else None
+    if not 0.0 <= data.alpha <= 1.0:
+        raise HTTPException(status_code=400, detail="alpha must be between 0 and 1")
+    job_entry = job_entry_for(data.job_description)
+    if data.must_have or data.alpha:
+        # Must-have skills narrow the pool before scoring; alpha blends in BM25 over CV skills.
+        ranking = hybrid_rank(cvs, job_entry, services.get_skill_index(), must_have=data.must_have,
+                              alpha=data.alpha, k=data.top_k, id_key="candidate_id", rows=rows)
+    else:
+        ranking = rank(cvs, job_entry, k=data.top_k, rows=rows, id_key="candidate_id")
+    return {"results": [{"candidate_id": r["candidate_id"], "similarity_score": r["score"]} for r in ranking]}
+# Largest page a client may ask for; stream for more.
+MAX_PAGE_SIZE = 500
+def ranked_results(data: schemas.RankingPageRequest) -> RankedResults:
+    cvs = services.get_store().cvs
+    rows = cvs.rows_for(data.candidate_ids) if data.candidate_ids is not None else None
+    job_entry = job_entry_for(data.job_description)
+    return RankedResults(cvs, job_entry, id_key="candidate_id", limit=data.top_k, min_score=data.min_score, rows=rows)
+def candidate_result(item: dict) -> dict:
+    return {"candidate_id": item["candidate_id"], "similarity_score": item["score"]}
+@router.post("/rank/page", response_model=schemas.RankingPageResponse)
+def rank_candidates_page(data: schemas.RankingPageRequest):
+    """One page of the ranking; pass `next_cursor` back as `cursor` for the following page."""
+    if not 1 <= data.page_size <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+    try:
+        page = ranked_results(data).page(data.cursor, data.page_size)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"results": [candidate_result(item) for item in page["items"]], "next_cursor": page["next_cursor"]}
+@router.post("/rank/stream")
+def rank_candidates_stream(data: schemas.RankingPageRequest):
+    """
+    The whole ranking (up to top_k, above min_score) as NDJSON, one candidate per line,
+    produced page_size rows at a time so the first results go out before the rest are sorted.
+    """
+    if not 1 <= data.page_size <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+    # Later pages are slices of one sort of the scored rows, not a new selection each.
+    pages = ranked_results(data).iter_pages(data.page_size, data.cursor)
+    try:
+        first = next(pages)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    def lines():
+        for page in itertools.chain([first], pages):
+            for item in page["items"]:
+                yield json.dumps(candidate_result(item)) + "\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+@router.post("/jobs", response_model=schemas.JobMatchingResponse)
+def rank_jobs(data: schemas.JobMatchingRequest):
+    store = services.get_store()
+    candidate = store.cvs.get(data.candidate_id)
+    if candidate is None:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    ranking = rank(store.jobs, candidate, k=data.top_k, id_key="job_id")
+    return {"results": [{"job_id": r["job_id"], "similarity_score": r["score"]} for r in ranking]}
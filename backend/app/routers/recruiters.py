@@ -1,29 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import schemas, models, auth
-from app.database import SessionLocal
+from app.database import get_db
+from app.otp import get_otp_store
 router = APIRouter()
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 @router.post("/login")
-def recruiter_login(data: schemas.OTPRequest, db: Session = Depends(get_db)):
-    user = db.query(models.Recruiter).filter(models.Recruiter.email == data.email).first()
-    if not user:
-        user = models.Recruiter(email=data.email, otp=auth.generate_otp())
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-    else:
-        user.otp = auth.generate_otp()
-        db.commit()
-    return {"message": "OTP sent"}
+async def recruiter_login(data: schemas.OTPRequest, db: AsyncSession = Depends(get_db)):
+    await auth.ensure_user(db, models.Recruiter, data.email)
+    return await auth.send_login_otp("recruiter", data.email)
 @router.post("/verify")
-def recruiter_verify(data: schemas.OTPVerify, db: Session = Depends(get_db)):
-    user = db.query(models.Recruiter).filter(models.Recruiter.email == data.email).first()
-    if user and user.otp == data.otp:
+async def recruiter_verify(data: schemas.OTPVerify):
+    # OTPs live in the TTL store (app.otp); verification never touches the recruiters table.
+    if await get_otp_store().verify("recruiter", data.email, data.otp):
         return {"message": "Login successful"}
     raise HTTPException(status_code=400, detail="Invalid OTP")
@@ -1,3 +1,4 @@
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 class OTPRequest(BaseModel):
     email: str
@@ -5,11 +6,73 @@ class OTPVerify(BaseModel):
     email: str
     otp: str
 class MatchingRequest(BaseModel):
-    candidate_id: int
+    candidate_id: str
     job_description: str
 class MatchingResponse(BaseModel):
     similarity_score: float
+class MatchingBatchRequest(BaseModel):
+    job_description: str
+    candidate_ids: Optional[List[str]] = None
+    top_k: int = 10
+    must_have: Optional[List[str]] = None
+    alpha: float = 0.0
+class RankedCandidate(BaseModel):
+    candidate_id: str
+    similarity_score: float
+class MatchingBatchResponse(BaseModel):
+    results: List[RankedCandidate]
+class RankingPageRequest(BaseModel):
+    job_description: str
+    candidate_ids: Optional[List[str]] = None
+    page_size: int = 20
+    cursor: Optional[str] = None
+    min_score: Optional[float] = None
+    top_k: Optional[int] = None
+class RankingPageResponse(BaseModel):
+    results: List[RankedCandidate]
+    next_cursor: Optional[str] = None
+class JobMatchingRequest(BaseModel):
+    candidate_id: str
+    top_k: int = 10
+class RankedJob(BaseModel):
+    job_id: str
+    similarity_score: float
+class JobMatchingResponse(BaseModel):
+    results: List[RankedJob]
 class ExtractionRequest(BaseModel):
     document: str
-class ExtractionResponse(BaseModel):
-    extracted_data: dict
+    kind: str = "cv"
+    phone: Optional[str] = None
+    priority: int = 0
+    must_have: Optional[List[str]] = None
+class TaskResponse(BaseModel):
+    task_id: str
+    kind: str
+    status: str
+    stage: Optional[str] = None
+    doc_id: str
+    attempts: int
+    error: Optional[str] = None
+    result: Optional[dict] = None
+class BulkImportRequest(BaseModel):
+    path: str
+    kind: str = "cv"
+    phone: Optional[str] = None
+class BulkImportReport(BaseModel):
+    documents: int
+    imported: int
+    skipped: int
+    failed: int
+    elapsed_s: float
+    docs_per_sec: float
+    stages: Dict[str, dict]
+    failures: List[dict]
+class BulkImportJob(BaseModel):
+    run_id: str
+    path: str
+    kind: str
+    status: str
+    report: Optional[BulkImportReport] = None
+    error: Optional[str] = None
+    created_at: float
+    finished_at: Optional[float] = None
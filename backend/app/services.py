@@ -0,0 +1,138 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# The shared jdcv package lives at the repository root, next to the Streamlit app.
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from jdcv.bulk_import import BulkImporter, ImportJournal, is_within
+from jdcv.cache import ExtractionCache
+from jdcv.embeddings import EmbeddingService, load_encoder
+from jdcv.extraction import DocumentExtractor, clean_text
+from jdcv.llm import MistralClient
+from jdcv.parsing import DocumentParser
+from jdcv.sections import split_sections
+from jdcv.skills import SkillIndex, hybrid_rank
+from jdcv.store import DocumentStore
+from jdcv.tasks import DocumentPipeline, FacetExtractionError, TaskQueue
+
+# Same directory the Streamlit app writes to, so both read one pool of CVs and jobs.
+DATA_DIR = os.environ.get("JDCV_DATA_DIR", os.path.join(REPO_ROOT, "jdcv_data"))
+# /extraction/bulk-import only reads directories and zip archives under this one.
+BULK_IMPORT_ROOT = os.environ.get("BULK_IMPORT_ROOT", os.path.join(DATA_DIR, "imports"))
+
+
+@lru_cache(maxsize=None)
+def get_store() -> DocumentStore:
+    return DocumentStore(DATA_DIR, dtype=os.environ.get("JDCV_EMBEDDING_DTYPE"))
+
+
+def load_model():
+    return load_encoder(os.environ.get("EMBEDDING_BACKEND", "torch"), os.environ.get("EMBEDDING_ONNX_FILE"))
+
+
+@lru_cache(maxsize=None)
+def get_embedding_service() -> EmbeddingService:
+    """
+    One encoder per worker process. Created at startup (see main.lifespan) and
+    loaded in the background, so routes that do not embed are served meanwhile.
+    """
+    return EmbeddingService(loader=load_model)
+
+
+@lru_cache(maxsize=256)
+def extract_job_description(text: str) -> dict:
+    """
+    Job entry for a raw JD: its four facets are extracted and embedded exactly as
+    for an uploaded JD, so scores compare facet to facet like the Streamlit app's.
+    Repeats come from the extraction cache (and this one, for paging through a
+    ranking). Raises FacetExtractionError if a facet could not be extracted.
+    """
+    extracted_info, failed_facet = get_document_extractor().extract(
+        clean_text(text), "jd", sections=split_sections(text))
+    if extracted_info is None:
+        raise FacetExtractionError(f"Extraction failed for {failed_facet}.")
+    return extracted_info
+
+
+@lru_cache(maxsize=None)
+def get_skill_index() -> SkillIndex:
+    return SkillIndex(get_store().cvs)
+
+
+def match_new_job(job_entry: dict, must_have: list = None) -> list:
+    """Task-queue matcher for a new JD: top RANKING_TOP_K CVs, restricted to `must_have` skills if given."""
+    return hybrid_rank(get_store().cvs, job_entry, get_skill_index(), must_have=must_have,
+                       alpha=float(os.environ.get("HYBRID_ALPHA", "0")),
+                       k=int(os.environ.get("RANKING_TOP_K", "100")))
+
+
+@lru_cache(maxsize=None)
+def get_llm_client() -> MistralClient:
+    api_key = os.environ.get("MISTRAL_API_KEY")
+    if not api_key:
+        raise RuntimeError("MISTRAL_API_KEY not set in environment variables!")
+    return MistralClient(api_key, max_concurrency=16)
+
+
+@lru_cache(maxsize=None)
+def get_document_extractor() -> DocumentExtractor:
+    cache = ExtractionCache(os.path.join(DATA_DIR, "extraction_cache.sqlite3"))
+    structured = os.environ.get("EXTRACTION_MODE", "per_facet") == "structured"
+    return DocumentExtractor(get_llm_client(), get_embedding_service(), cache, structured=structured,
+                             max_input_tokens=int(os.environ.get("LLM_MAX_INPUT_TOKENS", "8000")))
+
+
+@lru_cache(maxsize=None)
+def get_document_parser() -> DocumentParser:
+    return DocumentParser()
+
+
+@lru_cache(maxsize=None)
+def get_import_journal() -> ImportJournal:
+    return ImportJournal(os.path.join(DATA_DIR, "bulk_import.sqlite3"))
+
+
+def resolve_import_path(path: str) -> str:
+    """`path` (relative to BULK_IMPORT_ROOT) resolved; ValueError if it leaves the import root."""
+    root = os.path.realpath(BULK_IMPORT_ROOT)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if not is_within(resolved, root):
+        raise ValueError("Path is outside the import directory")
+    return resolved
+
+
+@lru_cache(maxsize=None)
+def get_import_executor() -> ThreadPoolExecutor:
+    # One run at a time; each run already extracts documents concurrently.
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="bulk-import-run")
+
+
+def submit_bulk_import(path: str, kind: str, phone: str = None) -> str:
+    """Queue an import of the resolved `path` in the background; returns the run ID to poll."""
+    extractor = get_document_extractor()
+    journal = get_import_journal()
+    run_id = journal.start_run(path, kind)
+
+    def run():
+        journal.update_run(run_id, "running")
+        try:
+            importer = BulkImporter(get_store(), extractor, get_document_parser(), journal, kind=kind, phone=phone)
+            journal.update_run(run_id, "done", report=importer.run(path))
+        except Exception as exc:
+            journal.update_run(run_id, "failed", error=str(exc))
+
+    get_import_executor().submit(run)
+    return run_id
+
+
+@lru_cache(maxsize=None)
+def get_task_queue() -> TaskQueue:
+    """Background workers for /extraction/process; shares tasks.sqlite3 with the Streamlit app."""
+    pipeline = DocumentPipeline(get_store(), get_document_extractor(), get_document_parser(),
+                                matchers={"jd": match_new_job})
+    return TaskQueue(os.path.join(DATA_DIR, "tasks.sqlite3"), pipeline,
+                     workers=int(os.environ.get("TASK_WORKERS", "4")))
@@ -0,0 +1,61 @@
+"""
+Recall@k and latency of ANN retrieval (jdcv.ann) against the exact ranking.
+
+    python -m benchmarks.ann_recall --pool-size 200000 --probes 4 8 16 32
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import facet_entries, facet_pool
+from jdcv.ann import ANNRetriever
+from jdcv.ranking import rank
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool-size", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--shortlist", type=int, default=2000)
+    parser.add_argument("--backend", choices=["ivf", "hnsw"], default="ivf")
+    parser.add_argument("--probes", type=int, nargs="+", default=[4, 8, 16, 32],
+                        help="n_probe values (IVF) or ef values (HNSW) to sweep")
+    args = parser.parse_args()
+
+    pool = facet_pool(args.pool_size, args.dim)
+    jobs = facet_entries(args.queries, args.dim)
+
+    start = time.perf_counter()
+    exact = [[r["cv_id"] for r in rank(pool, job, k=args.k)] for job in jobs]
+    exact_ms = (time.perf_counter() - start) * 1000 / len(jobs)
+
+    for probe in args.probes:
+        params = {"ef": probe} if args.backend == "hnsw" else {"n_probe": probe}
+        retriever = ANNRetriever(pool, backend=args.backend, shortlist=args.shortlist, **params)
+        start = time.perf_counter()
+        retriever.sync()
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        approx = [[r["cv_id"] for r in retriever.rank(job, k=args.k)] for job in jobs]
+        ann_ms = (time.perf_counter() - start) * 1000 / len(jobs)
+
+        recall = np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(approx, exact)])
+        print(json.dumps({
+            "backend": args.backend,
+            "pool_size": args.pool_size,
+            "param": probe,
+            "shortlist": args.shortlist,
+            f"recall@{args.k}": round(float(recall), 4),
+            "build_s": round(build_s, 3),
+            "ann_ms_per_query": round(ann_ms, 3),
+            "exact_ms_per_query": round(exact_ms, 3),
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Load test for the OTP login / verify routes of the FastAPI backend.
+
+    python -m benchmarks.auth_load --in-process --users 500 --concurrency 100
+    python -m benchmarks.auth_load --url http://127.0.0.1:8000 --users 2000 --concurrency 200
+
+Each simulated user logs in (POST /{role}/login) and then verifies
+(POST /{role}/verify) with the code it was sent, with at most --concurrency requests
+in flight. Codes are read from the login response, so the server must run with the
+development-only OTP_DELIVERY=response; --in-process runs the app through httpx's
+ASGI transport and sets it. If a login response carries no code, a wrong one is
+sent (same lookup path, 400). Prints throughput, latency percentiles and status
+counts per route as JSON.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+import httpx
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+# Sent when the server does not return codes (OTP_DELIVERY other than response).
+WRONG_OTP = "000000"
+
+
+def percentiles(seconds) -> dict:
+    ms = np.asarray(seconds) * 1000
+    return {f"p{q}_ms": round(float(np.percentile(ms, q)), 2) for q in (50, 95, 99)}
+
+
+async def run(client: httpx.AsyncClient, args) -> dict:
+    limit = asyncio.Semaphore(args.concurrency)
+    latencies = {"login": [], "verify": []}
+    statuses = {"login": Counter(), "verify": Counter()}
+
+    async def call(route: str, payload: dict) -> dict:
+        async with limit:
+            started = time.perf_counter()
+            body = {}
+            try:
+                response = await client.post(f"/{args.role}/{route}", json=payload)
+                status = response.status_code
+                if status == 200:
+                    body = response.json()
+            except httpx.HTTPError as exc:
+                status = type(exc).__name__
+            latencies[route].append(time.perf_counter() - started)
+            statuses[route][str(status)] += 1
+            return body
+
+    async def user(i: int):
+        email = f"loadtest-{args.run_id}-{i}@example.com"
+        otp = WRONG_OTP
+        for _ in range(args.logins_per_user):
+            otp = (await call("login", {"email": email})).get("otp", WRONG_OTP)
+        await call("verify", {"email": email, "otp": otp})
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(args.users)))
+    elapsed = time.perf_counter() - started
+    return {
+        "users": args.users,
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_sec": round(sum(map(len, latencies.values())) / elapsed, 1),
+        **{route: {"requests": len(latencies[route]), **percentiles(latencies[route]),
+                   "statuses": dict(statuses[route])} for route in latencies},
+    }
+
+
+async def main_async(args) -> dict:
+    if not args.in_process:
+        async with httpx.AsyncClient(base_url=args.url, timeout=60,
+                                     limits=httpx.Limits(max_connections=args.concurrency)) as client:
+            return await run(client, args)
+
+    os.environ["OTP_DELIVERY"] = "response"
+    sys.path.insert(0, BACKEND_DIR)
+    from app.main import app, lifespan
+
+    async with lifespan(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest",
+                                     timeout=60) as client:
+            return await run(client, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--in-process", action="store_true", help="run the app in this process (ASGI transport)")
+    parser.add_argument("--role", choices=["candidate", "recruiter"], default="candidate")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--logins-per-user", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--run-id", default=str(int(time.time())), help="email prefix; new users by default")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Synthetic CV / Job Description corpora: plain text plus PDF, DOCX and TXT files.
+
+Texts are assembled from fixed vocabularies with a seeded RNG, so the same
+(n, seed) always yields the same corpus. PDFs are written directly (Helvetica,
+one text stream per page) so generating them needs no extra dependency.
+"""
+import os
+
+import numpy as np
+
+SKILLS = [
+    "Python", "Java", "Go", "Rust", "TypeScript", "React", "SQL", "PostgreSQL", "MongoDB", "Docker",
+    "Kubernetes", "Terraform", "AWS", "GCP", "Azure", "Spark", "Kafka", "Airflow", "PyTorch",
+    "TensorFlow", "scikit-learn", "pandas", "NumPy", "FastAPI", "Django", "Flask", "GraphQL",
+    "REST APIs", "CI/CD", "Linux", "Git", "Tableau", "Power BI", "Excel", "Figma", "Agile", "Scrum",
+]
+DEGREES = [
+    "Bachelor of Science in Computer Science", "Bachelor of Engineering in Electronics",
+    "Master of Science in Data Science", "Master of Business Administration",
+    "Bachelor of Arts in Economics", "PhD in Machine Learning", "Master of Science in Statistics",
+]
+ROLES = [
+    "Software Engineer", "Data Scientist", "Backend Developer", "Frontend Developer", "DevOps Engineer",
+    "Machine Learning Engineer", "Data Engineer", "Product Manager", "QA Engineer", "Business Analyst",
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Tech"]
+DUTIES = [
+    "designed and maintained services handling millions of requests per day",
+    "led a team of engineers through a migration to the cloud",
+    "built data pipelines feeding dashboards used by the whole company",
+    "reduced infrastructure costs by improving resource utilisation",
+    "shipped customer-facing features on a two-week release cycle",
+    "mentored junior developers and ran code reviews",
+    "trained and deployed models for ranking and recommendation",
+    "automated testing and deployment for several product teams",
+]
+
+
+def cv_text(rng: np.random.Generator, paragraphs: int = 3) -> str:
+    name = f"Candidate {rng.integers(1_000_000)}"
+    skills = ", ".join(rng.choice(SKILLS, size=8, replace=False))
+    lines = [name, f"Email: candidate{rng.integers(10_000)}@example.com", "", "SKILLS", skills, "",
+             "EDUCATION", str(rng.choice(DEGREES)), "", "EXPERIENCE"]
+    for _ in range(paragraphs):
+        years = int(rng.integers(1, 8))
+        duties = "; ".join(rng.choice(DUTIES, size=3, replace=False))
+        lines.append(f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)} ({years} years): {duties}.")
+    return "\n".join(lines)
+
+
+def jd_text(rng: np.random.Generator, paragraphs: int = 2) -> str:
+    role = str(rng.choice(ROLES))
+    lines = [f"{role} - {rng.choice(COMPANIES)}", "", "ABOUT THE ROLE"]
+    for _ in range(paragraphs):
+        lines.append(f"You will have {'; '.join(rng.choice(DUTIES, size=2, replace=False))}.")
+    lines += ["", "REQUIREMENTS", f"{rng.integers(2, 10)}+ years as a {role}.",
+              f"Skills: {', '.join(rng.choice(SKILLS, size=6, replace=False))}.",
+              f"Education: {rng.choice(DEGREES)} or equivalent."]
+    return "\n".join(lines)
+
+
+def texts(n: int, kind: str = "cv", seed: int = 0, paragraphs: int = 3) -> list:
+    """`n` synthetic CV (kind="cv") or Job Description (kind="jd") texts."""
+    rng = np.random.default_rng(seed)
+    make = cv_text if kind == "cv" else jd_text
+    return [make(rng, paragraphs) for _ in range(n)]
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_bytes(text: str, lines_per_page: int = 60) -> bytes:
+    """Minimal multi-page PDF with `text` in Helvetica, readable by PyPDF2."""
+    lines = text.splitlines() or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    # Objects: 1 catalog, 2 page tree, 3 font, then (page, content) pairs.
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page_lines in pages:
+        stream = "BT /F1 10 Tf 50 800 Td 12 TL " + " ".join(f"({_pdf_escape(line)}) '" for line in page_lines) + " ET"
+        stream = stream.encode("latin-1", "replace")
+        page_number = len(objects) + 1
+        kids.append(f"{page_number} 0 R")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents {page_number + 1} 0 R"
+                       f" /Resources << /Font << /F1 3 0 R >> >> >>".encode())
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def docx_bytes(text: str) -> bytes:
+    import io
+
+    import docx
+
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def write_files(directory: str, documents: list, formats=("pdf", "docx", "txt"), repeat: int = 1) -> list:
+    """
+    Write each text as one file, cycling through `formats`; `repeat` concatenates a
+    text with itself to produce longer (multi-page) documents. Returns the paths.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i, text in enumerate(documents):
+        kind = formats[i % len(formats)]
+        text = "\n\n".join([text] * repeat)
+        if kind == "pdf":
+            data = pdf_bytes(text)
+        elif kind == "docx":
+            data = docx_bytes(text)
+        else:
+            data = text.encode("utf-8")
+        path = os.path.join(directory, f"doc-{i:07d}.{kind}")
+        with open(path, "wb") as f:
+            f.write(data)
+        paths.append(path)
+    return paths
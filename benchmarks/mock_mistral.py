@@ -0,0 +1,147 @@
+"""
+Local stand-in for the Mistral chat-completions endpoint, for benchmarks and offline runs.
+
+    python -m benchmarks.mock_mistral --port 8089 --latency 0.3
+
+Answers every request after `latency` seconds (plus optional jitter) with a canned
+facet answer picked from the question, or with a JSON object holding every facet
+when the request asks for a json_schema response (structured extraction).
+`faults` scripts failures for the first requests (for client tests): each entry is
+an HTTP status to reply with, or "malformed" for a 200 whose body has no choices.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_ANSWERS = {
+    "skills": "Python, SQL, Docker, Kubernetes, REST API design, machine learning. Strong communication skills.",
+    "education": "Bachelor of Science in Computer Science. Master of Science in Data Science.",
+    "requirement": "Five years of backend development. Experience with cloud platforms. Fluent English.",
+    "experience": "Senior software engineer at a fintech company for four years. Data engineer for two years.",
+}
+
+
+def canned_answer(message: str) -> str:
+    # The question is the last line of the user message, after the document text.
+    question = message.rsplit("\n", 1)[-1].lower()
+    for facet, answer in CANNED_ANSWERS.items():
+        if facet[:6] in question:
+            return answer
+    return CANNED_ANSWERS["skills"]
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under concurrent clients, adding 1 s SYN retries.
+    request_queue_size = 128
+
+
+class MockMistralServer:
+    """Threaded HTTP server on 127.0.0.1; use as a context manager and point MistralClient at `url`."""
+
+    def __init__(self, port: int = 0, latency: float = 0.0, jitter: float = 0.0, seed: int = 0,
+                 faults: list = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.faults = list(faults or [])
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1/chat/completions"
+
+    def _delay(self) -> float:
+        with self._lock:
+            self.requests += 1
+            return self.latency + self._random.uniform(0, self.jitter)
+
+    def _next_fault(self):
+        with self._lock:
+            return self.faults.pop(0) if self.faults else None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                time.sleep(server._delay())
+                fault = server._next_fault()
+                if fault is not None:
+                    status, payload = (200, b'{"choices": []}') if fault == "malformed" else (fault, b'{}')
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    return
+                response_format = body.get("response_format") or {}
+                if response_format.get("type") == "json_schema":
+                    keys = response_format["json_schema"]["schema"]["required"]
+                    content = json.dumps({key: CANNED_ANSWERS.get(key, "") for key in keys})
+                else:
+                    content = canned_answer(body["messages"][-1]["content"])
+                payload = json.dumps({
+                    "id": "mock",
+                    "object": "chat.completion",
+                    "model": body.get("model"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                                 "finish_reason": "stop"}],
+                    # Rough word counts; enough to exercise token accounting.
+                    "usage": {
+                        "prompt_tokens": sum(len(m["content"].split()) for m in body["messages"]),
+                        "completion_tokens": len(content.split()),
+                    },
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-mistral", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra uniform random seconds per request")
+    args = parser.parse_args()
+    server = MockMistralServer(args.port, args.latency, args.jitter)
+    print(f"Serving mock Mistral API at {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+End-to-end benchmark of the parse -> extract -> embed -> rank pipeline on synthetic corpora.
+
+    python -m benchmarks.pipeline --output results.json
+    python -m benchmarks.pipeline --pool-sizes 1000 100000 1000000 --dtype int8 --encoder onnx-int8
+    python -m benchmarks.pipeline --output new.json --compare results.json
+
+Stages:
+  parse    PDF/DOCX/TXT files through jdcv.parsing.DocumentParser (process pool)
+  extract  facet extraction through MistralClient against a local mock server
+           (benchmarks.mock_mistral) with a fixed per-request latency; each facet
+           question gets its document sections unless --whole-document
+  embed    facet texts through jdcv.embeddings.EmbeddingService from concurrent callers
+  rank     jdcv.ranking.rank over synthetic pools of each --pool-sizes size
+
+Results (throughput, latency percentiles, peak RSS after each stage, plus the git
+commit and machine details) are written as JSON. --compare prints every numeric
+metric next to a previous results file.
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks import corpus
+from benchmarks.mock_mistral import MockMistralServer
+from benchmarks.synthetic import facet_entries, synthetic_pool
+from jdcv.embeddings import EmbeddingService, load_encoder
+from jdcv.extraction import DocumentExtractor, clean_text
+from jdcv.llm import MistralClient
+from jdcv.metrics import LLM_TOKENS
+from jdcv.parsing import DocumentParser, kind_for
+from jdcv.ranking import FACETS, rank
+from jdcv.sections import split_sections
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class HashEncoder:
+    """
+    Feature-hashing bag-of-words encoder with the SentenceTransformer `encode`
+    signature. Measures the pipeline around the model when the real encoder is
+    not installed; its throughput says nothing about the model itself.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def encode(self, texts, batch_size: int = 32, convert_to_numpy: bool = True, normalize_embeddings: bool = False):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for token in text.lower().split():
+                vectors[i, int.from_bytes(hashlib.blake2b(token.encode(), digest_size=4).digest(), "little") % self.dim] += 1
+        if normalize_embeddings:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.where(norms == 0, 1, norms)
+        return vectors
+
+
+def percentiles(seconds) -> dict:
+    ms = np.asarray(seconds) * 1000
+    return {
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+    }
+
+
+def peak_rss_mb() -> dict:
+    """Peak resident set size so far of this process and of its finished children (Linux: KiB)."""
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale / 2 ** 20, 1),
+    }
+
+
+def bench_parse(args, directory: str) -> dict:
+    documents = corpus.texts(args.parse_docs, "cv", seed=args.seed)
+    paths = corpus.write_files(directory, documents, formats=args.formats, repeat=args.repeat)
+    total_bytes = sum(os.path.getsize(path) for path in paths)
+    parser = DocumentParser(max_workers=args.parse_workers)
+    try:
+        # Start the worker processes before timing, as a long-running app would have them.
+        parser.parse(b"warm-up", "txt")
+        submitted, latencies, errors = {}, [], 0
+
+        def files():
+            for path in paths:
+                with open(path, "rb") as f:
+                    data = f.read()
+                submitted[path] = time.perf_counter()
+                yield path, data, kind_for(path)
+
+        start = time.perf_counter()
+        for path, _, error in parser.iter_parse(files()):
+            latencies.append(time.perf_counter() - submitted.pop(path))
+            errors += error is not None
+        elapsed = time.perf_counter() - start
+    finally:
+        parser.close()
+    return {
+        "documents": len(paths),
+        "errors": errors,
+        "docs_per_sec": round(len(paths) / elapsed, 2),
+        "mb_per_sec": round(total_bytes / 2 ** 20 / elapsed, 2),
+        "latency": percentiles(latencies),
+    }
+
+
+def bench_extract(args) -> dict:
+    documents = corpus.texts(args.extract_docs, "cv", seed=args.seed)
+    prompt_tokens = LLM_TOKENS.values().get(("prompt",), 0)
+    with MockMistralServer(latency=args.llm_latency, jitter=args.llm_jitter) as server:
+        client = MistralClient("mock-key", url=server.url, max_concurrency=args.llm_concurrency)
+        extractor = DocumentExtractor(client, embedding_service=None, structured=args.structured)
+        latencies = []
+
+        def extract(text):
+            sections = None if args.whole_document else split_sections(text)
+            started = time.perf_counter()
+            responses = extractor.ask(clean_text(text), "cv", sections=sections)
+            latencies.append(time.perf_counter() - started)
+            return responses
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.workers) as pool:
+            failed = sum(any(v is None for v in r.values()) for r in pool.map(extract, documents))
+        elapsed = time.perf_counter() - start
+        client.close()
+        requests = server.requests
+    return {
+        "documents": len(documents),
+        "failed": failed,
+        "llm_requests": requests,
+        "prompt_tokens_per_doc": round((LLM_TOKENS.values().get(("prompt",), 0) - prompt_tokens) / len(documents), 1),
+        "llm_latency_s": args.llm_latency,
+        "docs_per_sec": round(len(documents) / elapsed, 2),
+        "latency": percentiles(latencies),
+    }
+
+
+def bench_embed(args) -> dict:
+    model = HashEncoder() if args.encoder == "hash" else load_encoder(args.encoder)
+    service = EmbeddingService(model, max_batch_size=args.embed_batch_size)
+    rng = np.random.default_rng(args.seed)
+    documents = [
+        {facet: " ".join(rng.choice(corpus.SKILLS + corpus.DUTIES, size=12)) for facet in FACETS}
+        for _ in range(args.embed_docs)
+    ]
+    service.encode_facets(documents[0])
+    latencies = []
+
+    def embed(texts):
+        started = time.perf_counter()
+        service.encode_facets(texts)
+        latencies.append(time.perf_counter() - started)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.workers) as pool:
+        list(pool.map(embed, documents))
+    elapsed = time.perf_counter() - start
+    return {
+        "encoder": args.encoder,
+        "documents": len(documents),
+        "docs_per_sec": round(len(documents) / elapsed, 2),
+        "texts_per_sec": round(len(documents) * len(FACETS) / elapsed, 2),
+        "latency": percentiles(latencies),
+    }
+
+
+def bench_rank(args, pool_size: int) -> dict:
+    start = time.perf_counter()
+    pool = synthetic_pool(pool_size, args.dim, args.dtype, seed=args.seed)
+    build_s = time.perf_counter() - start
+    jobs = facet_entries(args.queries, args.dim, seed=args.seed + 1)
+    rank(pool, jobs[0], k=args.k)
+    latencies = []
+    for job in jobs:
+        started = time.perf_counter()
+        rank(pool, job, k=args.k)
+        latencies.append(time.perf_counter() - started)
+    result = {
+        "pool_size": pool_size,
+        "dtype": args.dtype,
+        "k": args.k,
+        "pool_mb": round(pool.nbytes() / 2 ** 20, 1),
+        "build_s": round(build_s, 3),
+        "latency": percentiles(latencies),
+    }
+    del pool
+    return result
+
+
+def metadata(args) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": vars(args),
+    }
+
+
+def flatten(data, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict) and "pool_size" in item:
+                    flat.update(flatten(item, f"{name}[{item['pool_size']}]."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(results: dict, baseline: dict):
+    current, previous = flatten(results["stages"]), flatten(baseline["stages"])
+    print(f"{'metric':<48} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for name, value in current.items():
+        if name in previous:
+            ratio = value / previous[name] if previous[name] else float("nan")
+            print(f"{name:<48} {previous[name]:>12} {value:>12} {ratio:>8.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", nargs="+", default=["parse", "extract", "embed", "rank"],
+                        choices=["parse", "extract", "embed", "rank"])
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=8, help="concurrent documents in extract / embed")
+    # parse
+    parser.add_argument("--parse-docs", type=int, default=300)
+    parser.add_argument("--parse-workers", type=int, default=None)
+    parser.add_argument("--formats", nargs="+", default=["pdf", "docx", "txt"])
+    parser.add_argument("--repeat", type=int, default=1, help="repeat each text N times for longer files")
+    # extract
+    parser.add_argument("--extract-docs", type=int, default=200)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="mock server seconds per request")
+    parser.add_argument("--llm-jitter", type=float, default=0.0)
+    parser.add_argument("--llm-concurrency", type=int, default=32)
+    parser.add_argument("--structured", action="store_true")
+    parser.add_argument("--whole-document", action="store_true", help="send the full text with every question")
+    # embed
+    parser.add_argument("--embed-docs", type=int, default=1000)
+    parser.add_argument("--embed-batch-size", type=int, default=64)
+    parser.add_argument("--encoder", choices=["torch", "onnx", "onnx-int8", "hash"], default="torch")
+    # rank
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--dtype", choices=["float32", "float16", "int8"], default="float32")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    results = {"meta": metadata(args), "stages": {}, "peak_rss_mb": {}}
+    stages = results["stages"]
+    for stage in args.stages:
+        try:
+            if stage == "parse":
+                with tempfile.TemporaryDirectory() as directory:
+                    stages["parse"] = bench_parse(args, directory)
+            elif stage == "extract":
+                stages["extract"] = bench_extract(args)
+            elif stage == "embed":
+                stages["embed"] = bench_embed(args)
+            else:
+                stages["rank"] = [bench_rank(args, size) for size in args.pool_sizes]
+        except Exception as exc:
+            stages[stage] = {"error": f"{type(exc).__name__}: {exc}"}
+        results["peak_rss_mb"][stage] = peak_rss_mb()
+        print(json.dumps({stage: stages[stage]}), file=sys.stderr)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {args.output}", file=sys.stderr)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
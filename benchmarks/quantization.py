@@ -0,0 +1,85 @@
+"""
+Memory and ranking fidelity of quantized embedding storage (jdcv.quantization).
+
+    python -m benchmarks.quantization --pool-size 100000 --dtypes float32 float16 int8
+
+For each dtype: bytes per 100k documents (four facet matrices + int8 scales), scoring
+latency, and agreement with a float64 reference of the app's weighted
+four-facet cosine score: top-k overlap and Kendall tau over the reference top-k.
+The "python_lists" line estimates the old layout (one list of floats per facet).
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import QuantizedPool, facet_entries, facet_matrices
+from jdcv.ranking import DEFAULT_WEIGHTS, FACETS, query_vectors, score_pool, top_k_indices
+
+
+def python_list_bytes(dim: int) -> int:
+    """Approximate size of one document's embeddings as Python lists of floats."""
+    vector = [float(x) for x in np.random.default_rng(0).standard_normal(dim)]
+    return len(FACETS) * (sys.getsizeof(vector) + sum(sys.getsizeof(x) for x in vector))
+
+
+def reference_scores(matrices: dict, entry: dict) -> np.ndarray:
+    queries = query_vectors(entry)
+    return sum(DEFAULT_WEIGHTS[f] * (matrices[f].astype(np.float64) @ queries[f].astype(np.float64))
+               for f in FACETS)
+
+
+def kendall_tau(a: np.ndarray, b: np.ndarray) -> float:
+    """Kendall tau-a between two score vectors over the same items (O(n^2), for small n)."""
+    i, j = np.triu_indices(a.shape[0], k=1)
+    concordance = np.sign(a[i] - a[j]) * np.sign(b[i] - b[j])
+    return float(concordance.sum() / concordance.shape[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool-size", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--k", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--dtypes", nargs="+", default=["float32", "float16", "int8"])
+    args = parser.parse_args()
+
+    matrices = facet_matrices(args.pool_size, args.dim)
+    jobs = facet_entries(args.queries, args.dim)
+    references = [reference_scores(matrices, job) for job in jobs]
+    per_100k = 100000 / args.pool_size
+
+    print(json.dumps({
+        "dtype": "python_lists",
+        "pool_size": args.pool_size,
+        "mb_per_100k_docs": round(python_list_bytes(args.dim) * 100000 / 2 ** 20, 1),
+    }))
+    for dtype in args.dtypes:
+        pool = QuantizedPool.from_matrices(matrices, dtype)
+        start = time.perf_counter()
+        scored = [score_pool(pool, job) for job in jobs]
+        score_ms = (time.perf_counter() - start) * 1000 / len(jobs)
+
+        result = {
+            "dtype": dtype,
+            "pool_size": args.pool_size,
+            "mb_per_100k_docs": round(pool.nbytes() * per_100k / 2 ** 20, 1),
+            "score_ms_per_query": round(score_ms, 3),
+            "max_abs_score_error": round(float(max(np.abs(s - r).max() for s, r in zip(scored, references))), 6),
+        }
+        for k in args.k:
+            overlaps, taus = [], []
+            for scores, reference in zip(scored, references):
+                expected = top_k_indices(reference, k)
+                overlaps.append(len(set(top_k_indices(scores, k)) & set(expected)) / k)
+                taus.append(kendall_tau(reference[expected], scores[expected]))
+            result[f"top{k}_overlap"] = round(float(np.mean(overlaps)), 4)
+            result[f"kendall_tau@{k}"] = round(float(np.mean(taus)), 4)
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Throughput of sharded multi-process ranking (jdcv.sharding) against single-process jdcv.ranking.rank.
+
+    python -m benchmarks.sharding --pool-size 1000000 --shards 1 2 4 8 --dtype int8
+
+Writes a synthetic pool to a temporary directory, then for each shard count ranks
+--queries jobs one at a time and in batches of --batch, checking that every
+ranking matches the single-process one. Scaling is bounded by the number of
+cores and by memory bandwidth once the pool no longer fits in cache.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import facet_entries, file_pool
+from jdcv.ranking import rank
+from jdcv.sharding import ShardedRanker
+
+
+def ids(ranking: list) -> list:
+    return [item["cv_id"] for item in ranking]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool-size", type=int, default=200000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--dtype", choices=["float32", "float16", "int8"], default="float32")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--queries", type=int, default=32)
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--k", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        pool = file_pool(directory, args.pool_size, args.dim, args.dtype)
+        jobs = facet_entries(args.queries, args.dim, seed=1)
+
+        rank(pool, jobs[0], k=args.k)
+        start = time.perf_counter()
+        expected = [ids(rank(pool, job, k=args.k)) for job in jobs]
+        baseline = args.queries / (time.perf_counter() - start)
+        print(json.dumps({"mode": "single-process", "pool_size": args.pool_size, "dtype": args.dtype,
+                          "queries_per_sec": round(baseline, 2)}))
+
+        for shards in args.shards:
+            ranker = ShardedRanker(pool, shards=shards, workers=shards)
+            try:
+                ranker.rank(jobs[0], k=args.k)  # start the workers and map the files
+                start = time.perf_counter()
+                single = [ids(ranker.rank(job, k=args.k)) for job in jobs]
+                single_qps = args.queries / (time.perf_counter() - start)
+                start = time.perf_counter()
+                batched = []
+                for i in range(0, len(jobs), args.batch):
+                    batched += [ids(r) for r in ranker.rank_many(jobs[i:i + args.batch], k=args.k)]
+                batched_qps = args.queries / (time.perf_counter() - start)
+            finally:
+                ranker.close()
+            print(json.dumps({
+                "mode": "sharded",
+                "shards": shards,
+                "queries_per_sec": round(single_qps, 2),
+                "batched_queries_per_sec": round(batched_qps, 2),
+                "speedup": round(single_qps / baseline, 2),
+                "batched_speedup": round(batched_qps / baseline, 2),
+                "matches_single_process": single == expected and batched == expected,
+            }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Cold-start latency: module imports, encoder load and first / warm encode, each
+measured in a fresh interpreter so nothing is already imported or cached in-process.
+
+    python -m benchmarks.startup --backends torch onnx-int8 --runs 3
+
+Prints one JSON line per backend with the median of each stage in milliseconds.
+Stages that fail (e.g. sentence-transformers or its ONNX extras not installed)
+are reported under "error" instead.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; prints {stage: ms} as JSON on its last line.
+CHILD = r"""
+import importlib, json, sys, time
+timings = {}
+def stage(name, fn):
+    start = time.perf_counter()
+    result = fn()
+    timings[name] = (time.perf_counter() - start) * 1000
+    return result
+try:
+    modules = ["jdcv.store", "jdcv.parsing", "jdcv.extraction", "jdcv.ranking_book", "jdcv.ann"]
+    stage("import_jdcv", lambda: [importlib.import_module(name) for name in modules])
+    from jdcv.embeddings import load_encoder
+    stage("import_sentence_transformers", lambda: importlib.import_module("sentence_transformers"))
+    model = stage("load_model", lambda: load_encoder(sys.argv[1]))
+    text = ["Python developer with five years of backend experience."] * 4
+    stage("first_encode", lambda: model.encode(text, normalize_embeddings=True))
+    stage("warm_encode", lambda: model.encode(text, normalize_embeddings=True))
+except Exception as exc:
+    timings["error"] = f"{type(exc).__name__}: {exc}"
+print(json.dumps(timings))
+"""
+
+
+def run_once(backend: str) -> dict:
+    result = subprocess.run([sys.executable, "-c", CHILD, backend], cwd=REPO_ROOT,
+                            capture_output=True, text=True)
+    lines = result.stdout.strip().splitlines()
+    if not lines:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "no output"}
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["torch"], choices=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    for backend in args.backends:
+        runs = [run_once(backend) for _ in range(args.runs)]
+        stages = [name for name in runs[0] if name != "error"]
+        result = {"backend": backend, "runs": args.runs}
+        for name in stages:
+            result[f"{name}_ms"] = round(float(np.median([run[name] for run in runs if name in run])), 1)
+        errors = {run["error"] for run in runs if "error" in run}
+        if errors:
+            result["error"] = sorted(errors)[0]
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Synthetic facet embeddings for benchmarks that do not need the real encoder."""
+import os
+
+import numpy as np
+
+from jdcv.quantization import FILE_SUFFIXES, quantize_rows, storage_dtype
+from jdcv.ranking import FACETS, FacetIndex, normalize_rows
+
+
+def topic_centers(facet: str, dim: int, n_topics: int) -> np.ndarray:
+    """Fixed per-facet topic centers, shared by synthetic CVs and jobs so they can match."""
+    rng = np.random.default_rng(FACETS.index(facet) + 1000)
+    return normalize_rows(rng.standard_normal((n_topics, dim)))
+
+
+def facet_matrices(n: int, dim: int = 384, seed: int = 0, n_topics: int = 64, noise: float = 0.6) -> dict:
+    """One (n, dim) float32 matrix of unit vectors per facet, clustered around shared topics."""
+    rng = np.random.default_rng(seed)
+    matrices = {}
+    for facet in FACETS:
+        centers = topic_centers(facet, dim, n_topics)
+        topics = rng.integers(0, n_topics, n)
+        noise_rows = rng.standard_normal((n, dim), dtype=np.float32) * (noise / np.sqrt(dim))
+        matrices[facet] = normalize_rows(centers[topics] + noise_rows)
+    return matrices
+
+
+def facet_pool(n: int, dim: int = 384, seed: int = 0, n_topics: int = 64) -> FacetIndex:
+    """FacetIndex with `n` synthetic CVs named cv-0 .. cv-(n-1)."""
+    pool = FacetIndex(capacity=max(n, 1))
+    pool.extend([f"cv-{i}" for i in range(n)], facet_matrices(n, dim, seed, n_topics))
+    return pool
+
+
+def facet_entries(n: int, dim: int = 384, seed: int = 1, n_topics: int = 64) -> list:
+    """`n` synthetic job (or CV) entries in the app's {facet: {"text", "embedding"}} shape."""
+    matrices = facet_matrices(n, dim, seed, n_topics)
+    return [
+        {facet: {"text": "", "embedding": matrices[facet][i]} for facet in FACETS}
+        for i in range(n)
+    ]
+
+
+class QuantizedPool:
+    """Minimal in-memory pool (see jdcv.ranking.score_pool) over quantize_rows output."""
+
+    deleted = None
+    layout = 0
+
+    def __init__(self, ids: list, data: dict, scales: dict):
+        self.ids = ids
+        self._data = data
+        self._scales = scales
+
+    @classmethod
+    def from_matrices(cls, matrices: dict, dtype: str):
+        n = matrices[FACETS[0]].shape[0]
+        parts = {facet: quantize_rows(matrices[facet], dtype) for facet in FACETS}
+        return cls([f"cv-{i}" for i in range(n)], {f: parts[f][0] for f in FACETS}, {f: parts[f][1] for f in FACETS})
+
+    def matrix(self, facet: str) -> np.ndarray:
+        return self._data[facet]
+
+    def scales(self, facet: str):
+        return self._scales[facet]
+
+    def nbytes(self) -> int:
+        return sum(self._data[f].nbytes + (0 if self._scales[f] is None else self._scales[f].nbytes)
+                   for f in FACETS)
+
+
+def synthetic_pool(n: int, dim: int = 384, dtype: str = "float32", seed: int = 0,
+                   chunk_rows: int = 100000) -> QuantizedPool:
+    """
+    QuantizedPool of `n` synthetic CVs in the given storage dtype, generated in chunks
+    so that million-document pools never hold a full float32 copy of every facet.
+    """
+    data = {facet: np.empty((n, dim), dtype=storage_dtype(dtype)) for facet in FACETS}
+    scales = {facet: np.empty(n, dtype=np.float32) if dtype == "int8" else None for facet in FACETS}
+    for chunk, start in enumerate(range(0, n, chunk_rows)):
+        stop = min(start + chunk_rows, n)
+        matrices = facet_matrices(stop - start, dim, seed=seed + chunk)
+        for facet in FACETS:
+            rows, row_scales = quantize_rows(matrices[facet], dtype)
+            data[facet][start:stop] = rows
+            if row_scales is not None:
+                scales[facet][start:stop] = row_scales
+    return QuantizedPool([f"cv-{i}" for i in range(n)], data, scales)
+
+
+class FilePool(QuantizedPool):
+    """QuantizedPool over memory-mapped facet files, with the file protocol of jdcv.sharding."""
+
+    def __init__(self, ids: list, data: dict, scales: dict, dtype: str, files: dict):
+        super().__init__(ids, data, scales)
+        self.dtype = dtype
+        self._files = files
+
+    def facet_files(self, facet: str) -> tuple:
+        return self._files[facet]
+
+
+def file_pool(directory: str, n: int, dim: int = 384, dtype: str = "float32", seed: int = 0,
+              chunk_rows: int = 100000) -> FilePool:
+    """synthetic_pool written to `directory` as one file per facet (plus int8 scales) and mapped read-only."""
+    files = {facet: (os.path.join(directory, f"{facet}.{FILE_SUFFIXES[dtype]}"),
+                     os.path.join(directory, f"{facet}.scale") if dtype == "int8" else None) for facet in FACETS}
+    data = {facet: np.memmap(files[facet][0], dtype=storage_dtype(dtype), mode="w+", shape=(n, dim))
+            for facet in FACETS}
+    scales = {facet: np.memmap(files[facet][1], dtype=np.float32, mode="w+", shape=(n,)) if dtype == "int8" else None
+              for facet in FACETS}
+    for chunk, start in enumerate(range(0, n, chunk_rows)):
+        stop = min(start + chunk_rows, n)
+        matrices = facet_matrices(stop - start, dim, seed=seed + chunk)
+        for facet in FACETS:
+            rows, row_scales = quantize_rows(matrices[facet], dtype)
+            data[facet][start:stop] = rows
+            if row_scales is not None:
+                scales[facet][start:stop] = row_scales
+    for facet in FACETS:
+        data[facet].flush()
+        data[facet] = np.memmap(files[facet][0], dtype=storage_dtype(dtype), mode="r", shape=(n, dim))
+        if scales[facet] is not None:
+            scales[facet].flush()
+            scales[facet] = np.memmap(files[facet][1], dtype=np.float32, mode="r", shape=(n,))
+    return FilePool([f"cv-{i}" for i in range(n)], data, scales, dtype, files)
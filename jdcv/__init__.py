@@ -0,0 +1 @@
+"""Shared extraction, embedding and matching code for the Streamlit app and the FastAPI backend."""
@@ -0,0 +1,178 @@
+import threading
+
+import numpy as np
+
+from jdcv.ranking import normalize_rows, pool_vectors, query_vectors, rank, snapshot
+
+# Facet used for the approximate shortlist; it carries the largest matching weight.
+SHORTLIST_FACET = "skills"
+
+
+def spherical_kmeans(vectors: np.ndarray, n_clusters: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Unit-length centroids for unit-length `vectors` (cosine k-means)."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(vectors.shape[0], n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        present, starts = np.unique(assignment[order], return_index=True)
+        sums = np.zeros_like(centroids)
+        sums[present] = np.add.reduceat(vectors[order], starts, axis=0)
+        empty = ~sums.any(axis=1)
+        if empty.any():
+            sums[empty] = vectors[rng.choice(vectors.shape[0], int(empty.sum()), replace=False)]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted-file index in pure NumPy: rows are bucketed under their nearest of
+    `n_lists` k-means centroids and a query scans only the `n_probe` closest buckets.
+    Raising `n_probe` trades latency for recall.
+    """
+
+    def __init__(self, n_lists: int = None, n_probe: int = 8, seed: int = 0):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.seed = seed
+        self.centroids = None
+        self._lists = []
+        self._arrays = None
+
+    def build(self, matrix: np.ndarray):
+        """(Re)train centroids on a sample of `matrix` and index all of its rows."""
+        n = matrix.shape[0]
+        n_lists = self.n_lists or max(1, int(2 * np.sqrt(n)))
+        n_lists = min(n_lists, n)
+        sample = matrix
+        if n > n_lists * 32:
+            rng = np.random.default_rng(self.seed)
+            sample = matrix[np.sort(rng.choice(n, n_lists * 32, replace=False))]
+        self.centroids = spherical_kmeans(np.asarray(sample, dtype=np.float32), n_lists, seed=self.seed)
+        self._lists = [[] for _ in range(n_lists)]
+        self.add(np.arange(n), matrix)
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray, chunk: int = 65536):
+        """Incrementally insert pool `rows` (their vectors given in the same order)."""
+        rows = np.asarray(rows, dtype=np.int64)
+        for start in range(0, len(rows), chunk):
+            assignment = np.argmax(vectors[start:start + chunk] @ self.centroids.T, axis=1)
+            order = np.argsort(assignment, kind="stable")
+            counts = np.bincount(assignment, minlength=len(self._lists))
+            buckets = np.flatnonzero(counts)
+            grouped = np.split(rows[start:start + chunk][order], np.cumsum(counts[buckets])[:-1])
+            for bucket, bucket_rows in zip(buckets, grouped):
+                self._lists[bucket].append(bucket_rows)
+        self._arrays = None
+
+    def candidates(self, query: np.ndarray) -> np.ndarray:
+        if self._arrays is None:
+            self._arrays = [np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64) for chunks in self._lists]
+        probe = min(self.n_probe, len(self._arrays))
+        buckets = np.argpartition(-(self.centroids @ query), probe - 1)[:probe]
+        return np.concatenate([self._arrays[b] for b in buckets])
+
+
+class HNSWIndex:
+    """Graph index backed by hnswlib (optional dependency); `ef` trades latency for recall."""
+
+    def __init__(self, m: int = 16, ef_construction: int = 200, ef: int = 128):
+        import hnswlib  # optional: pip install hnswlib
+
+        self._hnswlib = hnswlib
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef = ef
+        self._index = None
+
+    def build(self, matrix: np.ndarray):
+        self._index = self._hnswlib.Index(space="ip", dim=matrix.shape[1])
+        self._index.init_index(max_elements=max(1024, matrix.shape[0] * 2), M=self.m,
+                               ef_construction=self.ef_construction)
+        self.add(np.arange(matrix.shape[0]), matrix)
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray):
+        needed = self._index.get_current_count() + len(rows)
+        if needed > self._index.get_max_elements():
+            self._index.resize_index(needed * 2)
+        self._index.add_items(np.asarray(vectors, dtype=np.float32), np.asarray(rows, dtype=np.int64))
+
+    def candidates(self, query: np.ndarray, n: int) -> np.ndarray:
+        n = min(n, self._index.get_current_count())
+        self._index.set_ef(max(self.ef, n))
+        labels, _ = self._index.knn_query(query, k=n)
+        return labels[0].astype(np.int64)
+
+
+class ANNRetriever:
+    """
+    Two-stage retrieval over a CV pool (jdcv.store.Collection or jdcv.ranking.FacetIndex):
+    an approximate index on the skills facet shortlists `shortlist` rows, which are then
+    re-ranked exactly with the full four-facet weighted score used by perform_job_matching.
+    The index follows the pool incrementally and is rebuilt when rows are renumbered
+    (compaction) or the pool has grown `retrain_factor` times since training.
+    """
+
+    def __init__(self, pool, backend: str = "ivf", shortlist: int = 2000, retrain_factor: float = 4.0, **params):
+        self.pool = pool
+        self.backend = backend
+        self.shortlist = shortlist
+        self.retrain_factor = retrain_factor
+        self.params = params
+        self.index = None
+        self._indexed = 0
+        self._trained = 0
+        self._layout = None
+        self._lock = threading.Lock()
+
+    def _new_index(self):
+        if self.backend == "hnsw":
+            return HNSWIndex(**self.params)
+        return IVFIndex(**self.params)
+
+    def sync(self, pool=None):
+        """Index rows appended since the last call; rebuild if the pool layout changed."""
+        with self._lock:
+            self._sync(pool if pool is not None else snapshot(self.pool))
+
+    def _sync(self, pool):
+        n = pool.matrix(SHORTLIST_FACET).shape[0]
+        if n == 0:
+            return
+        if self.index is None or self._layout != pool.layout or n > self._trained * self.retrain_factor:
+            self.index = self._new_index()
+            self.index.build(pool_vectors(pool, SHORTLIST_FACET))
+            self._indexed = self._trained = n
+            self._layout = pool.layout
+        elif n > self._indexed:
+            rows = np.arange(self._indexed, n)
+            self.index.add(rows, pool_vectors(pool, SHORTLIST_FACET, rows))
+            self._indexed = n
+
+    def shortlist_rows(self, query: np.ndarray, n: int, pool=None) -> np.ndarray:
+        if isinstance(self.index, HNSWIndex):
+            return self.index.candidates(query, n)
+        rows = self.index.candidates(query)
+        if rows.shape[0] <= n:
+            return rows
+        scores = pool_vectors(pool if pool is not None else self.pool, SHORTLIST_FACET, rows) @ query
+        return rows[np.argpartition(-scores, n - 1)[:n]]
+
+    def rank(self, entry: dict, k: int = None, weights: dict = None, id_key: str = "cv_id") -> list:
+        """
+        Same contract as jdcv.ranking.rank, computed on the ANN shortlist, so at most
+        max(shortlist, k) documents come back; use jdcv.ranking.rank to rank them all.
+        """
+        pool = snapshot(self.pool)
+        with self._lock:
+            self._sync(pool)
+            if self.index is None:
+                return []
+            # Tombstoned rows stay in the index until compaction; fetch enough to cover them.
+            dead = int(pool.deleted.sum()) if pool.deleted is not None else 0
+            n = max(self.shortlist, k or 0) + dead
+            rows = self.shortlist_rows(query_vectors(entry)[SHORTLIST_FACET], n, pool)
+        # Another thread may have indexed rows appended after this snapshot.
+        rows = rows[rows < len(pool.ids)]
+        return rank(pool, entry, k=k, weights=weights, id_key=id_key, rows=np.sort(rows))
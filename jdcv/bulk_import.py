@@ -0,0 +1,307 @@
+"""
+Bulk CV / Job Description import from a directory or a zip archive of PDF/DOCX/TXT files.
+
+    python -m jdcv.bulk_import resumes.zip --kind cv
+    python -m jdcv.bulk_import ./job_descriptions --kind jd --phone 5551234
+
+Documents flow through parse (process pool) -> extract (concurrent LLM calls)
+-> embed (micro-batched) -> store, all stages overlapping. Every finished file is
+recorded in a journal keyed by its content hash, so re-running the same command
+after a crash only processes what is left.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from jdcv.extraction import clean_text
+from jdcv.parsing import kind_for
+from jdcv.sections import split_sections
+
+STAGES = ("parse", "extract", "embed", "store")
+
+
+def iter_sources(path: str):
+    """
+    Yield (name, read) for every supported file in a directory tree or zip archive.
+    Symlinks that resolve outside the directory tree are skipped.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and kind_for(info.filename):
+                    yield info.filename, lambda info=info: archive.read(info)
+        return
+    root = os.path.realpath(path)
+    for directory, subdirs, files in os.walk(path):
+        subdirs.sort()
+        for name in sorted(files):
+            if kind_for(name):
+                full_path = os.path.join(directory, name)
+                if not is_within(os.path.realpath(full_path), root):
+                    continue
+
+                def read(full_path=full_path):
+                    with open(full_path, "rb") as f:
+                        return f.read()
+
+                yield os.path.relpath(full_path, path), read
+
+
+def is_within(path: str, root: str) -> bool:
+    """Whether the resolved `path` is `root` or lies under it (both already realpath'd)."""
+    return os.path.commonpath([path, root]) == root
+
+
+class ImportJournal:
+    """
+    Per-file import status keyed by content hash; makes bulk imports resumable.
+    Also tracks import runs started in the background (see the backend's /bulk-import).
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS imported ("
+            " digest TEXT PRIMARY KEY, source TEXT, doc_id TEXT, status TEXT NOT NULL,"
+            " error TEXT, finished_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run_id TEXT PRIMARY KEY, path TEXT NOT NULL, kind TEXT NOT NULL, status TEXT NOT NULL,"
+            " report TEXT, error TEXT, created_at REAL NOT NULL, finished_at REAL)"
+        )
+        self._conn.commit()
+
+    def start_run(self, path: str, kind: str) -> str:
+        """Record a queued import run; returns its ID."""
+        run_id = str(uuid.uuid4())
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, path, kind, status, created_at) VALUES (?, ?, ?, 'queued', ?)",
+                (run_id, path, kind, time.time()),
+            )
+            self._conn.commit()
+        return run_id
+
+    def update_run(self, run_id: str, status: str, report: dict = None, error: str = None):
+        finished_at = time.time() if status in ("done", "failed") else None
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, report = ?, error = ?, finished_at = ? WHERE run_id = ?",
+                (status, json.dumps(report) if report is not None else None, error, finished_at, run_id),
+            )
+            self._conn.commit()
+
+    def get_run(self, run_id: str):
+        """{"run_id", "path", "kind", "status", "report", "error", ...} of a run, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id, path, kind, status, report, error, created_at, finished_at FROM runs WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        run_id, path, kind, status, report, error, created_at, finished_at = row
+        return {"run_id": run_id, "path": path, "kind": kind, "status": status,
+                "report": json.loads(report) if report else None, "error": error,
+                "created_at": created_at, "finished_at": finished_at}
+
+    def done(self, digest: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM imported WHERE digest = ?", (digest,)).fetchone()
+        return row is not None and row[0] == "done"
+
+    def record(self, digest: str, source: str, doc_id: str, status: str, error: str = None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO imported (digest, source, doc_id, status, error, finished_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (digest, source, doc_id, status, error, time.time()),
+            )
+            self._conn.commit()
+
+
+class StageTimer:
+    """Thread-safe per-stage latency samples."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {stage: [] for stage in STAGES}
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+    def summary(self) -> dict:
+        result = {}
+        for stage, samples in self.samples.items():
+            if not samples:
+                continue
+            ms = np.array(samples) * 1000
+            result[stage] = {
+                "count": len(samples),
+                "mean_ms": round(float(ms.mean()), 2),
+                "p50_ms": round(float(np.percentile(ms, 50)), 2),
+                "p95_ms": round(float(np.percentile(ms, 95)), 2),
+            }
+        return result
+
+
+def import_digest(data: bytes, kind: str) -> str:
+    """Journal key of one source file: sha256 over the prompt kind and the raw bytes."""
+    digest = hashlib.sha256()
+    digest.update(kind.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class BulkImporter:
+    """
+    Pipelined, resumable import of many documents into a DocumentStore.
+    `kind` is the prompt kind: "cv" documents go to store.cvs, "jd" to store.jobs.
+    """
+
+    def __init__(self, store, extractor, parser, journal, kind: str = "cv", phone: str = None, workers: int = 8):
+        self.collection = store.cvs if kind == "cv" else store.jobs
+        self.extractor = extractor
+        self.parser = parser
+        self.journal = journal
+        self.kind = kind
+        self.phone = phone
+        self.workers = workers
+
+    def run(self, path: str) -> dict:
+        """Import everything under `path`; returns a throughput / latency / failure report."""
+        timer = StageTimer()
+        counts = {"documents": 0, "imported": 0, "skipped": 0, "failed": 0}
+        failures = []
+        lock = threading.Lock()
+        submitted = {}
+        in_flight = threading.BoundedSemaphore(self.workers * 2)
+
+        def fail(source, digest, error):
+            self.journal.record(digest, source, None, "failed", str(error))
+            with lock:
+                counts["failed"] += 1
+                failures.append({"source": source, "error": str(error)})
+
+        def documents():
+            seen = set()
+            for source, read in iter_sources(path):
+                data = read()
+                digest = import_digest(data, self.kind)
+                with lock:
+                    counts["documents"] += 1
+                if digest in seen or self.journal.done(digest):
+                    with lock:
+                        counts["skipped"] += 1
+                    continue
+                seen.add(digest)
+                submitted[(source, digest)] = time.perf_counter()
+                yield (source, digest), data, kind_for(source)
+
+        def process(source, digest, text):
+            try:
+                cleaned_text = clean_text(text)
+                if not cleaned_text:
+                    raise ValueError("No text could be extracted.")
+                # Deterministic ID: a crash between store and journal never duplicates a document,
+                # and the same file imported as a CV and as a JD still gets two IDs.
+                doc_id = str(uuid.UUID(digest[:32]))
+                if doc_id not in self.collection:
+                    started = time.perf_counter()
+                    extracted_info = self.extractor.cached(cleaned_text, self.kind)
+                    if extracted_info is None:
+                        responses = self.extractor.ask(cleaned_text, self.kind, sections=split_sections(text))
+                        timer.add("extract", time.perf_counter() - started)
+                        started = time.perf_counter()
+                        extracted_info, failed_facet = self.extractor.embed(cleaned_text, self.kind, responses)
+                        if failed_facet is not None:
+                            raise ValueError(f"Extraction failed for {failed_facet}.")
+                        timer.add("embed", time.perf_counter() - started)
+                    started = time.perf_counter()
+                    self.collection.add(doc_id, cleaned_text, extracted_info, phone=self.phone)
+                    timer.add("store", time.perf_counter() - started)
+                self.journal.record(digest, source, doc_id, "done")
+                with lock:
+                    counts["imported"] += 1
+            except Exception as exc:
+                fail(source, digest, exc)
+            finally:
+                in_flight.release()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="bulk-import") as pool:
+            for (source, digest), text, error in self.parser.iter_parse(documents()):
+                timer.add("parse", time.perf_counter() - submitted.pop((source, digest)))
+                if error is not None:
+                    fail(source, digest, error)
+                    continue
+                in_flight.acquire()
+                pool.submit(process, source, digest, text)
+        elapsed = time.perf_counter() - started
+
+        return {
+            **counts,
+            "elapsed_s": round(elapsed, 3),
+            "docs_per_sec": round(counts["imported"] / elapsed, 3) if elapsed else 0.0,
+            "stages": timer.summary(),
+            "failures": failures,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="directory or .zip archive of PDF/DOCX/TXT files")
+    parser.add_argument("--kind", choices=["cv", "jd"], default="cv")
+    parser.add_argument("--phone", help="phone number to file every imported document under")
+    parser.add_argument("--data-dir", default=os.environ.get("JDCV_DATA_DIR", "jdcv_data"))
+    parser.add_argument("--dtype", choices=["float32", "float16", "int8"],
+                        default=os.environ.get("JDCV_EMBEDDING_DTYPE"),
+                        help="embedding storage dtype when creating a new data directory")
+    parser.add_argument("--workers", type=int, default=8, help="documents extracted concurrently")
+    parser.add_argument("--encoder", choices=["torch", "onnx", "onnx-int8"],
+                        default=os.environ.get("EMBEDDING_BACKEND", "torch"))
+    parser.add_argument("--structured", action="store_true", help="single-call structured extraction")
+    args = parser.parse_args()
+
+    from jdcv.cache import ExtractionCache
+    from jdcv.embeddings import EmbeddingService, load_encoder
+    from jdcv.extraction import DocumentExtractor
+    from jdcv.llm import MistralClient
+    from jdcv.parsing import DocumentParser
+    from jdcv.store import DocumentStore
+
+    api_key = os.environ.get("MISTRAL_API_KEY")
+    if not api_key:
+        parser.error("MISTRAL_API_KEY not set in environment variables!")
+    store = DocumentStore(args.data_dir, dtype=args.dtype)
+    extractor = DocumentExtractor(
+        MistralClient(api_key, max_concurrency=args.workers * 4),
+        EmbeddingService(loader=lambda: load_encoder(args.encoder)),
+        ExtractionCache(os.path.join(args.data_dir, "extraction_cache.sqlite3")),
+        structured=args.structured,
+    )
+    document_parser = DocumentParser()
+    journal = ImportJournal(os.path.join(args.data_dir, "bulk_import.sqlite3"))
+    importer = BulkImporter(store, extractor, document_parser, journal, kind=args.kind,
+                            phone=args.phone, workers=args.workers)
+    try:
+        print(json.dumps(importer.run(args.path), indent=2))
+    finally:
+        document_parser.close()
+
+
+if __name__ == "__main__":
+    main()
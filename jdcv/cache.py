@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from jdcv.metrics import CACHE_EVICTIONS, CACHE_LOOKUPS
+
+
+def document_key(text: str, kind: str, model: str, prompt_version: str) -> str:
+    """Content address of a cleaned CV/JD: sha256 over the text plus everything that shapes its facets."""
+    digest = hashlib.sha256()
+    for part in (kind, model, prompt_version, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Persistent content-addressed cache of LLM facet answers and their embeddings.
+    Backed by a single SQLite file; once the stored payload exceeds `max_bytes`
+    the least recently used documents are evicted. Safe to share between threads
+    and between processes: the payload total is a counter row updated in the same
+    write transaction as each insert and eviction.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS extractions ("
+            " key TEXT PRIMARY KEY,"
+            " texts TEXT NOT NULL,"
+            " embeddings BLOB NOT NULL,"
+            " dim INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS extractions_last_access ON extractions (last_access)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS totals (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        # Caches written before the counter existed start from the sum of their rows.
+        self._conn.execute(
+            "INSERT OR IGNORE INTO totals (name, value)"
+            " SELECT 'bytes', COALESCE(SUM(size), 0) FROM extractions"
+        )
+
+    def get(self, key: str):
+        """Return {facet: {"text", "embedding"}} for a cached document, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT texts, embeddings, dim FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                CACHE_LOOKUPS.inc(result="miss")
+                return None
+            self.hits += 1
+            CACHE_LOOKUPS.inc(result="hit")
+            self._conn.execute("UPDATE extractions SET last_access = ? WHERE key = ?", (time.time(), key))
+        texts = json.loads(row[0])
+        vectors = np.frombuffer(row[1], dtype=np.float32).reshape(len(texts), row[2])
+        return {facet: {"text": text, "embedding": vectors[i]} for i, (facet, text) in enumerate(texts.items())}
+
+    def put(self, key: str, extracted_info: dict):
+        """Store the facet answers and embeddings of one document."""
+        texts = {facet: info["text"] for facet, info in extracted_info.items()}
+        vectors = np.stack([np.asarray(info["embedding"], dtype=np.float32) for info in extracted_info.values()])
+        payload = json.dumps(texts)
+        blob = vectors.tobytes()
+        size = len(payload) + len(blob)
+        with self._lock:
+            # IMMEDIATE: other processes' puts wait, so the total read here stays exact.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                old = self._conn.execute("SELECT size FROM extractions WHERE key = ?", (key,)).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO extractions (key, texts, embeddings, dim, size, last_access)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, payload, blob, vectors.shape[1], size, time.time()),
+                )
+                total = self._total_bytes() + size - (old[0] if old else 0)
+                total = self._evict(total)
+                self._conn.execute("UPDATE totals SET value = ? WHERE name = 'bytes'", (total,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _total_bytes(self) -> int:
+        return self._conn.execute("SELECT value FROM totals WHERE name = 'bytes'").fetchone()[0]
+
+    def _evict(self, total: int) -> int:
+        """Drop least recently used documents until `total` fits in max_bytes; returns the new total."""
+        while total > self.max_bytes:
+            oldest = self._conn.execute(
+                "SELECT key, size FROM extractions ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not oldest:
+                break
+            for key, size in oldest:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM extractions WHERE key = ?", (key,))
+                total -= size
+                self.evictions += 1
+                CACHE_EVICTIONS.inc()
+        return total
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters plus current size."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": self._total_bytes(),
+            }
@@ -0,0 +1,212 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from jdcv.metrics import EMBEDDING_BATCH_SECONDS, EMBEDDING_BATCH_SIZE
+
+# Sentence-transformers model used for every facet embedding (384-dim).
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Encoder backends for load_encoder: PyTorch, ONNX Runtime, or ONNX with
+# dynamically quantized int8 weights (needs sentence-transformers[onnx] >= 3.2).
+ENCODER_BACKENDS = ("torch", "onnx", "onnx-int8")
+# Quantized weights shipped in the model repository; avx2 runs on any x86-64 CPU
+# from the last decade. Override with EMBEDDING_ONNX_FILE for avx512 / arm64 builds.
+ONNX_INT8_FILE = "onnx/model_quint8_avx2.onnx"
+
+# EMBEDDING_MODEL reads at most 256 word pieces and silently drops the rest, so
+# longer texts are embedded as overlapping chunks of CHUNK_WORDS words (about 200
+# word pieces) whose vectors are mean-pooled; see EmbeddingService.encode_long.
+CHUNK_WORDS = 160
+CHUNK_OVERLAP = 32
+
+
+def chunk_words(text: str, size: int = CHUNK_WORDS, overlap: int = CHUNK_OVERLAP) -> list:
+    """`text` as one chunk if it has at most `size` words, else windows of `size` words overlapping by `overlap`."""
+    words = text.split()
+    if len(words) <= size:
+        return [text]
+    step = size - overlap
+    return [" ".join(words[start:start + size]) for start in range(0, len(words) - overlap, step)]
+
+
+def load_encoder(backend: str = "torch", onnx_file: str = None):
+    """
+    SentenceTransformer for EMBEDDING_MODEL on the given backend.
+    sentence_transformers (and torch) are imported here rather than at module
+    import, so callers only pay for them when the model is actually needed.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(EMBEDDING_MODEL)
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown encoder backend {backend!r}; expected one of {ENCODER_BACKENDS}")
+    if backend == "onnx-int8":
+        onnx_file = onnx_file or ONNX_INT8_FILE
+    model_kwargs = {"file_name": onnx_file} if onnx_file else None
+    return SentenceTransformer(EMBEDDING_MODEL, backend="onnx", model_kwargs=model_kwargs)
+
+
+class EmbeddingService:
+    """
+    Batches encoder calls around a SentenceTransformer-like `model`.
+    Callers submit lists of texts (e.g. all four facets of a document); a single
+    worker thread merges requests arriving within `max_wait` seconds, up to
+    `max_batch_size` texts, into one `model.encode` call (a single larger
+    request is encoded in `max_batch_size` slices). Results are
+    L2-normalized float32 arrays, computed at encode time.
+    Pass `loader` instead of `model` to load the model in the background: the
+    worker thread loads and warms it up while the caller keeps serving, and
+    `encode` calls made in the meantime simply wait for it.
+    """
+
+    def __init__(self, model=None, max_batch_size: int = 64, max_wait: float = 0.005, loader=None,
+                 chunk_words: int = CHUNK_WORDS, chunk_overlap: int = CHUNK_OVERLAP):
+        if (model is None) == (loader is None):
+            raise ValueError("Pass exactly one of model or loader")
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.chunk_words = chunk_words
+        self.chunk_overlap = chunk_overlap
+        self._loader = loader
+        self._load_error = None
+        self._dimension = None
+        self._held = None  # request that did not fit in the previous batch
+        self._ready = threading.Event()
+        self._requests = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    @property
+    def ready(self) -> bool:
+        """True once the model is loaded (or failed to load)."""
+        return self._ready.is_set()
+
+    @property
+    def status(self) -> str:
+        if not self.ready:
+            return "loading"
+        return "failed" if self._load_error is not None else "ready"
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        return self._ready.wait(timeout)
+
+    @property
+    def dimension(self) -> int:
+        """Embedding width; waits for the model to load."""
+        if self._dimension is None:
+            self.wait_ready()
+            get_dimension = getattr(self.model, "get_sentence_embedding_dimension", None)
+            self._dimension = get_dimension() if get_dimension else self.encode(["dimension"]).shape[1]
+        return self._dimension
+
+    def encode(self, texts: list) -> np.ndarray:
+        """Embed `texts`; returns a (len(texts), dim) float32 array of unit-length rows."""
+        texts = list(texts)
+        if not texts:
+            self.wait_ready()
+            if self._load_error is not None:
+                raise RuntimeError(f"Embedding model failed to load: {self._load_error}")
+            return np.empty((0, self.dimension), dtype=np.float32)
+        future = Future()
+        self._requests.put((texts, future))
+        return future.result()
+
+    def encode_long(self, texts: list) -> np.ndarray:
+        """
+        Like `encode`, but texts longer than the model window are split into chunks
+        (all encoded in one batch) and each text's chunk vectors are averaged,
+        weighted by word count, then re-normalized.
+        """
+        chunks, owners, weights = [], [], []
+        for i, text in enumerate(texts):
+            for chunk in chunk_words(text, self.chunk_words, self.chunk_overlap):
+                chunks.append(chunk)
+                owners.append(i)
+                weights.append(max(len(chunk.split()), 1))
+        vectors = self.encode(chunks)
+        if len(chunks) == len(texts):
+            return vectors
+        pooled = np.zeros((len(texts), vectors.shape[1]), dtype=np.float32)
+        np.add.at(pooled, owners, vectors * np.asarray(weights, dtype=np.float32)[:, None])
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return pooled / np.where(norms == 0, 1, norms)
+
+    def encode_facets(self, texts: dict) -> dict:
+        """Embed every facet text of one document in a single batch (long texts chunked); maps facet -> vector."""
+        vectors = self.encode_long(list(texts.values()))
+        return dict(zip(texts, vectors))
+
+    def _collect(self):
+        """Whole requests totalling at most `max_batch_size` texts (or one larger request)."""
+        if self._held is not None:
+            batch, self._held = [self._held], None
+        else:
+            batch = [self._requests.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if size + len(request[0]) > self.max_batch_size:
+                self._held = request
+                break
+            batch.append(request)
+            size += len(request[0])
+        return batch
+
+    def _load(self):
+        try:
+            if self.model is None:
+                self.model = self._loader()
+                # The first encode pays for lazy initialisation; do it before any caller does.
+                self.model.encode(["warm-up"], convert_to_numpy=True)
+        except Exception as exc:
+            self._load_error = exc
+        finally:
+            self._ready.set()
+
+    def _encode_batch(self, texts: list) -> np.ndarray:
+        EMBEDDING_BATCH_SIZE.observe(len(texts))
+        start = time.perf_counter()
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.max_batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        ).astype(np.float32, copy=False)
+        EMBEDDING_BATCH_SECONDS.observe(time.perf_counter() - start)
+        return vectors
+
+    def _run(self):
+        self._load()
+        while True:
+            batch = self._collect()
+            if self._load_error is not None:
+                for _, future in batch:
+                    future.set_exception(RuntimeError(f"Embedding model failed to load: {self._load_error}"))
+                continue
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                vectors = np.concatenate([
+                    self._encode_batch(texts[i:i + self.max_batch_size])
+                    for i in range(0, len(texts), self.max_batch_size)
+                ])
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            start = 0
+            for request_texts, future in batch:
+                future.set_result(vectors[start:start + len(request_texts)])
+                start += len(request_texts)
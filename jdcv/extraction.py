@@ -0,0 +1,111 @@
+import re
+
+from jdcv.cache import document_key
+from jdcv.embeddings import EMBEDDING_MODEL
+from jdcv.llm import MISTRAL_MODEL, PROMPT_VERSION
+from jdcv.sections import facet_contexts, truncate_tokens
+
+cv_extraction_questions = {
+    "skills": "What are the skills from this CV?",
+    "education": "What are the educations from this CV?",
+    "requirement": "What are the requirements from this CV?",
+    "experience": "What are the experiences mentioned in this CV?"
+}
+
+job_extraction_questions = {
+    "skills": "What are the skills from this Job Description?",
+    "education": "What are the required educations for this job?",
+    "requirement": "What are the requirements for this job?",
+    "experience": "What are the required experiences for this job?"
+}
+
+# Prompt kind ("cv" / "jd") -> facet questions.
+EXTRACTION_QUESTIONS = {"cv": cv_extraction_questions, "jd": job_extraction_questions}
+
+
+def clean_text(text: str) -> str:
+    """Convert multiple spaces/newlines to a single space."""
+    text = re.sub(r'\n+', ' ', text)
+    text = re.sub(r' +', ' ', text).strip()
+    return text
+
+
+def format_llm_response(text: str) -> str:
+    """
+    Format the response from the LLM by splitting sentences and adding line breaks.
+    This function assumes the text is a plain string and improves its readability.
+    """
+    # Replace multiple spaces and ensure each sentence starts on a new line
+    sentences = text.split('. ')
+    sentences = [s.strip() for s in sentences if s]
+    formatted = '.<br>'.join(sentences)
+    return formatted
+
+
+class DocumentExtractor:
+    """
+    Cleaned CV/JD text -> {facet: {"text", "embedding"}}: LLM facet extraction,
+    response formatting and batched embedding, served from the content-addressed
+    cache when the same document was seen before. Shared by the Streamlit app,
+    bulk import and the backend.
+    Prompts carry at most `max_input_tokens` (approximate) of document text.
+    """
+
+    def __init__(self, llm_client, embedding_service, cache=None, structured: bool = False,
+                 max_input_tokens: int = 8000):
+        self.llm_client = llm_client
+        self.embedding_service = embedding_service
+        self.cache = cache
+        self.structured = structured
+        self.max_input_tokens = max_input_tokens
+
+    def cache_key(self, cleaned_text: str, kind: str) -> str:
+        mode = "structured" if self.structured else "per_facet"
+        return document_key(cleaned_text, kind, f"{MISTRAL_MODEL}+{EMBEDDING_MODEL}", f"{PROMPT_VERSION}:{mode}")
+
+    def cached(self, cleaned_text: str, kind: str):
+        """Cached extraction for this exact document, or None."""
+        if self.cache is None:
+            return None
+        return self.cache.get(self.cache_key(cleaned_text, kind))
+
+    def ask(self, cleaned_text: str, kind: str, facets=None, sections: dict = None) -> dict:
+        """
+        Facet answers from the LLM (only `facets`, if given); failed facets map to None.
+        With `sections` (jdcv.sections.split_sections of the uncleaned text), each
+        question is sent only the sections relevant to its facet.
+        """
+        questions = EXTRACTION_QUESTIONS[kind]
+        if facets is not None:
+            questions = {facet: questions[facet] for facet in facets}
+        contexts = facet_contexts(sections or {}, kind, questions, cleaned_text, self.max_input_tokens)
+        if self.structured:
+            # One prompt for all facets: send the union of their sections, once each.
+            text = " ".join(dict.fromkeys(contexts.values()))
+            return self.llm_client.extract_structured(
+                questions, truncate_tokens(text, self.max_input_tokens), kind=kind)
+        return self.llm_client.extract_facets(questions, cleaned_text, kind=kind, contexts=contexts)
+
+    def embed(self, cleaned_text: str, kind: str, responses: dict):
+        """
+        Format and embed facet answers (one batch per document) and cache the result.
+        Returns (extracted_info, failed_facet); failed_facet is None on success.
+        """
+        texts = {}
+        for facet, response_text in responses.items():
+            if response_text is None:
+                return None, facet
+            # Clean, then format the response text for better readability.
+            texts[facet] = format_llm_response(clean_text(response_text))
+        embeddings = self.embedding_service.encode_facets(texts)
+        extracted_info = {facet: {"text": texts[facet], "embedding": embeddings[facet]} for facet in texts}
+        if self.cache is not None:
+            self.cache.put(self.cache_key(cleaned_text, kind), extracted_info)
+        return extracted_info, None
+
+    def extract(self, cleaned_text: str, kind: str, sections: dict = None):
+        """Cache lookup, then ask + embed. Returns (extracted_info, failed_facet)."""
+        cached = self.cached(cleaned_text, kind)
+        if cached is not None:
+            return cached, None
+        return self.embed(cleaned_text, kind, self.ask(cleaned_text, kind, sections=sections))
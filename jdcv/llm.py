@@ -0,0 +1,159 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from jdcv.metrics import LLM_REQUEST_SECONDS, LLM_TOKENS
+
+# Mistral API configuration
+MISTRAL_URL = "https://api.mistral.ai/v1/chat/completions"
+MISTRAL_MODEL = "mistral-large-2411"
+
+# Bump whenever prompts or extraction questions change, so cached facet answers are not reused.
+PROMPT_VERSION = "2"
+
+# System prompt and user-message prefix per document kind.
+DOCUMENT_PROMPTS = {
+    "cv": ("You are an AI assistant that extracts useful insights from a CV.", "My CV"),
+    "jd": ("You are an AI assistant that extracts useful insights from a Job Description (JD).", "My Job Description"),
+}
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def facet_schema(keys) -> dict:
+    """JSON schema for a single reply holding one non-empty string answer per facet."""
+    return {
+        "type": "object",
+        "properties": {key: {"type": "string", "minLength": 1} for key in keys},
+        "required": list(keys),
+        "additionalProperties": False,
+    }
+
+
+def parse_structured_reply(reply, keys) -> dict:
+    """
+    Validate a structured-mode reply against the facet schema.
+    Returns facet -> answer for valid facets only; anything missing, empty or
+    of the wrong type is left out so the caller can re-ask just that facet.
+    """
+    if not reply:
+        return {}
+    try:
+        data = json.loads(reply)
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {key: data[key] for key in keys if isinstance(data.get(key), str) and data[key].strip()}
+
+
+class MistralClient:
+    """
+    Chat-completions client sharing one keep-alive connection pool across threads.
+    Retries 429/5xx with exponential backoff (honouring Retry-After) and applies
+    a (connect, read) timeout to every request. Facet questions for one document
+    are sent concurrently, at most `max_concurrency` in flight.
+    """
+
+    def __init__(self, api_key: str, url: str = MISTRAL_URL, model: str = MISTRAL_MODEL,
+                 max_concurrency: int = 4, timeout=(5, 60), max_retries: int = 3,
+                 backoff_factor: float = 0.5):
+        self.url = url
+        self.model = model
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        })
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="mistral")
+
+    def chat(self, messages: list, **options):
+        """POST one chat completion; returns the reply text, or None on any failure."""
+        data = {"model": self.model, "messages": messages, **options}
+        start = time.perf_counter()
+        try:
+            response = self.session.post(self.url, json=data, timeout=self.timeout)
+        except requests.RequestException:
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, status="error")
+            return None
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, status=response.status_code)
+        if response.status_code != 200:
+            return None
+        try:
+            body = response.json()
+            content = body["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            return None
+        usage = body.get("usage") or {}
+        for kind in ("prompt", "completion"):
+            if usage.get(f"{kind}_tokens"):
+                LLM_TOKENS.inc(usage[f"{kind}_tokens"], type=kind)
+        return content
+
+    def ask(self, question: str, text: str, kind: str = "cv"):
+        """Ask one question about a CV (`kind="cv"`) or Job Description (`kind="jd"`)."""
+        system_prompt, label = DOCUMENT_PROMPTS[kind]
+        return self.chat([
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"{label}:\n\n{text}\n\n{question}"},
+        ])
+
+    def extract_facets(self, questions: dict, text: str, kind: str = "cv", contexts: dict = None) -> dict:
+        """
+        Ask every facet question concurrently; maps facet -> reply text (None if it failed).
+        `contexts` optionally gives per-facet document text to send instead of `text`.
+        """
+        contexts = contexts or {}
+        futures = {
+            key: self._executor.submit(self.ask, question, contexts.get(key, text), kind)
+            for key, question in questions.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+    def extract_structured(self, questions: dict, text: str, kind: str = "cv") -> dict:
+        """
+        Ask all facet questions in one JSON-schema-constrained call, so the document
+        is sent once. Facets that fail validation fall back to per-facet calls.
+        Same return contract as `extract_facets`.
+        """
+        system_prompt, label = DOCUMENT_PROMPTS[kind]
+        listing = "\n".join(f'- "{key}": {question}' for key, question in questions.items())
+        reply = self.chat(
+            [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": (
+                    f"{label}:\n\n{text}\n\n"
+                    f"Answer each of the following questions and reply with a single JSON object "
+                    f"whose keys are the quoted names and whose values are the answers as plain text:\n{listing}"
+                )},
+            ],
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": f"{kind}_facets", "schema": facet_schema(questions), "strict": True},
+            },
+        )
+        answers = parse_structured_reply(reply, questions)
+        missing = {key: question for key, question in questions.items() if key not in answers}
+        if missing:
+            answers.update(self.extract_facets(missing, text, kind))
+        return {key: answers[key] for key in questions}
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
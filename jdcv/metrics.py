@@ -0,0 +1,170 @@
+"""
+In-process counters and histograms for the document pipeline, exported in the
+Prometheus text format (FastAPI /metrics) and summarised for the Streamlit sidebar.
+
+Recording a sample is a lock, a dict lookup and a bisect, cheap enough to stay
+on in production. Each process (Streamlit server, every API worker) keeps its
+own registry.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from sub-millisecond ranking to multi-second LLM calls.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+POOL_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+
+def _label_key(labelnames, labels: dict) -> tuple:
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+def _format_labels(labelnames, key, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, key)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def values(self) -> dict:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # label key -> [per-bucket counts (+1 for +Inf), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(self.labelnames, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the `with` block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def series(self) -> dict:
+        with self._lock:
+            return {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+
+    def summary(self) -> dict:
+        """label key -> {"count", "mean", "p50", "p95"}; quantiles are bucket upper bounds."""
+        result = {}
+        for key, (counts, total, count) in self.series().items():
+            if not count:
+                continue
+            result[key] = {"count": count, "mean": total / count,
+                           "p50": self._quantile(counts, count, 0.5), "p95": self._quantile(counts, count, 0.95)}
+        return result
+
+    def _quantile(self, counts, count, q):
+        rank, seen = q * count, 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in sorted(self.series().items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                bucket_labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def metrics(self) -> list:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        return "\n".join(line for metric in self.metrics() for line in metric.render()) + "\n"
+
+
+REGISTRY = Registry()
+
+LLM_REQUEST_SECONDS = REGISTRY.histogram(
+    "jdcv_llm_request_seconds", "Mistral chat-completion round-trip time, retries included.", ["status"])
+LLM_TOKENS = REGISTRY.counter("jdcv_llm_tokens_total", "Tokens reported by the Mistral API.", ["type"])
+EMBEDDING_BATCH_SIZE = REGISTRY.histogram(
+    "jdcv_embedding_batch_size", "Texts per model.encode call.", buckets=SIZE_BUCKETS)
+EMBEDDING_BATCH_SECONDS = REGISTRY.histogram("jdcv_embedding_batch_seconds", "Duration of one model.encode call.")
+PARSE_SECONDS = REGISTRY.histogram("jdcv_parse_seconds", "Time to extract text from one document.", ["kind", "result"])
+RANK_SECONDS = REGISTRY.histogram("jdcv_rank_seconds", "Time to score and rank one pool for one query.")
+RANK_POOL_SIZE = REGISTRY.histogram("jdcv_rank_pool_size", "Rows scored per ranking.", buckets=POOL_BUCKETS)
+CACHE_LOOKUPS = REGISTRY.counter("jdcv_extraction_cache_lookups_total", "Extraction cache lookups.", ["result"])
+CACHE_EVICTIONS = REGISTRY.counter("jdcv_extraction_cache_evictions_total", "Extraction cache LRU evictions.")
+
+
+def diagnostics() -> list:
+    """Rows for a human-readable table: (metric, labels, count, mean, p50, p95)."""
+    rows = []
+    for metric in REGISTRY.metrics():
+        if isinstance(metric, Histogram):
+            for key, stats in sorted(metric.summary().items()):
+                rows.append((metric.name, ",".join(key), stats["count"], stats["mean"], stats["p50"], stats["p95"]))
+        else:
+            for key, value in sorted(metric.values().items()):
+                rows.append((metric.name, ",".join(key), value, None, None, None))
+    return rows
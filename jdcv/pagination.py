@@ -0,0 +1,145 @@
+"""
+Lazily evaluated, cursor-paged rankings.
+
+    results = RankedResults(store.cvs, job_entry, limit=1000, min_score=0.3)
+    page = results.page(size=20)                      # {"items": [...], "next_cursor": "..."}
+    page = results.page(page["next_cursor"], size=20)
+    for item in results:                              # streams every item, a page at a time
+        ...
+
+Nothing is scored until the first page is read, and the first page only sorts
+the rows it returns; reading on (iteration, streaming) sorts the scored rows once
+and slices every later page from that order. Cursors are opaque keyset positions (score, row) rather than
+offsets, so they can be passed back by a client in a later request: CVs added
+in between do not shift or repeat items. A cursor becomes stale when the
+pool is compacted. Within one RankedResults, every page reads the ids captured
+with the scores, so deletes or compaction in between cannot change them.
+"""
+import base64
+import json
+
+import numpy as np
+
+from jdcv.ranking import score_pool, snapshot
+
+
+class StaleCursorError(ValueError):
+    """The cursor was issued before the pool's rows were renumbered (compaction)."""
+
+
+def encode_cursor(score: float, row: int, returned: int, layout: int) -> str:
+    data = json.dumps({"s": score, "r": row, "n": returned, "l": layout}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return {"score": float(data["s"]), "row": int(data["r"]), "returned": int(data["n"]),
+                "layout": int(data["l"])}
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _best(scores: np.ndarray, rows: np.ndarray, size: int) -> np.ndarray:
+    """Indices of the `size` best items ordered by score desc, then row asc (ties cut consistently)."""
+    if size < scores.shape[0]:
+        threshold = scores[np.argpartition(-scores, size - 1)[:size]].min()
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(scores.shape[0])
+    return candidates[np.lexsort((rows[candidates], -scores[candidates]))][:size]
+
+
+class RankedResults:
+    """
+    Ranking of `pool` for `entry` (the weighted four-facet score of jdcv.ranking.rank),
+    read page by page. `limit` caps the total number of items (top-k), `min_score`
+    drops weaker matches, `rows` restricts scoring to those pool rows.
+    """
+
+    def __init__(self, pool, entry: dict, weights: dict = None, id_key: str = "cv_id", limit: int = None,
+                 min_score: float = None, rows: np.ndarray = None):
+        self.pool = pool
+        self.entry = entry
+        self.weights = weights
+        self.id_key = id_key
+        self.limit = limit
+        self.min_score = min_score
+        self.rows = rows
+        self._scored = None
+        self._order = None
+        self._pages = 0
+
+    def _evaluate(self):
+        if self._scored is None:
+            pool = snapshot(self.pool)
+            scores = score_pool(pool, self.entry, self.weights, self.rows)
+            rows = np.arange(scores.shape[0]) if self.rows is None else np.asarray(self.rows, dtype=np.int64)
+            keep = np.isfinite(scores)
+            if self.min_score is not None:
+                keep &= scores >= self.min_score
+            rows = rows[keep]
+            # In-memory pools (FacetIndex) reuse and renumber rows in place, so copy the ids now.
+            ids = np.asarray(pool.ids, dtype=object)[rows]
+            self._scored = (scores[keep], rows, ids, pool.layout)
+        return self._scored
+
+    def _ordered(self):
+        """(order, -score, row) of every scored item, best first; sorted once, for reading past one page."""
+        if self._order is None:
+            scores, rows, _, _ = self._evaluate()
+            order = np.lexsort((rows, -scores))
+            self._order = (order, -scores[order], rows[order])
+        return self._order
+
+    def page(self, cursor: str = None, size: int = 20) -> dict:
+        """{"items": [{id_key, "score"}, ...], "next_cursor": str or None} after `cursor`."""
+        scores, rows, ids, layout = self._evaluate()
+        position = None
+        returned = 0
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            if position["layout"] != layout:
+                raise StaleCursorError("The ranking changed since this cursor was issued; start again")
+            returned = position["returned"]
+        if self.limit is not None:
+            size = min(size, self.limit - returned)
+        if size <= 0:
+            return {"items": [], "next_cursor": None}
+        self._pages += 1
+        if self._pages == 1:
+            # One page (the usual HTTP request): select it without sorting the rest.
+            candidates = np.arange(scores.shape[0])
+            if position is not None:
+                candidates = np.flatnonzero((scores < position["score"]) |
+                                            ((scores == position["score"]) & (rows > position["row"])))
+            best = candidates[_best(scores[candidates], rows[candidates], size)]
+            remaining = candidates.shape[0] - len(best)
+        else:
+            order, keys, ordered_rows = self._ordered()
+            start = 0
+            if position is not None:
+                lo = np.searchsorted(keys, -position["score"], "left")
+                hi = np.searchsorted(keys, -position["score"], "right")
+                start = lo + np.searchsorted(ordered_rows[lo:hi], position["row"], "right")
+            best = order[start:start + size]
+            remaining = order.shape[0] - start - len(best)
+        items = [{self.id_key: ids[i], "score": float(scores[i])} for i in best]
+        returned += len(best)
+        more = remaining > 0 and (self.limit is None or returned < self.limit)
+        next_cursor = encode_cursor(float(scores[best[-1]]), int(rows[best[-1]]), returned, layout) if more else None
+        return {"items": items, "next_cursor": next_cursor}
+
+    def iter_pages(self, size: int = 100, cursor: str = None):
+        """Pages of `size` items from `cursor` (the start by default) to the end of the ranking."""
+        while True:
+            page = self.page(cursor, size)
+            yield page
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return
+
+    def __iter__(self):
+        for page in self.iter_pages():
+            yield from page["items"]
@@ -0,0 +1,168 @@
+import io
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from jdcv.metrics import PARSE_SECONDS
+from jdcv.processes import process_pool
+
+# PyPDF2 and python-docx are imported where they are used, so importing this module
+# (and starting the app or API) does not pay for them.
+
+# Upload MIME types (as reported by Streamlit) and file extensions -> document kind.
+MIME_KINDS = {
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+    "text/plain": "txt",
+}
+EXTENSION_KINDS = {".pdf": "pdf", ".docx": "docx", ".txt": "txt"}
+
+MAX_FILE_BYTES = 10 * 1024 * 1024
+MAX_PAGES = 50
+# PDFs longer than this are split into page ranges parsed in parallel.
+PARALLEL_PAGE_THRESHOLD = 16
+PAGES_PER_TASK = 8
+
+
+class DocumentError(ValueError):
+    """The document is unsupported, unreadable or over the configured limits."""
+
+
+def kind_for(name: str = None, mime: str = None):
+    """Document kind ("pdf", "docx", "txt") from a MIME type or file name, else None."""
+    if mime in MIME_KINDS:
+        return MIME_KINDS[mime]
+    if name:
+        return EXTENSION_KINDS.get(os.path.splitext(name)[1].lower())
+    return None
+
+
+def pdf_pages_text(data: bytes, start: int, stop: int) -> list:
+    """Text of pages [start, stop) of a PDF; runs in a worker process."""
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def join_pages(pages) -> str:
+    # One join instead of repeated `text +=`; empty pages are skipped as before.
+    return "".join(f"{page}\n" for page in pages if page)
+
+
+def parse_bytes(data: bytes, kind: str, max_pages: int = MAX_PAGES) -> str:
+    """Extract text from one document in the current process."""
+    try:
+        if kind == "pdf":
+            import PyPDF2
+
+            reader = PyPDF2.PdfReader(io.BytesIO(data))
+            if len(reader.pages) > max_pages:
+                raise DocumentError(f"PDF has {len(reader.pages)} pages (limit {max_pages}).")
+            return join_pages(page.extract_text() for page in reader.pages)
+        if kind == "docx":
+            import docx
+
+            document = docx.Document(io.BytesIO(data))
+            return "\n".join(para.text for para in document.paragraphs)
+        if kind == "txt":
+            return data.decode("utf-8")
+    except DocumentError:
+        raise
+    except Exception as exc:
+        raise DocumentError(f"Error reading {kind.upper()} file.") from exc
+    raise DocumentError("Unsupported file type!")
+
+
+class DocumentParser:
+    """
+    Parses PDF/DOCX/TXT documents in a process pool (one worker per CPU by default),
+    keeping PDF parsing off the UI / request thread. Large PDFs are split into page
+    ranges parsed in parallel; `iter_parse` streams documents back as each finishes.
+    """
+
+    def __init__(self, max_workers: int = None, max_file_bytes: int = MAX_FILE_BYTES,
+                 max_pages: int = MAX_PAGES, pages_per_task: int = PAGES_PER_TASK):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_file_bytes = max_file_bytes
+        self.max_pages = max_pages
+        self.pages_per_task = pages_per_task
+        self._pool = process_pool(self.max_workers)
+
+    def _check_size(self, data: bytes):
+        if len(data) > self.max_file_bytes:
+            raise DocumentError(f"File is {len(data)} bytes (limit {self.max_file_bytes}).")
+
+    def parse(self, data: bytes, kind: str) -> str:
+        """Parse one document in the pool; raises DocumentError."""
+        start = time.perf_counter()
+        result = "error"
+        try:
+            text = self._parse(data, kind)
+            result = "ok"
+            return text
+        finally:
+            PARSE_SECONDS.observe(time.perf_counter() - start, kind=kind, result=result)
+
+    def _parse(self, data: bytes, kind: str) -> str:
+        self._check_size(data)
+        if kind == "pdf":
+            import PyPDF2
+
+            try:
+                page_count = len(PyPDF2.PdfReader(io.BytesIO(data)).pages)
+            except Exception as exc:
+                raise DocumentError("Error reading PDF file.") from exc
+            if page_count > self.max_pages:
+                raise DocumentError(f"PDF has {page_count} pages (limit {self.max_pages}).")
+            if page_count > PARALLEL_PAGE_THRESHOLD:
+                ranges = [(start, min(start + self.pages_per_task, page_count))
+                          for start in range(0, page_count, self.pages_per_task)]
+                futures = [self._pool.submit(pdf_pages_text, data, start, stop) for start, stop in ranges]
+                try:
+                    return join_pages(page for future in futures for page in future.result())
+                except Exception as exc:
+                    raise DocumentError("Error reading PDF file.") from exc
+        return self._pool.submit(parse_bytes, data, kind, self.max_pages).result()
+
+    def iter_parse(self, documents, max_pending: int = None):
+        """
+        Parse many documents concurrently. `documents` yields (key, data, kind) and is
+        consumed lazily, keeping at most `max_pending` documents in flight (default:
+        twice the worker count). Yields (key, text, error) in completion order, with
+        exactly one of text/error set.
+        """
+        max_pending = max_pending or 2 * self.max_workers
+        pending = {}
+        documents = iter(documents)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    key, data, kind = next(documents)
+                except StopIteration:
+                    exhausted = True
+                    break
+                try:
+                    self._check_size(data)
+                except DocumentError as exc:
+                    yield key, None, exc
+                    continue
+                future = self._pool.submit(parse_bytes, data, kind, self.max_pages)
+                pending[future] = (key, kind, time.perf_counter())
+            if not pending:
+                continue
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, kind, start = pending.pop(future)
+                try:
+                    text = future.result()
+                except Exception as exc:
+                    PARSE_SECONDS.observe(time.perf_counter() - start, kind=kind, result="error")
+                    yield key, None, exc
+                else:
+                    PARSE_SECONDS.observe(time.perf_counter() - start, kind=kind, result="ok")
+                    yield key, text, None
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
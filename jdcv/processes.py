@@ -0,0 +1,12 @@
+"""Worker process pools shared by document parsing and sharded ranking."""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def process_pool(workers: int, initializer=None) -> ProcessPoolExecutor:
+    """
+    A pool of `workers` processes started with spawn. The app and backend are
+    multi-threaded (task queue workers, request threads, the embedding batcher),
+    which makes fork unsafe: a child could inherit a lock another thread held.
+    """
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"), initializer=initializer)
@@ -0,0 +1,67 @@
+"""
+Compact storage for unit-length facet embeddings.
+
+"float32" is the full-precision default. "float16" halves the memory. "int8" is
+symmetric per-row scalar quantization (row = int8 codes * float32 scale) and uses
+about a quarter of it. Scoring never materializes a full-precision copy of the pool:
+low-precision matrices are upcast one block of rows at a time inside `dot_rows`.
+int8 scores about as fast as float32. float16 is the most accurate compact mode but
+the slowest to score, because NumPy's float16 -> float32 conversion is not vectorized.
+"""
+import numpy as np
+
+STORAGE_DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+# File suffix of each facet matrix in a jdcv.store directory.
+FILE_SUFFIXES = {"float32": "f32", "float16": "f16", "int8": "i8"}
+
+# Rows upcast per step when scoring quantized matrices (~6 MB of float32 at dim 384).
+BLOCK_ROWS = 4096
+
+
+def storage_dtype(name: str) -> np.dtype:
+    if name not in STORAGE_DTYPES:
+        raise ValueError(f"Unknown embedding dtype {name!r}; expected one of {sorted(STORAGE_DTYPES)}")
+    return np.dtype(STORAGE_DTYPES[name])
+
+
+def quantize_rows(matrix: np.ndarray, dtype: str = "float32"):
+    """
+    (data, scales) for an (n, dim) float matrix in the given storage dtype.
+    `scales` is a float32 vector for "int8" and None otherwise.
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    if dtype != "int8":
+        return matrix.astype(storage_dtype(dtype), copy=False), None
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    data = np.rint(matrix / scales[:, None]).astype(np.int8)
+    return data, scales.astype(np.float32)
+
+
+def dequantize_rows(data: np.ndarray, scales: np.ndarray = None) -> np.ndarray:
+    """float32 rows back from `quantize_rows` output (a no-copy view for float32 data)."""
+    matrix = np.asarray(data).astype(np.float32, copy=False)
+    if scales is not None:
+        matrix = matrix * np.asarray(scales, dtype=np.float32)[:, None]
+    return matrix
+
+
+def dot_rows(data: np.ndarray, queries: np.ndarray, scales: np.ndarray = None,
+             block_rows: int = BLOCK_ROWS) -> np.ndarray:
+    """
+    data @ queries for a stored matrix, where `queries` is one float32 vector (dim,)
+    or a (dim, m) matrix. float32 data goes straight to BLAS; float16 / int8 data is
+    upcast blockwise, with int8 per-row scales applied to the block's results.
+    """
+    queries = np.asarray(queries, dtype=np.float32)
+    if data.dtype == np.float32 and scales is None:
+        return data @ queries
+    out = np.empty((data.shape[0],) + queries.shape[1:], dtype=np.float32)
+    for start in range(0, data.shape[0], block_rows):
+        stop = min(start + block_rows, data.shape[0])
+        out[start:stop] = data[start:stop].astype(np.float32) @ queries
+    if scales is not None:
+        out *= scales.reshape((-1,) + (1,) * (out.ndim - 1))
+    return out
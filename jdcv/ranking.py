@@ -0,0 +1,223 @@
+import time
+
+import numpy as np
+
+from jdcv.metrics import RANK_POOL_SIZE, RANK_SECONDS
+from jdcv.quantization import dequantize_rows, dot_rows
+
+# Facets extracted from every CV / Job Description, in matrix column order.
+FACETS = ("skills", "education", "requirement", "experience")
+
+# Matching weights
+WEIGHT_SKILLS = 0.4
+WEIGHT_EDUCATION = 0.2
+WEIGHT_REQUIREMENT = 0.2
+WEIGHT_EXPERIENCE = 0.2
+
+DEFAULT_WEIGHTS = {
+    "skills": WEIGHT_SKILLS,
+    "education": WEIGHT_EDUCATION,
+    "requirement": WEIGHT_REQUIREMENT,
+    "experience": WEIGHT_EXPERIENCE,
+}
+
+
+def normalize_rows(matrix) -> np.ndarray:
+    """Return a float32 copy of `matrix` with every row scaled to unit length (zero rows stay zero)."""
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class FacetIndex:
+    """
+    In-memory pool of documents kept as one contiguous, pre-normalized float32 matrix per facet.
+    Rows are appended in place (amortised growth) and deleted by moving the last row into the hole,
+    so scoring a job against the whole pool is a single matmul per facet.
+    """
+
+    # Pools with tombstoned rows expose a boolean mask here (see jdcv.store.Collection).
+    deleted = None
+
+    def __init__(self, dim: int = None, capacity: int = 1024):
+        self.dim = dim
+        self.ids = []
+        self._rows = {}
+        self._capacity = capacity
+        self._matrices = None
+        # Bumped whenever existing rows move, so row-based indexes (jdcv.ann) know to rebuild.
+        self.layout = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._rows
+
+    def _allocate(self, dim: int, capacity: int):
+        old = self._matrices
+        self._matrices = {facet: np.zeros((capacity, dim), dtype=np.float32) for facet in FACETS}
+        if old is not None:
+            for facet in FACETS:
+                self._matrices[facet][:len(self.ids)] = old[facet][:len(self.ids)]
+        self.dim = dim
+        self._capacity = capacity
+
+    def add(self, doc_id: str, entry: dict):
+        """Insert (or replace) a document; `entry[facet]["embedding"]` holds each facet vector."""
+        vectors = {facet: normalize_rows(entry[facet]["embedding"])[0] for facet in FACETS}
+        if self._matrices is None:
+            self._allocate(vectors[FACETS[0]].shape[0], self._capacity)
+        if doc_id in self._rows:
+            row = self._rows[doc_id]
+        else:
+            row = len(self.ids)
+            if row == self._capacity:
+                self._allocate(self.dim, self._capacity * 2)
+            self.ids.append(doc_id)
+            self._rows[doc_id] = row
+        for facet in FACETS:
+            self._matrices[facet][row] = vectors[facet]
+
+    def extend(self, doc_ids: list, matrices: dict):
+        """Bulk-append documents given one (n, dim) matrix per facet."""
+        matrices = {facet: normalize_rows(matrices[facet]) for facet in FACETS}
+        if self._matrices is None:
+            self._allocate(matrices[FACETS[0]].shape[1], self._capacity)
+        start = len(self.ids)
+        end = start + len(doc_ids)
+        if end > self._capacity:
+            capacity = self._capacity
+            while capacity < end:
+                capacity *= 2
+            self._allocate(self.dim, capacity)
+        for facet in FACETS:
+            self._matrices[facet][start:end] = matrices[facet]
+        for row, doc_id in enumerate(doc_ids, start):
+            self._rows[doc_id] = row
+        self.ids.extend(doc_ids)
+
+    def remove(self, doc_id: str):
+        """Delete a document, keeping the live rows contiguous."""
+        row = self._rows.pop(doc_id, None)
+        if row is None:
+            return
+        last = len(self.ids) - 1
+        if row != last:
+            self.layout += 1
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self._rows[moved] = row
+            for facet in FACETS:
+                self._matrices[facet][row] = self._matrices[facet][last]
+        self.ids.pop()
+
+    def matrix(self, facet: str) -> np.ndarray:
+        """View of the live rows for `facet`, shape (len(self), dim)."""
+        if self._matrices is None:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        return self._matrices[facet][:len(self.ids)]
+
+    def scales(self, facet: str):
+        """Per-row int8 scales; always None here since rows are kept in float32."""
+        return None
+
+
+def query_vectors(entry: dict) -> dict:
+    """Pre-normalized float32 query vector per facet for a CV or job entry."""
+    return {facet: normalize_rows(entry[facet]["embedding"])[0] for facet in FACETS}
+
+
+def snapshot(pool):
+    """
+    A view of `pool` that does not change under the caller: pools shared with other
+    processes (jdcv.store.Collection) provide `snapshot()`; in-memory pools such as
+    FacetIndex are returned as they are. Take one per scoring call.
+    """
+    take = getattr(pool, "snapshot", None)
+    return take() if take is not None else pool
+
+
+def pool_vectors(pool, facet: str, rows: np.ndarray = None) -> np.ndarray:
+    """float32 rows of `pool`'s facet matrix (all, or only `rows`), dequantized if stored as int8/float16."""
+    matrix, scales = pool.matrix(facet), pool.scales(facet)
+    if rows is not None:
+        matrix = matrix[rows]
+        scales = None if scales is None else scales[rows]
+    return dequantize_rows(matrix, scales)
+
+
+def score_pool(pool, entry: dict, weights: dict = None, rows: np.ndarray = None) -> np.ndarray:
+    """
+    Weighted four-facet cosine score of `entry` against every document in `pool`
+    (or only the given `rows`, e.g. an ANN shortlist).
+    `pool` is anything exposing `ids`, `deleted`, `matrix(facet)` with unit-length
+    rows and `scales(facet)` (per-row int8 scales, or None); tombstoned rows score -inf.
+    Quantized matrices are scored blockwise, without a full-precision copy.
+    Scores one snapshot of `pool`; pass a snapshot to read its `ids` consistently.
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    pool = snapshot(pool)
+    matrices = {facet: pool.matrix(facet) for facet in FACETS}
+    scales = {facet: pool.scales(facet) for facet in FACETS}
+    if rows is not None:
+        matrices = {facet: matrix[rows] for facet, matrix in matrices.items()}
+        scales = {facet: None if s is None else s[rows] for facet, s in scales.items()}
+    if matrices[FACETS[0]].shape[0] == 0:
+        return np.zeros(0, dtype=np.float32)
+    queries = query_vectors(entry)
+    scores = None
+    for facet in FACETS:
+        # Weighting the query instead of the result saves one pass over the scores.
+        part = dot_rows(matrices[facet], weights[facet] * queries[facet], scales[facet])
+        scores = part if scores is None else scores + part
+    if pool.deleted is not None and pool.deleted.any():
+        scores[pool.deleted if rows is None else pool.deleted[rows]] = -np.inf
+    return scores
+
+
+def score_pair(entry: dict, other: dict, weights: dict = None) -> float:
+    """Weighted four-facet cosine score between two single entries (e.g. one JD and one CV)."""
+    weights = weights or DEFAULT_WEIGHTS
+    a, b = query_vectors(entry), query_vectors(other)
+    return float(sum(weights[facet] * np.dot(a[facet], b[facet]) for facet in FACETS))
+
+
+def top_k_indices(scores: np.ndarray, k: int = None) -> np.ndarray:
+    """Indices of the `k` highest scores in descending order, without sorting the whole array."""
+    n = scores.shape[0]
+    if k is None or k >= n:
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+def ranked(pool, scores: np.ndarray, rows: np.ndarray = None, k: int = None, id_key: str = "cv_id") -> list:
+    """Top-`k` of `scores` (scores[i] belongs to pool row rows[i]) as [{id_key: ..., "score": ...}, ...]."""
+    if rows is None:
+        rows = np.arange(scores.shape[0])
+    return [
+        {id_key: pool.ids[rows[i]], "score": float(scores[i])}
+        for i in top_k_indices(scores, k)
+        if pool.ids[rows[i]] is not None
+    ]
+
+
+def rank(pool, entry: dict, k: int = None, weights: dict = None, id_key: str = "cv_id",
+         rows: np.ndarray = None) -> list:
+    """
+    Return the top-`k` documents of `pool` for `entry` as [{id_key: ..., "score": ...}, ...].
+    With `rows`, only those pool rows are scored (exact re-rank of a shortlist).
+    """
+    start = time.perf_counter()
+    pool = snapshot(pool)
+    scores = score_pool(pool, entry, weights, rows)
+    if scores.size == 0:
+        return []
+    ranking = ranked(pool, scores, rows, k, id_key)
+    RANK_SECONDS.observe(time.perf_counter() - start)
+    RANK_POOL_SIZE.observe(scores.shape[0])
+    return ranking
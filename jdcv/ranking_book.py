@@ -0,0 +1,147 @@
+import heapq
+import threading
+
+import numpy as np
+
+from jdcv.ranking import DEFAULT_WEIGHTS, FACETS, pool_vectors, rank, snapshot
+
+
+class RankingBook:
+    """
+    Bounded top-`k` candidate ranking for every open job, maintained incrementally.
+
+    `sync()` scores only CVs added since the previous call against all jobs at once
+    (one matmul per facet per block of new CVs) and merges them into each job's
+    min-heap; only scores above a job's current k-th best ever reach Python.
+    New jobs get one exact ranking; deleted jobs are dropped. Deleted CVs are evicted
+    on read, and a job whose full heap lost an entry is re-ranked on its own to
+    backfill. The full CV x job matrix is never recomputed.
+    Works on a jdcv.store.DocumentStore and picks up writes from other processes.
+    """
+
+    def __init__(self, store, k: int = 100, weights: dict = None, block_size: int = 1024):
+        self.cvs = store.cvs
+        self.jobs = store.jobs
+        self.k = k
+        self.weights = weights or DEFAULT_WEIGHTS
+        self.block_size = block_size
+        self._heaps = {}
+        self._members = {}
+        self._stale = set()
+        self._merged_ids = set()
+        self._merged_rows = 0
+        self._cv_layout = None
+        self._lock = threading.RLock()
+
+    def merge_ranking(self, job_id: str, ranking: list):
+        """
+        Merge an exact ranking such as perform_job_matching's into a job's heap, seeding
+        it if the job is new. The ranking may come from an older snapshot than the heap
+        (a concurrent sync() can already have merged newer CVs), so it never replaces it.
+        """
+        with self._lock:
+            self._heaps.setdefault(job_id, [])
+            self._members.setdefault(job_id, set())
+            for r in ranking[:self.k]:
+                if r["score"] > self._threshold(job_id):
+                    self._push(job_id, r["score"], r["cv_id"])
+            self._stale.discard(job_id)
+
+    def _rerank(self, job_id: str):
+        self.merge_ranking(job_id, rank(self.cvs, self.jobs.get(job_id), k=self.k, weights=self.weights))
+
+    def _push(self, job_id: str, score: float, cv_id: str):
+        heap, members = self._heaps[job_id], self._members[job_id]
+        if cv_id in members:
+            return
+        members.add(cv_id)
+        if len(heap) < self.k:
+            heapq.heappush(heap, (score, cv_id))
+        else:
+            _, evicted = heapq.heapreplace(heap, (score, cv_id))
+            members.discard(evicted)
+
+    def _threshold(self, job_id: str) -> float:
+        heap = self._heaps[job_id]
+        return heap[0][0] if len(heap) >= self.k else -np.inf
+
+    def _merge_cvs(self, cvs, rows: np.ndarray):
+        jobs = snapshot(self.jobs)
+        job_rows = np.array([row for row, job_id in enumerate(jobs.ids) if job_id in self._heaps],
+                            dtype=np.int64)
+        if job_rows.size == 0:
+            return
+        job_ids = [jobs.ids[row] for row in job_rows]
+        job_matrices = {facet: pool_vectors(jobs, facet, job_rows) for facet in FACETS}
+        thresholds = np.array([self._threshold(job_id) for job_id in job_ids], dtype=np.float32)
+        for start in range(0, rows.shape[0], self.block_size):
+            block = rows[start:start + self.block_size]
+            scores = None
+            for facet in FACETS:
+                part = self.weights[facet] * (job_matrices[facet] @ pool_vectors(cvs, facet, block).T)
+                scores = part if scores is None else scores + part
+            for j, b in zip(*np.nonzero(scores > thresholds[:, None])):
+                score = scores[j, b]
+                # The threshold may have risen since the mask was computed.
+                if score <= thresholds[j]:
+                    continue
+                self._push(job_ids[j], float(score), cvs.ids[block[b]])
+                thresholds[j] = self._threshold(job_ids[j])
+
+    def sync(self):
+        """Merge CVs added since the last call and pick up new / deleted jobs."""
+        with self._lock:
+            cvs = snapshot(self.cvs)
+            live_jobs = set(self.jobs.live_ids())
+            for job_id in list(self._heaps):
+                if job_id not in live_jobs:
+                    self.remove_job(job_id)
+
+            ids = cvs.ids
+            if cvs.layout != self._cv_layout:
+                # Compaction renumbered rows: fall back to an ID check to find unmerged CVs.
+                rows = [row for row, cv_id in enumerate(ids) if cv_id is not None and cv_id not in self._merged_ids]
+                self._cv_layout = cvs.layout
+            else:
+                rows = [row for row in range(self._merged_rows, len(ids)) if ids[row] is not None]
+            self._merged_rows = len(ids)
+            if rows:
+                self._merge_cvs(cvs, np.array(rows, dtype=np.int64))
+                self._merged_ids.update(ids[row] for row in rows)
+
+            for job_id in live_jobs - self._heaps.keys():
+                self._rerank(job_id)
+
+    def remove_cv(self, cv_id: str):
+        """Evict a deleted CV from every job; full heaps are backfilled on next read."""
+        with self._lock:
+            self._merged_ids.discard(cv_id)
+            for job_id, members in self._members.items():
+                if cv_id in members:
+                    heap = self._heaps[job_id]
+                    if len(heap) >= self.k:
+                        self._stale.add(job_id)
+                    members.discard(cv_id)
+                    self._heaps[job_id] = [item for item in heap if item[1] != cv_id]
+                    heapq.heapify(self._heaps[job_id])
+
+    def remove_job(self, job_id: str):
+        with self._lock:
+            self._heaps.pop(job_id, None)
+            self._members.pop(job_id, None)
+            self._stale.discard(job_id)
+
+    def ranking(self, job_id: str) -> list:
+        """Current top-k for a job as [{"cv_id", "score"}, ...], best first."""
+        with self._lock:
+            self.sync()
+            heap = self._heaps.get(job_id)
+            if heap is None:
+                return []
+            cv_ids = [cv_id for _, cv_id in heap]
+            for cv_id, live in zip(cv_ids, self.cvs.live_mask(cv_ids)):
+                if not live:
+                    self.remove_cv(cv_id)
+            if job_id in self._stale:
+                self._rerank(job_id)
+            return [{"cv_id": cv_id, "score": score} for score, cv_id in sorted(self._heaps[job_id], reverse=True)]
@@ -0,0 +1,117 @@
+"""
+Section splitting and token budgeting for LLM facet extraction.
+
+Parsed CV / JD text is split on its headings (SKILLS, Education, Work Experience:,
+...) so each facet question is sent only the sections that can answer it, e.g.
+the skills question sees the skills section rather than the whole document.
+Documents without recognisable headings fall back to the full text.
+"""
+import re
+
+# Section name -> heading phrases (lower case, without the trailing colon).
+SECTION_HEADINGS = {
+    "summary": ("summary", "profile", "professional summary", "about me", "objective", "career objective",
+                "about the role", "about us", "about the job", "overview", "role overview", "job summary"),
+    "skills": ("skills", "technical skills", "key skills", "core skills", "core competencies", "competencies",
+               "technologies", "tools", "tech stack", "technical expertise", "expertise", "skills and tools"),
+    "education": ("education", "academic background", "academic qualifications", "educational background",
+                  "certifications", "certificates", "education and certifications", "training", "degrees"),
+    "experience": ("experience", "work experience", "professional experience", "employment history",
+                   "employment", "work history", "career history", "projects", "relevant experience",
+                   "responsibilities", "what you will do", "what you'll do", "key responsibilities"),
+    "requirements": ("requirements", "qualifications", "required qualifications", "preferred qualifications",
+                     "what we are looking for", "what we're looking for", "who you are", "must have",
+                     "nice to have", "minimum qualifications", "job requirements"),
+}
+
+# Headings of sections no facet question uses; their text goes under "other".
+OTHER_HEADINGS = ("hobbies", "interests", "hobbies and interests", "references", "languages", "awards",
+                  "honors", "achievements", "publications", "volunteering", "activities", "memberships",
+                  "personal details", "personal information", "contact", "contact details",
+                  "additional information", "benefits", "what we offer", "how to apply")
+
+# Prompt kind -> facet -> sections sent with that facet's question (None: whole document).
+# Job ads often list skills, degrees and years of experience under "Requirements".
+FACET_SECTIONS = {
+    "cv": {
+        "skills": ("skills", "experience"),
+        "education": ("education",),
+        "requirement": None,
+        "experience": ("summary", "experience"),
+    },
+    "jd": {
+        "skills": ("skills", "requirements"),
+        "education": ("education", "requirements"),
+        "requirement": ("summary", "requirements"),
+        "experience": ("summary", "experience", "requirements"),
+    },
+}
+
+# Rough tokens-per-character ratio for English text under BPE tokenizers.
+CHARS_PER_TOKEN = 4
+
+HEADINGS = {phrase: section for section, phrases in SECTION_HEADINGS.items() for phrase in phrases}
+_HEADING_RE = re.compile(
+    r"^\s*[#*\-•]*\s*(" + "|".join(sorted(map(re.escape, HEADINGS), key=len, reverse=True)) + r")\s*(:|$)\s*",
+    re.IGNORECASE,
+)
+# A bare OTHER_HEADINGS line or a short all-caps line ending in a colon ("VOLUNTEER WORK:")
+# ends the current section. Other all-caps lines ("SQL", "AWS") are content, e.g. a skills list.
+_OTHER_HEADING_RE = re.compile(
+    r"^\s*[#*\-•]*\s*(?:(?i:" + "|".join(sorted(map(re.escape, OTHER_HEADINGS), key=len, reverse=True))
+    + r")\s*:?|[A-Z][A-Z &/\-]{2,40}:)\s*$"
+)
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def split_sections(text: str) -> dict:
+    """
+    Section name -> text of all sections with that name, in document order.
+    Text before the first heading is kept under "header", sections under other headings
+    (see _OTHER_HEADING_RE) under "other", heading line included. No line is dropped.
+    """
+    sections = {}
+    current = "header"
+    for line in text.splitlines():
+        match = _HEADING_RE.match(line)
+        if match:
+            current = HEADINGS[match.group(1).lower()]
+            line = line[match.end():]
+        elif _OTHER_HEADING_RE.match(line):
+            current = "other"
+        if line.strip():
+            sections.setdefault(current, []).append(line)
+    return {name: _normalize(" ".join(lines)) for name, lines in sections.items()}
+
+
+def approx_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def truncate_tokens(text: str, max_tokens: int = None) -> str:
+    """`text` cut to about `max_tokens` tokens, at a word boundary."""
+    if max_tokens is None or approx_tokens(text) <= max_tokens:
+        return text
+    cut = text[:max_tokens * CHARS_PER_TOKEN]
+    return cut[:cut.rfind(" ")] if " " in cut else cut
+
+
+def facet_contexts(sections: dict, kind: str, facets, full_text: str, max_tokens: int = None) -> dict:
+    """
+    Facet -> document text to send with its question: the facet's sections from
+    FACET_SECTIONS after the untitled lead-in (name, job title), or `full_text`
+    when the document has none of them. Each is truncated to `max_tokens`.
+    """
+    contexts = {}
+    for facet in facets:
+        found = [name for name in FACET_SECTIONS[kind].get(facet) or () if sections.get(name)]
+        # A lone summary says too little to answer from; use the whole document instead.
+        if not found or found == ["summary"]:
+            context = full_text
+        else:
+            context = " ".join(sections[name] for name in ["header"] + found if sections.get(name))
+        contexts[facet] = truncate_tokens(context, max_tokens)
+    return contexts
@@ -0,0 +1,137 @@
+"""
+Exact ranking of very large pools split across a process pool.
+
+    ranker = ShardedRanker(store.cvs, shards=8)
+    ranker.rank(job_entry, k=100)          # same result as jdcv.ranking.rank
+    ranker.rank_many(job_entries, k=100)   # one pass over every shard for many jobs
+
+The pool's rows are cut into `shards` contiguous ranges scored in parallel by
+worker processes. Workers memory-map the pool's facet files themselves, so the
+matrices are shared through the OS page cache and never pickled; the weighted
+job vectors go to them through one shared-memory block per call. Each shard
+returns its own top-k and the parent merges them.
+"""
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from jdcv.metrics import RANK_POOL_SIZE, RANK_SECONDS
+from jdcv.processes import process_pool
+from jdcv.quantization import dot_rows, storage_dtype
+from jdcv.ranking import DEFAULT_WEIGHTS, FACETS, query_vectors, snapshot, top_k_indices
+
+# Worker-process state: memory maps by (path, shape, layout), reused across calls.
+_MAPS = {}
+_THREAD_LIMITS = None
+
+
+def _init_worker():
+    """One BLAS thread per worker: the pool already uses every core."""
+    global _THREAD_LIMITS
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    _THREAD_LIMITS = threadpool_limits(limits=1)
+
+
+def _mapped(path: str, dtype, shape: tuple, layout: int) -> np.ndarray:
+    key = (path, shape, layout)
+    array = _MAPS.get(key)
+    if array is None:
+        # Appends grow the file and compaction rewrites it; drop maps of older versions.
+        for stale in [other for other in _MAPS if other[0] == path]:
+            del _MAPS[stale]
+        array = _MAPS[key] = np.memmap(path, dtype=dtype, mode="r", shape=shape)
+    return array
+
+
+def _score_shard(spec: tuple, shm_name: str, shape: tuple, start: int, stop: int, deleted: np.ndarray, k):
+    """Per-job (rows, scores) top-k of pool rows [start, stop) for the queries in shared memory."""
+    files, dtype, n, dim, layout = spec
+    block = shared_memory.SharedMemory(name=shm_name)
+    try:
+        queries = np.array(np.ndarray(shape, dtype=np.float32, buffer=block.buf))
+    finally:
+        block.close()
+    scores = None
+    for i, facet in enumerate(FACETS):
+        path, scale_path = files[facet]
+        data = _mapped(path, storage_dtype(dtype), (n, dim), layout)[start:stop]
+        scales = None if scale_path is None else _mapped(scale_path, np.float32, (n,), layout)[start:stop]
+        part = dot_rows(data, queries[:, i, :].T, scales)
+        scores = part if scores is None else scores + part
+    if deleted.size:
+        scores[deleted - start] = -np.inf
+    results = []
+    for j in range(scores.shape[1]):
+        top = top_k_indices(scores[:, j], k)
+        results.append((top + start, scores[top, j]))
+    return results
+
+
+class ShardedRanker:
+    """
+    jdcv.ranking.rank over `shards` row ranges of a file-backed pool, scored by
+    `workers` processes. `pool` must also expose `dtype` and `facet_files(facet)`
+    -> (matrix path, int8 scale path or None), as jdcv.store.Collection does.
+    """
+
+    def __init__(self, pool, shards: int = None, workers: int = None):
+        self.pool = pool
+        self.workers = workers or os.cpu_count() or 1
+        self.shards = shards or self.workers
+        self._executor = process_pool(self.workers, initializer=_init_worker)
+
+    def rank(self, entry: dict, k: int = None, weights: dict = None, id_key: str = "cv_id") -> list:
+        """Top-`k` documents for `entry` as [{id_key: ..., "score": ...}, ...]."""
+        return self.rank_many([entry], k, weights, id_key)[0]
+
+    def rank_many(self, entries: list, k: int = None, weights: dict = None, id_key: str = "cv_id") -> list:
+        """One ranking per entry; all entries are scored in the same pass over each shard."""
+        start = time.perf_counter()
+        weights = weights or DEFAULT_WEIGHTS
+        pool = snapshot(self.pool)
+        n, dim = pool.matrix(FACETS[0]).shape
+        if n == 0 or not entries:
+            return [[] for _ in entries]
+        ids, deleted = pool.ids, pool.deleted
+        spec = ({facet: pool.facet_files(facet) for facet in FACETS}, pool.dtype, n, dim, pool.layout)
+        dead = np.flatnonzero(deleted[:n]) if deleted is not None else np.empty(0, dtype=np.int64)
+
+        queries = np.empty((len(entries), len(FACETS), dim), dtype=np.float32)
+        for j, entry in enumerate(entries):
+            vectors = query_vectors(entry)
+            for i, facet in enumerate(FACETS):
+                queries[j, i] = weights[facet] * vectors[facet]
+        block = shared_memory.SharedMemory(create=True, size=queries.nbytes)
+        try:
+            np.ndarray(queries.shape, dtype=np.float32, buffer=block.buf)[:] = queries
+            bounds = np.unique(np.linspace(0, n, min(self.shards, n) + 1).astype(np.int64))
+            futures = [
+                self._executor.submit(_score_shard, spec, block.name, queries.shape, int(lo), int(hi),
+                                      dead[(dead >= lo) & (dead < hi)], k)
+                for lo, hi in zip(bounds[:-1], bounds[1:])
+            ]
+            shard_results = [future.result() for future in futures]
+        finally:
+            block.close()
+            block.unlink()
+
+        rankings = []
+        for j in range(len(entries)):
+            rows = np.concatenate([result[j][0] for result in shard_results])
+            scores = np.concatenate([result[j][1] for result in shard_results])
+            rankings.append([
+                {id_key: ids[rows[i]], "score": float(scores[i])}
+                for i in top_k_indices(scores, k)
+                if ids[rows[i]] is not None
+            ])
+        RANK_SECONDS.observe(time.perf_counter() - start)
+        RANK_POOL_SIZE.observe(n)
+        return rankings
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
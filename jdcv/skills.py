@@ -0,0 +1,205 @@
+"""
+Lexical skill matching: normalized skill terms, an inverted index over the `skills`
+facet text of a CV collection, must-have pre-filtering and BM25 / cosine hybrid ranking.
+"""
+import math
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+
+from jdcv.metrics import RANK_POOL_SIZE, RANK_SECONDS
+from jdcv.ranking import ranked, score_pool, rank, snapshot
+
+# Canonical skill term -> variants (spelling, abbreviations, multi-word forms).
+# Multi-word canonical terms also match their spaced form automatically.
+SKILL_SYNONYMS = {
+    "javascript": ("js", "ecmascript", "es6"),
+    "typescript": ("ts",),
+    "python": ("python3", "py"),
+    "golang": ("go",),
+    "c++": ("cpp",),
+    "c#": ("csharp", "c sharp"),
+    "postgresql": ("postgres", "psql"),
+    "sql_server": ("mssql", "ms sql", "microsoft sql server"),
+    "mongodb": ("mongo",),
+    "kubernetes": ("k8s",),
+    "aws": ("amazon web services",),
+    "gcp": ("google cloud", "google cloud platform"),
+    "azure": ("microsoft azure",),
+    "ci_cd": ("ci cd", "continuous integration", "continuous delivery", "continuous deployment"),
+    "rest_api": ("rest", "restful", "rest apis", "restful api", "restful apis"),
+    "react": ("reactjs", "react.js"),
+    "node_js": ("node", "nodejs", "node.js"),
+    "scikit_learn": ("sklearn", "scikit learn"),
+    "machine_learning": ("ml",),
+    "deep_learning": ("dl",),
+    "artificial_intelligence": ("ai",),
+    "natural_language_processing": ("nlp",),
+    "computer_vision": (),
+    "power_bi": ("powerbi",),
+    "excel": ("ms excel", "microsoft excel"),
+}
+
+STOPWORDS = frozenset(
+    "a an and or the of in on at to for with from by as is are be been using use used including include "
+    "etc e.g i.e skill skills experience experienced knowledge proficient proficiency strong good excellent "
+    "familiar familiarity ability working work understanding basic advanced years year".split()
+)
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9+#]")
+MAX_PHRASE = 3
+
+
+def _phrase_table() -> dict:
+    table = {}
+    for canonical, variants in SKILL_SYNONYMS.items():
+        for phrase in (canonical.replace("_", " "),) + variants:
+            table[tuple(TOKEN_RE.findall(phrase))] = canonical
+    return table
+
+
+PHRASES = _phrase_table()
+
+
+def skill_terms(text: str) -> list:
+    """Normalized skill terms of free text: lower-cased tokens, synonyms and phrases mapped to canonical terms."""
+    tokens = TOKEN_RE.findall(text.replace("<br>", " ").lower())
+    terms = []
+    i = 0
+    while i < len(tokens):
+        for length in range(min(MAX_PHRASE, len(tokens) - i), 0, -1):
+            canonical = PHRASES.get(tuple(tokens[i:i + length]))
+            if canonical is not None:
+                terms.append(canonical)
+                i += length
+                break
+        else:
+            if tokens[i] not in STOPWORDS:
+                terms.append(tokens[i])
+            i += 1
+    return terms
+
+
+class SkillIndex:
+    """
+    Inverted index (term -> rows, term frequencies) over one facet's text of a
+    jdcv.store.Collection, kept in step with the collection by `sync()`.
+    Row numbers match the collection's matrices, so candidate rows can be passed
+    straight to jdcv.ranking.rank / score_pool.
+    """
+
+    def __init__(self, collection, facet: str = "skills", k1: float = 1.2, b: float = 0.75):
+        self.collection = collection
+        self.facet = facet
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._postings = {}
+        self._arrays = {}
+        self._lengths = []
+        self._layout = self.collection.layout
+
+    def sync(self):
+        """Index rows appended since the last call; rebuild after compaction renumbered rows."""
+        with self._lock:
+            self.collection.refresh()
+            if self.collection.layout != self._layout:
+                self._reset()
+            if len(self.collection.ids) <= len(self._lengths):
+                return
+            for row, text in self.collection.facet_texts(self.facet, len(self._lengths)):
+                counts = Counter(skill_terms(text))
+                for term, tf in counts.items():
+                    self._postings.setdefault(term, ([], []))
+                    self._postings[term][0].append(row)
+                    self._postings[term][1].append(tf)
+                    self._arrays.pop(term, None)
+                self._lengths.append(sum(counts.values()))
+
+    def _posting(self, term: str):
+        """(rows, tfs) arrays for a term; converted from the append lists once per change."""
+        if term not in self._arrays:
+            rows, tfs = self._postings.get(term, ((), ()))
+            self._arrays[term] = (np.array(rows, dtype=np.int64), np.array(tfs, dtype=np.float32))
+        return self._arrays[term]
+
+    def candidates(self, must_have, pool=None) -> np.ndarray:
+        """
+        Sorted rows of documents containing every must-have skill (each a skill name
+        such as "Python" or "machine learning") that exist and are live in `pool`, the
+        snapshot being scored (by default a fresh snapshot of the indexed collection).
+        """
+        pool = snapshot(self.collection if pool is None else pool)
+        with self._lock:
+            rows = None
+            for skill in must_have:
+                for term in skill_terms(skill):
+                    posting = self._posting(term)[0]
+                    rows = posting if rows is None else np.intersect1d(rows, posting, assume_unique=True)
+            if rows is None:
+                rows = np.arange(len(self._lengths))
+        rows = rows[rows < len(pool.ids)]
+        deleted = pool.deleted
+        if deleted is not None and deleted.any():
+            rows = rows[~deleted[rows]]
+        return rows
+
+    def bm25(self, text: str, n: int) -> np.ndarray:
+        """BM25 score of every row (first `n`) for the skill terms of `text`."""
+        scores = np.zeros(n, dtype=np.float32)
+        with self._lock:
+            if not self._lengths:
+                return scores
+            lengths = np.asarray(self._lengths, dtype=np.float32)
+            average = float(lengths.mean()) or 1.0
+            total = len(self._lengths)
+            for term in set(skill_terms(text)):
+                rows, tfs = self._posting(term)
+                keep = rows < n
+                rows, tfs = rows[keep], tfs[keep]
+                if rows.size == 0:
+                    continue
+                idf = math.log(1 + (total - rows.size + 0.5) / (rows.size + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * lengths[rows] / average)
+                scores[rows] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+        return scores
+
+
+def hybrid_rank(pool, entry: dict, skill_index: SkillIndex, must_have=None, alpha: float = 0.0,
+                k: int = None, weights: dict = None, id_key: str = "cv_id", rows: np.ndarray = None) -> list:
+    """
+    rank() with lexical skill matching on top. `must_have` skills restrict dense
+    scoring to the CVs whose skills facet mentions all of them (synonyms included),
+    within `rows` if given. With `alpha` > 0 the score is (1 - alpha) * weighted
+    cosine + alpha * BM25 of the entry's skills text, BM25 scaled to [0, 1] over
+    the scored rows.
+    """
+    skill_index.sync()
+    pool = snapshot(pool)
+    n = len(pool.ids)
+    if must_have:
+        candidates = skill_index.candidates(must_have, pool)
+        rows = candidates if rows is None else np.intersect1d(candidates, rows)
+        if rows.size == 0:
+            return []
+    if not alpha:
+        return rank(pool, entry, k=k, weights=weights, id_key=id_key, rows=rows)
+
+    with RANK_SECONDS.time():
+        scores = score_pool(pool, entry, weights, rows)
+        lexical = skill_index.bm25(entry["skills"]["text"], n)
+        if rows is not None:
+            lexical = lexical[rows]
+        top = lexical.max() if lexical.size else 0.0
+        if top > 0:
+            lexical /= top
+        live = np.isfinite(scores)
+        scores[live] = (1 - alpha) * scores[live] + alpha * lexical[live]
+        result = ranked(pool, scores, rows, k, id_key)
+    RANK_POOL_SIZE.observe(scores.shape[0])
+    return result
@@ -0,0 +1,412 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from jdcv.quantization import FILE_SUFFIXES, dequantize_rows, quantize_rows, storage_dtype
+from jdcv.ranking import FACETS
+
+# Document kinds kept in the store, and the key their full text uses in an entry dict.
+TEXT_KEYS = {"cv": "cv_text", "job": "jd_text"}
+
+
+class Collection:
+    """
+    All documents of one kind ("cv" or "job").
+    Each facet is a row-major file of unit-length embeddings in the store's dtype
+    (float32, float16, or int8 with a float32 per-row scale file), memory-mapped
+    read-only so loading is zero-copy; row order matches the `documents` table.
+    Deletes are tombstones (`deleted` mask) until `compact()` rewrites the files.
+    Every call re-checks for writes by other processes; use `snapshot()` to score
+    against one consistent version of the rows.
+    """
+
+    def __init__(self, store, kind: str):
+        self.store = store
+        self.kind = kind
+        self.directory = os.path.join(store.root, kind)
+        os.makedirs(self.directory, exist_ok=True)
+        self.dim = None
+        self.ids = []
+        self.deleted = np.zeros(0, dtype=bool)
+        self._rows = {}
+        self._matrices = {}
+        self._scales = {}
+        self._version = None
+        # Changes only when compaction renumbers rows (see jdcv.ann).
+        self.layout = 0
+
+    def _path(self, facet: str, layout: int) -> str:
+        return os.path.join(self.directory, f"{_versioned(facet, layout)}.{FILE_SUFFIXES[self.store.dtype]}")
+
+    def _scale_path(self, facet: str, layout: int) -> str:
+        return os.path.join(self.directory, f"{_versioned(facet, layout)}.scale")
+
+    def _files(self, layout: int, dim: int) -> list:
+        """(path, dtype, row shape) of every facet file of one layout."""
+        files = [(self._path(facet, layout), storage_dtype(self.store.dtype), (dim,)) for facet in FACETS]
+        if self.store.dtype == "int8":
+            files += [(self._scale_path(facet, layout), np.float32, ()) for facet in FACETS]
+        return files
+
+    @property
+    def dtype(self) -> str:
+        return self.store.dtype
+
+    def facet_files(self, facet: str) -> tuple:
+        """(matrix file, int8 scale file or None) behind `matrix(facet)`, for other processes to map."""
+        self.refresh()
+        return _facet_files(self, facet)
+
+    def _load(self):
+        # One read transaction, so rows, layout and version come from the same commit.
+        conn = self.store._conn
+        conn.execute("BEGIN")
+        try:
+            version = self.store._version(self.kind)
+            rows = conn.execute(
+                "SELECT row, doc_id, deleted FROM documents WHERE kind = ? ORDER BY row", (self.kind,)
+            ).fetchall()
+            dim = self.store._dim()
+            layout = int(self.store._setting(f"layout:{self.kind}", "0"))
+        finally:
+            conn.execute("COMMIT")
+        matrices, scales = {}, {}
+        if rows:
+            # Files are named by layout, so these always hold the rows listed above;
+            # a compaction that removed them since raises FileNotFoundError (see refresh).
+            for facet in FACETS:
+                matrices[facet] = np.memmap(self._path(facet, layout), dtype=storage_dtype(self.store.dtype),
+                                            mode="r", shape=(len(rows), dim))
+                if self.store.dtype == "int8":
+                    scales[facet] = np.memmap(self._scale_path(facet, layout), dtype=np.float32, mode="r",
+                                              shape=(len(rows),))
+        self.dim = dim
+        self.ids = [None if deleted else doc_id for _, doc_id, deleted in rows]
+        self.deleted = np.array([bool(deleted) for _, _, deleted in rows], dtype=bool)
+        self._rows = {doc_id: row for row, doc_id, deleted in rows if not deleted}
+        self._matrices = matrices
+        self._scales = scales
+        self.layout = layout
+        self._version = version
+
+    def refresh(self):
+        """Pick up appends/deletes made by other processes sharing the same directory."""
+        with self.store._lock:
+            for attempt in range(LOAD_ATTEMPTS):
+                if self.store._version(self.kind) == self._version:
+                    return
+                try:
+                    self._load()
+                    return
+                except FileNotFoundError:
+                    # Another process compacted between our metadata read and the mapping.
+                    if attempt == LOAD_ATTEMPTS - 1:
+                        raise
+
+    def snapshot(self) -> "Snapshot":
+        """The current rows as an immutable pool (see Snapshot); refreshes once."""
+        with self.store._lock:
+            self.refresh()
+            return Snapshot(self)
+
+    def __len__(self):
+        self.refresh()
+        return len(self._rows)
+
+    def __contains__(self, doc_id):
+        self.refresh()
+        return doc_id in self._rows
+
+    def matrix(self, facet: str) -> np.ndarray:
+        """All rows (including tombstones) for `facet`, shape (len(self.ids), dim)."""
+        self.refresh()
+        if facet not in self._matrices:
+            return np.zeros((0, self.dim or 0), dtype=storage_dtype(self.store.dtype))
+        return self._matrices[facet]
+
+    def scales(self, facet: str):
+        """Per-row float32 scales of an int8 store (aligned with `matrix`), else None."""
+        self.refresh()
+        if self.store.dtype != "int8":
+            return None
+        return self._scales.get(facet, np.zeros(0, dtype=np.float32))
+
+    def rows_for(self, doc_ids) -> np.ndarray:
+        """Row numbers of the given live documents (unknown or deleted IDs are skipped)."""
+        self.refresh()
+        return np.array([self._rows[doc_id] for doc_id in doc_ids if doc_id in self._rows], dtype=np.int64)
+
+    def live_mask(self, doc_ids) -> list:
+        """For each ID, whether it is a live (stored, not deleted) document."""
+        self.refresh()
+        return [doc_id in self._rows for doc_id in doc_ids]
+
+    def live_ids(self) -> list:
+        self.refresh()
+        return [doc_id for doc_id in self.ids if doc_id is not None]
+
+    def facet_texts(self, facet: str, start_row: int = 0) -> list:
+        """(row, text) of `facet` for every row from `start_row` on, tombstones included."""
+        with self.store._lock:
+            rows = self.store._conn.execute(
+                "SELECT row, facets FROM documents WHERE kind = ? AND row >= ? ORDER BY row", (self.kind, start_row)
+            ).fetchall()
+        return [(row, json.loads(facets)[facet]) for row, facets in rows]
+
+    def add(self, doc_id: str, text: str, extracted_info: dict, phone: str = None):
+        """Append a document: facet embeddings to the matrix files, facet texts to the metadata table."""
+        vectors = {}
+        for facet in FACETS:
+            vector = np.asarray(extracted_info[facet]["embedding"], dtype=np.float32).ravel()
+            norm = np.linalg.norm(vector)
+            vectors[facet] = vector / norm if norm else vector
+        facet_texts = json.dumps({facet: extracted_info[facet]["text"] for facet in FACETS})
+        with self.store._write() as conn:
+            dim = self.store._dim(vectors[FACETS[0]].shape[0])
+            layout = int(self.store._setting(f"layout:{self.kind}", "0"))
+            row = conn.execute(
+                "SELECT COALESCE(MAX(row) + 1, 0) FROM documents WHERE kind = ?", (self.kind,)
+            ).fetchone()[0]
+            for facet in FACETS:
+                data, scales = quantize_rows(vectors[facet], self.store.dtype)
+                _write_at(self._path(facet, layout), row * data.nbytes, data)
+                if scales is not None:
+                    _write_at(self._scale_path(facet, layout), row * scales.nbytes, scales)
+            conn.execute(
+                "INSERT INTO documents (doc_id, kind, row, phone, text, facets, deleted, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, 0, ?)",
+                (doc_id, self.kind, row, phone, text, facet_texts, time.time()),
+            )
+            self.store._bump(self.kind)
+
+    def delete(self, doc_id: str):
+        """Tombstone a document; compacts the files once a quarter of the rows are dead."""
+        with self.store._write() as conn:
+            conn.execute(
+                "UPDATE documents SET deleted = 1 WHERE kind = ? AND doc_id = ?", (self.kind, doc_id)
+            )
+            self.store._bump(self.kind)
+        self.refresh()
+        if self.deleted.sum() * 4 > len(self.deleted):
+            self.compact()
+
+    def compact(self):
+        """
+        Rewrite the facet files without tombstoned rows and renumber the survivors.
+        The survivors go to new files named after the next layout, which readers only
+        open once the metadata pointing at them is committed; the old files are
+        removed afterwards (readers that already mapped them keep a valid view).
+        """
+        with self.store._write() as conn:
+            rows = conn.execute(
+                "SELECT row, doc_id FROM documents WHERE kind = ? AND deleted = 0 ORDER BY row", (self.kind,)
+            ).fetchall()
+            keep = np.array([row for row, _ in rows], dtype=np.int64)
+            total = conn.execute("SELECT COUNT(*) FROM documents WHERE kind = ?", (self.kind,)).fetchone()[0]
+            dim = self.store._dim()
+            layout = int(self.store._setting(f"layout:{self.kind}", "0"))
+            old_files = self._files(layout, dim)
+            for (path, dtype, shape), (new_path, _, _) in zip(old_files, self._files(layout + 1, dim)):
+                if total:
+                    old = np.memmap(path, dtype=dtype, mode="r", shape=(total, *shape))
+                    old[keep].tofile(new_path)
+                    del old
+                else:
+                    open(new_path, "wb").close()
+            conn.execute("DELETE FROM documents WHERE kind = ? AND deleted = 1", (self.kind,))
+            conn.executemany(
+                "UPDATE documents SET row = ? WHERE kind = ? AND doc_id = ?",
+                [(new_row, self.kind, doc_id) for new_row, (_, doc_id) in enumerate(rows)],
+            )
+            self.store._bump(self.kind)
+            self.store._bump(self.kind, "layout")
+        for path, _, _ in old_files:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def get(self, doc_id: str):
+        """Entry dict in the app's shape: {"id", "cv_text"/"jd_text", facet: {"text", "embedding"}}."""
+        self.refresh()
+        row = self._rows.get(doc_id)
+        if row is None:
+            return None
+        with self.store._lock:
+            text, facets = self.store._conn.execute(
+                "SELECT text, facets FROM documents WHERE kind = ? AND doc_id = ?", (self.kind, doc_id)
+            ).fetchone()
+        facet_texts = json.loads(facets)
+        entry = {"id": doc_id, TEXT_KEYS[self.kind]: text}
+        for facet in FACETS:
+            scales = self._scales[facet][row:row + 1] if facet in self._scales else None
+            embedding = dequantize_rows(self._matrices[facet][row:row + 1], scales)[0]
+            entry[facet] = {"text": facet_texts[facet], "embedding": embedding}
+        return entry
+
+    def ids_for_phone(self, phone: str) -> list:
+        with self.store._lock:
+            rows = self.store._conn.execute(
+                "SELECT doc_id FROM documents WHERE kind = ? AND phone = ? AND deleted = 0 ORDER BY row",
+                (self.kind, phone),
+            ).fetchall()
+        return [doc_id for (doc_id,) in rows]
+
+
+class Snapshot:
+    """
+    One version of a Collection, frozen: `ids`, `deleted`, `layout` and the mapped
+    facet matrices all describe the same rows, whatever other processes write
+    meanwhile. Implements the pool protocol of jdcv.ranking and jdcv.sharding.
+    """
+
+    def __init__(self, collection: Collection):
+        self.kind = collection.kind
+        self.dtype = collection.dtype
+        self.dim = collection.dim
+        self.ids = collection.ids
+        self.deleted = collection.deleted
+        self.layout = collection.layout
+        self._matrices = collection._matrices
+        self._scales = collection._scales
+        self._collection = collection
+
+    def snapshot(self) -> "Snapshot":
+        return self
+
+    def __len__(self):
+        return len(self.ids) - int(self.deleted.sum())
+
+    def matrix(self, facet: str) -> np.ndarray:
+        if facet not in self._matrices:
+            return np.zeros((0, self.dim or 0), dtype=storage_dtype(self.dtype))
+        return self._matrices[facet]
+
+    def scales(self, facet: str):
+        if self.dtype != "int8":
+            return None
+        return self._scales.get(facet, np.zeros(0, dtype=np.float32))
+
+    def facet_files(self, facet: str) -> tuple:
+        return _facet_files(self._collection, facet, self.layout)
+
+
+# Mapping retries when a concurrent compaction removes the files being opened.
+LOAD_ATTEMPTS = 5
+
+
+def _versioned(facet: str, layout: int) -> str:
+    # Layout 0 keeps the unversioned names of stores written before compaction was versioned.
+    return f"{facet}.{layout}" if layout else facet
+
+
+def _facet_files(collection: Collection, facet: str, layout: int = None) -> tuple:
+    layout = collection.layout if layout is None else layout
+    scale_path = collection._scale_path(facet, layout) if collection.store.dtype == "int8" else None
+    return collection._path(facet, layout), scale_path
+
+
+def _write_at(path: str, offset: int, array: np.ndarray):
+    with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+        f.seek(offset)
+        f.write(array.tobytes())
+
+
+class _WriteTransaction:
+    def __init__(self, store):
+        self.store = store
+
+    def __enter__(self):
+        self.store._lock.acquire()
+        # BEGIN IMMEDIATE also serializes writers in other processes sharing the directory.
+        self.store._conn.execute("BEGIN IMMEDIATE")
+        return self.store._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.store._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.store._lock.release()
+
+
+class DocumentStore:
+    """
+    Shared on-disk store of CVs and jobs under `root`: a SQLite metadata table
+    (IDs, phone mapping, full and facet text) plus memory-mapped facet matrices
+    per kind. Both the Streamlit app and the FastAPI backend open the same
+    directory (JDCV_DATA_DIR).
+    `dtype` ("float32", "float16" or "int8", see jdcv.quantization) is fixed when
+    the store is created; None opens an existing store in whatever dtype it uses.
+    """
+
+    def __init__(self, root: str, dtype: str = None):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(os.path.join(root, "metadata.sqlite3"),
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " doc_id TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " row INTEGER NOT NULL,"
+            " phone TEXT,"
+            " text TEXT,"
+            " facets TEXT NOT NULL,"
+            " deleted INTEGER NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS documents_kind_row ON documents (kind, row)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS documents_phone ON documents (kind, phone)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.dtype = self._storage_dtype(dtype)
+        self.cvs = Collection(self, "cv")
+        self.jobs = Collection(self, "job")
+
+    def _write(self):
+        return _WriteTransaction(self)
+
+    def _setting(self, name: str, default: str = None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM settings WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else default
+
+    def _version(self, kind: str):
+        return self._setting(f"version:{kind}", "0")
+
+    def _bump(self, kind: str, counter: str = "version"):
+        self._conn.execute(
+            "INSERT INTO settings (name, value) VALUES (?, '1')"
+            " ON CONFLICT(name) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+            (f"{counter}:{kind}",),
+        )
+
+    def _dim(self, dim: int = None):
+        """Embedding width shared by every facet file; fixed by the first document written."""
+        row = self._conn.execute("SELECT value FROM settings WHERE name = 'dim'").fetchone()
+        if row is not None:
+            if dim is not None and int(row[0]) != dim:
+                raise ValueError(f"Embedding dimension {dim} does not match store dimension {row[0]}")
+            return int(row[0])
+        if dim is not None:
+            self._conn.execute("INSERT INTO settings (name, value) VALUES ('dim', ?)", (str(dim),))
+        return dim
+
+    def _storage_dtype(self, dtype: str = None) -> str:
+        """Embedding storage dtype; fixed by the first process to open the store."""
+        if dtype is not None:
+            storage_dtype(dtype)
+        if self._setting("dtype") is None:
+            # Stores written before quantization existed hold float32 files.
+            has_documents = self._conn.execute("SELECT 1 FROM documents LIMIT 1").fetchone()
+            initial = "float32" if has_documents else (dtype or "float32")
+            self._conn.execute("INSERT OR IGNORE INTO settings (name, value) VALUES ('dtype', ?)", (initial,))
+        stored = self._setting("dtype")
+        if dtype is not None and dtype != stored:
+            raise ValueError(f"Embedding dtype {dtype} does not match store dtype {stored}")
+        return stored
@@ -0,0 +1,282 @@
+"""
+SQLite-backed work queue for CV / Job Description processing off the request path.
+
+    queue = TaskQueue(path, DocumentPipeline(store, extractor, parser))
+    task_id = queue.submit("cv", data, "pdf", phone="5551234", priority=10)
+    queue.wait(task_id, timeout=30)   # or poll queue.status(task_id)
+
+Tasks are claimed highest priority first by a pool of worker threads. Each stage
+(parse, extract, embed, store, rank) has its own concurrency limit. Facet answers
+are saved as they arrive, so a retry asks the LLM again only for the facets that
+failed. Several processes (the Streamlit app and API workers) can share one queue
+file; a claimed task is leased, and is picked up again if its worker dies.
+Per-task `options` (e.g. must-have skills) are passed through to the matcher.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from jdcv.extraction import clean_text
+from jdcv.parsing import DocumentError
+from jdcv.ranking import FACETS, rank
+from jdcv.sections import split_sections
+
+STAGES = ("parse", "extract", "embed", "store", "rank")
+DEFAULT_STAGE_LIMITS = {"parse": os.cpu_count() or 1, "extract": 8, "embed": 4, "store": 1, "rank": 2}
+TERMINAL_STATUSES = ("done", "failed")
+# Longest a worker sleeps after repeated queue errors (e.g. "database is locked").
+MAX_ERROR_BACKOFF = 30.0
+
+logger = logging.getLogger(__name__)
+
+
+class FacetExtractionError(RuntimeError):
+    """Some facets got no LLM answer; the task is retried for those facets only."""
+
+
+class TaskQueue:
+    """
+    Persistent priority queue plus `workers` threads running `processor(task, queue)`.
+    A task that raises is retried with exponential backoff up to `max_attempts`
+    times; DocumentError (unreadable or oversized file) fails it immediately.
+    """
+
+    def __init__(self, path: str, processor, workers: int = 4, stage_limits: dict = None,
+                 max_attempts: int = 3, backoff: float = 2.0, lease: float = 600.0, poll_interval: float = 1.0):
+        self.processor = processor
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.lease = lease
+        self.poll_interval = poll_interval
+        limits = {**DEFAULT_STAGE_LIMITS, **(stage_limits or {})}
+        self._stage_limits = {stage: threading.BoundedSemaphore(limit) for stage, limit in limits.items()}
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " task_id TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " priority INTEGER NOT NULL DEFAULT 0,"
+            " status TEXT NOT NULL,"
+            " stage TEXT,"
+            " file_kind TEXT NOT NULL,"
+            " data BLOB,"
+            " phone TEXT,"
+            " doc_id TEXT NOT NULL,"
+            " options TEXT,"
+            " responses TEXT,"
+            " result TEXT,"
+            " error TEXT,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " available_at REAL NOT NULL,"
+            " lease_until REAL,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        if "options" not in columns:
+            # Queue files created before per-task matching options existed.
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN options TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, priority, created_at)")
+        self._workers = [
+            threading.Thread(target=self._work, name=f"task-worker-{i}", daemon=True) for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, kind: str, data: bytes, file_kind: str, phone: str = None, priority: int = 0,
+               doc_id: str = None, options: dict = None) -> str:
+        """
+        Queue a CV (kind="cv") or JD (kind="jd") file; returns the task ID immediately.
+        `options` are JSON-serialisable keyword arguments for the matcher (e.g. must_have).
+        """
+        task_id = str(uuid.uuid4())
+        now = time.time()
+        with self._changed:
+            self._conn.execute(
+                "INSERT INTO tasks (task_id, kind, priority, status, file_kind, data, phone, doc_id, options,"
+                " available_at, created_at, updated_at) VALUES (?, ?, ?, 'queued', ?, ?, ?, ?, ?, ?, ?, ?)",
+                (task_id, kind, priority, file_kind, data, phone, doc_id or str(uuid.uuid4()),
+                 json.dumps(options) if options else None, now, now, now),
+            )
+            self._changed.notify_all()
+        return task_id
+
+    def status(self, task_id: str):
+        """Public view of a task (no file data), or None if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT task_id, kind, priority, status, stage, doc_id, result, error, attempts, created_at,"
+                " updated_at FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("task_id", "kind", "priority", "status", "stage", "doc_id", "result", "error", "attempts",
+                "created_at", "updated_at")
+        task = dict(zip(keys, row))
+        task["result"] = json.loads(task["result"]) if task["result"] else None
+        return task
+
+    def wait(self, task_id: str, timeout: float = None):
+        """Block until the task is done or failed (or `timeout` passes); returns its status."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            while True:
+                task = self.status(task_id)
+                if task is None or task["status"] in TERMINAL_STATUSES:
+                    return task
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return task
+                # Poll too: another process sharing the file never notifies this condition.
+                self._changed.wait(self.poll_interval if remaining is None else min(remaining, self.poll_interval))
+
+    def update(self, task_id: str, **fields):
+        """Save progress (stage, responses, ...) so a retry or status poll sees it."""
+        if "responses" in fields:
+            fields["responses"] = json.dumps(fields["responses"])
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._changed:
+            self._conn.execute(f"UPDATE tasks SET {assignments} WHERE task_id = ?", (*fields.values(), task_id))
+            self._changed.notify_all()
+
+    @contextmanager
+    def stage(self, task: dict, name: str):
+        """Mark the task as being in stage `name` and hold one of that stage's slots."""
+        self.update(task["task_id"], stage=name)
+        with self._stage_limits[name]:
+            yield
+
+    def _claim(self):
+        now = time.time()
+        with self._lock:
+            # Outside the try: if BEGIN itself fails (database locked) there is nothing to roll back.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT task_id, kind, file_kind, data, phone, doc_id, options, responses, attempts FROM tasks"
+                    " WHERE (status = 'queued' AND available_at <= ?) OR (status = 'running' AND lease_until < ?)"
+                    " ORDER BY priority DESC, created_at LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE tasks SET status = 'running', attempts = attempts + 1, lease_until = ?,"
+                        " updated_at = ? WHERE task_id = ?",
+                        (now + self.lease, now, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        keys = ("task_id", "kind", "file_kind", "data", "phone", "doc_id", "options", "responses", "attempts")
+        task = dict(zip(keys, row))
+        task["options"] = json.loads(task["options"]) if task["options"] else {}
+        task["responses"] = json.loads(task["responses"]) if task["responses"] else {}
+        task["attempts"] += 1
+        return task
+
+    def _run(self, task: dict):
+        try:
+            result = self.processor(task, self)
+        except Exception as exc:
+            retry = not isinstance(exc, DocumentError) and task["attempts"] < self.max_attempts
+            if retry:
+                self.update(task["task_id"], status="queued", error=str(exc), lease_until=None,
+                            available_at=time.time() + self.backoff * 2 ** (task["attempts"] - 1))
+            else:
+                self.update(task["task_id"], status="failed", error=str(exc), lease_until=None, data=None)
+            return
+        self.update(task["task_id"], status="done", stage=None, error=None, lease_until=None, data=None,
+                    result=json.dumps(result))
+
+    def _work(self):
+        errors = 0
+        while not self._stop.is_set():
+            try:
+                task = self._claim()
+                if task is not None:
+                    self._run(task)
+                errors = 0
+            except Exception:
+                # Typically "database is locked" while other processes hold the queue file;
+                # a task whose status update was lost is picked up again when its lease ends.
+                errors += 1
+                delay = min(self.poll_interval * 2 ** (errors - 1), MAX_ERROR_BACKOFF)
+                logger.exception("Task queue worker error; retrying in %.1f s", delay)
+                self._stop.wait(delay)
+                continue
+            if task is None:
+                with self._changed:
+                    self._changed.wait(self.poll_interval)
+
+    def close(self):
+        self._stop.set()
+        with self._changed:
+            self._changed.notify_all()
+
+
+class DocumentPipeline:
+    """
+    Task processor: parse -> extract facets -> embed -> store -> match.
+    `matchers` maps "cv" / "jd" to a function(entry, **options) -> ranking list, called
+    with the task's options; by default a new CV is ranked against all jobs and a new
+    JD against all CVs, top `top_k`, and options are ignored.
+    """
+
+    def __init__(self, store, extractor, parser, matchers: dict = None, top_k: int = 100):
+        self.store = store
+        self.extractor = extractor
+        self.parser = parser
+        self.matchers = {
+            "cv": lambda entry, **options: rank(store.jobs, entry, k=top_k, id_key="job_id"),
+            "jd": lambda entry, **options: rank(store.cvs, entry, k=top_k),
+            **(matchers or {}),
+        }
+
+    def __call__(self, task: dict, queue: TaskQueue) -> dict:
+        kind = task["kind"]
+        collection = self.store.cvs if kind == "cv" else self.store.jobs
+        with queue.stage(task, "parse"):
+            text = self.parser.parse(task["data"], task["file_kind"])
+            cleaned_text = clean_text(text)
+        if not cleaned_text:
+            raise DocumentError("No text could be extracted from the file.")
+
+        extracted_info = self.extractor.cached(cleaned_text, kind)
+        if extracted_info is None:
+            responses = task["responses"]
+            missing = [facet for facet in FACETS if responses.get(facet) is None]
+            if missing:
+                with queue.stage(task, "extract"):
+                    responses.update(self.extractor.ask(cleaned_text, kind, facets=missing, sections=split_sections(text)))
+                queue.update(task["task_id"], responses=responses)
+                failed = [facet for facet in FACETS if responses.get(facet) is None]
+                if failed:
+                    raise FacetExtractionError(f"Extraction failed for {', '.join(failed)}.")
+            with queue.stage(task, "embed"):
+                extracted_info, _ = self.extractor.embed(cleaned_text, kind, responses)
+
+        doc_id = task["doc_id"]
+        with queue.stage(task, "store"):
+            if doc_id not in collection:
+                collection.add(doc_id, cleaned_text, extracted_info, phone=task["phone"])
+        entry = {"id": doc_id, **{facet: extracted_info[facet] for facet in FACETS}}
+        with queue.stage(task, "rank"):
+            matches = self.matchers[kind](entry, **task["options"])
+        return {
+            "doc_id": doc_id,
+            "facets": {facet: extracted_info[facet]["text"] for facet in FACETS},
+            "matches": matches,
+        }
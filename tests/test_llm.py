@@ -0,0 +1,75 @@
+import pytest
+
+from benchmarks.mock_mistral import CANNED_ANSWERS, MockMistralServer
+from jdcv.llm import MistralClient
+
+QUESTIONS = {facet: f"What is the candidate's {facet}?" for facet in CANNED_ANSWERS}
+
+
+@pytest.fixture
+def client_for():
+    clients = []
+
+    def make(server, **options):
+        client = MistralClient("test-key", url=server.url, backoff_factor=0, **options)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def test_chat_returns_reply(client_for):
+    with MockMistralServer() as server:
+        reply = client_for(server).ask(QUESTIONS["skills"], "Some CV text")
+    assert reply == CANNED_ANSWERS["skills"]
+    assert server.requests == 1
+
+
+def test_chat_retries_transient_errors(client_for):
+    with MockMistralServer(faults=[503, 429]) as server:
+        reply = client_for(server).ask(QUESTIONS["education"], "Some CV text")
+    assert reply == CANNED_ANSWERS["education"]
+    assert server.requests == 3
+
+
+def test_chat_gives_up_after_max_retries(client_for):
+    with MockMistralServer(faults=[502] * 3) as server:
+        reply = client_for(server, max_retries=2).ask(QUESTIONS["skills"], "Some CV text")
+    assert reply is None
+    assert server.requests == 3
+
+
+def test_chat_does_not_retry_client_errors(client_for):
+    with MockMistralServer(faults=[400]) as server:
+        reply = client_for(server).ask(QUESTIONS["skills"], "Some CV text")
+    assert reply is None
+    assert server.requests == 1
+
+
+def test_chat_returns_none_for_malformed_reply(client_for):
+    with MockMistralServer(faults=["malformed"]) as server:
+        reply = client_for(server).ask(QUESTIONS["skills"], "Some CV text")
+    assert reply is None
+
+
+def test_chat_returns_none_when_unreachable(client_for):
+    server = MockMistralServer()
+    server._server.server_close()  # never started: the port refuses connections
+    assert client_for(server, max_retries=0).ask(QUESTIONS["skills"], "Some CV text") is None
+
+
+def test_extract_facets_isolates_failures(client_for):
+    with MockMistralServer(faults=["malformed"]) as server:
+        answers = client_for(server, max_concurrency=1).extract_facets(QUESTIONS, "Some CV text")
+    assert list(answers) == list(QUESTIONS)
+    assert sum(answer is None for answer in answers.values()) == 1
+    assert {answer for answer in answers.values() if answer} <= set(CANNED_ANSWERS.values())
+
+
+def test_extract_structured_falls_back_per_facet(client_for):
+    with MockMistralServer(faults=["malformed"]) as server:
+        answers = client_for(server).extract_structured(QUESTIONS, "Some CV text")
+    assert answers == CANNED_ANSWERS
+    assert server.requests == 1 + len(QUESTIONS)
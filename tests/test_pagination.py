@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from jdcv.pagination import RankedResults, StaleCursorError, decode_cursor, encode_cursor
+from jdcv.ranking import FACETS, rank
+from jdcv.store import DocumentStore
+
+DIM = 16
+
+
+def entry(seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    return {facet: {"text": f"{facet} of document {seed}", "embedding": rng.normal(size=DIM)} for facet in FACETS}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DocumentStore(str(tmp_path))
+    for i in range(30):
+        store.cvs.add(f"cv-{i}", f"cv {i}", entry(i))
+    return store
+
+
+def ids(items):
+    return [item["cv_id"] for item in items]
+
+
+def read_by_request(store, job, size, cursor=None, **options):
+    """Every page from `cursor` on, each through a fresh RankedResults as separate HTTP requests would."""
+    items = []
+    while True:
+        page = RankedResults(store.cvs, job, **options).page(cursor, size)
+        items += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(0.8125, 17, 40, 3)
+    assert decode_cursor(cursor) == {"score": 0.8125, "row": 17, "returned": 40, "layout": 3}
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+
+
+@pytest.mark.parametrize("size", [1, 7, 30, 100])
+def test_pages_match_the_full_ranking(store, size):
+    job = entry(100)
+    expected = ids(rank(store.cvs, job))
+    assert ids(read_by_request(store, job, size)) == expected
+    assert ids(RankedResults(store.cvs, job)) == expected
+    streamed = [item for page in RankedResults(store.cvs, job).iter_pages(size) for item in page["items"]]
+    assert ids(streamed) == expected
+
+
+def test_limit_and_min_score(store):
+    job = entry(100)
+    full = rank(store.cvs, job)
+    assert ids(read_by_request(store, job, 4, limit=10)) == ids(full[:10])
+    threshold = full[12]["score"]
+    assert ids(read_by_request(store, job, 5, min_score=threshold)) == ids(full[:13])
+
+
+def test_tied_scores_are_paged_by_row(tmp_path):
+    store = DocumentStore(str(tmp_path))
+    for i in range(10):
+        store.cvs.add(f"cv-{i}", f"cv {i}", entry(1 if i % 2 else 2))  # two groups of equal scores
+    job = entry(1)
+    expected = [f"cv-{i}" for i in (1, 3, 5, 7, 9, 0, 2, 4, 6, 8)]
+    assert ids(read_by_request(store, job, 3)) == expected
+    streamed = [item for page in RankedResults(store.cvs, job).iter_pages(3) for item in page["items"]]
+    assert ids(streamed) == expected
+
+
+def test_tombstone_between_pages_neither_repeats_nor_skips(store):
+    job = entry(100)
+    expected = ids(rank(store.cvs, job))
+    first = RankedResults(store.cvs, job).page(size=10)
+    # One CV already returned and one not yet returned are deleted before the next request.
+    store.cvs.delete(expected[3])
+    store.cvs.delete(expected[15])
+    rest = read_by_request(store, job, 10, first["next_cursor"])
+    assert ids(first["items"]) == expected[:10]
+    assert ids(rest) == [cv_id for cv_id in expected[10:] if cv_id != expected[15]]
+
+
+def test_one_results_object_keeps_its_snapshot(store):
+    job = entry(100)
+    expected = ids(rank(store.cvs, job))
+    results = RankedResults(store.cvs, job)
+    pages = results.iter_pages(10)
+    items = next(pages)["items"]
+    store.cvs.delete(expected[15])
+    for page in pages:
+        items += page["items"]
+    assert ids(items) == expected
+
+
+def test_cursor_is_stale_after_compaction(store):
+    job = entry(100)
+    cursor = RankedResults(store.cvs, job).page(size=5)["next_cursor"]
+    for i in range(10):
+        store.cvs.delete(f"cv-{i}")
+    with pytest.raises(StaleCursorError):
+        RankedResults(store.cvs, job).page(cursor, 5)
+
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from jdcv.ranking import FACETS, rank
+from jdcv.ranking_book import RankingBook
+from jdcv.store import DocumentStore
+
+DIM = 16
+K = 3
+
+
+def entry(seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    return {facet: {"text": f"{facet} of document {seed}", "embedding": rng.normal(size=DIM)} for facet in FACETS}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DocumentStore(str(tmp_path))
+    for i in range(10):
+        store.cvs.add(f"cv-{i}", f"cv {i}", entry(i))
+    store.jobs.add("job", "job", entry(100))
+    return store
+
+
+def exact(store, job_id="job"):
+    return rank(store.cvs, store.jobs.get(job_id), k=K)
+
+
+def assert_same_ranking(got, expected):
+    assert [r["cv_id"] for r in got] == [r["cv_id"] for r in expected]
+    assert [r["score"] for r in got] == pytest.approx([r["score"] for r in expected], abs=1e-5)
+
+
+def test_sync_ranks_new_jobs_exactly(store):
+    book = RankingBook(store, k=K)
+    assert_same_ranking(book.ranking("job"), exact(store))
+
+
+def test_sync_merges_new_cvs_incrementally(store):
+    book = RankingBook(store, k=K)
+    book.sync()
+    store.cvs.add("twin", "twin", entry(100))  # same embeddings as the job: the best match
+    for i in range(10, 20):
+        store.cvs.add(f"cv-{i}", f"cv {i}", entry(i))
+    ranking = book.ranking("job")
+    assert ranking[0]["cv_id"] == "twin"
+    assert_same_ranking(ranking, exact(store))
+
+
+def test_deleted_cvs_are_evicted_and_backfilled(store):
+    book = RankingBook(store, k=K)
+    best = book.ranking("job")[0]["cv_id"]
+    store.cvs.delete(best)
+    book.remove_cv(best)
+    ranking = book.ranking("job")
+    assert best not in [r["cv_id"] for r in ranking]
+    assert_same_ranking(ranking, exact(store))
+
+
+def test_deleted_jobs_are_dropped(store):
+    book = RankingBook(store, k=K)
+    book.sync()
+    store.jobs.delete("job")
+    assert book.ranking("job") == []
+
+
+def test_merge_ranking_seeds_a_new_job(store):
+    book = RankingBook(store, k=K)
+    book.merge_ranking("job", exact(store))
+    assert_same_ranking(book.ranking("job"), exact(store))
+
+
+def test_merge_ranking_keeps_cvs_synced_after_its_snapshot(store):
+    book = RankingBook(store, k=K)
+    # A task worker ranks the new job...
+    stale = exact(store)
+    # ...while another worker stores a CV and syncs the book before the ranking is merged.
+    store.cvs.add("twin", "twin", entry(100))
+    book.sync()
+    book.merge_ranking("job", stale)
+    ranking = book.ranking("job")
+    assert ranking[0]["cv_id"] == "twin"
+    assert_same_ranking(ranking, exact(store))
+
+
+def test_merge_ranking_after_the_book_already_holds_the_job(store):
+    book = RankingBook(store, k=K)
+    book.sync()
+    stale = exact(store)
+    store.cvs.add("twin", "twin", entry(100))
+    book.sync()  # merges the twin and advances past its row
+    book.merge_ranking("job", stale)
+    assert_same_ranking(book.ranking("job"), exact(store))
@@ -0,0 +1,52 @@
+from jdcv.sections import facet_contexts, split_sections
+
+CAPS_SKILLS_CV = """Jane Doe
+Backend Engineer
+
+SKILLS
+PYTHON
+SQL
+AWS
+DOCKER
+KUBERNETES
+
+EDUCATION
+BSc Computer Science, 2015
+
+WORK EXPERIENCE:
+Backend engineer at a fintech company, 2016-2024
+"""
+
+
+def test_caps_skills_listed_one_per_line_stay_in_the_skills_section():
+    sections = split_sections(CAPS_SKILLS_CV)
+    assert sections["header"] == "Jane Doe Backend Engineer"
+    assert sections["skills"] == "PYTHON SQL AWS DOCKER KUBERNETES"
+    assert sections["education"] == "BSc Computer Science, 2015"
+    assert sections["experience"] == "Backend engineer at a fintech company, 2016-2024"
+    assert "other" not in sections
+
+
+def test_other_headings_end_the_current_section():
+    text = "SKILLS\nPython\nHOBBIES\nChess\nSkills: Go\nVOLUNTEER WORK:\nCoding club\nReferences:\nOn request"
+    sections = split_sections(text)
+    assert sections["skills"] == "Python Go"
+    assert sections["other"] == "HOBBIES Chess VOLUNTEER WORK: Coding club References: On request"
+
+
+def test_inline_heading_keeps_the_rest_of_its_line():
+    sections = split_sections("Skills: Python, SQL\nEducation: BSc\n- Experience: 3 years at ACME")
+    assert sections == {"skills": "Python, SQL", "education": "BSc", "experience": "3 years at ACME"}
+
+
+def test_facet_contexts_fall_back_to_full_text_without_sections():
+    text = "Python developer with a BSc and 3 years of experience"
+    contexts = facet_contexts(split_sections(text), "cv", ["skills", "education"], text)
+    assert contexts == {"skills": text, "education": text}
+
+
+def test_facet_contexts_send_the_header_and_the_facet_sections():
+    sections = split_sections(CAPS_SKILLS_CV)
+    contexts = facet_contexts(sections, "cv", ["skills", "education"], CAPS_SKILLS_CV)
+    assert contexts["skills"] == " ".join([sections["header"], sections["skills"], sections["experience"]])
+    assert contexts["education"] == " ".join([sections["header"], sections["education"]])
@@ -0,0 +1,108 @@
+import os
+
+import numpy as np
+import pytest
+
+from jdcv.ranking import FACETS, rank, score_pool, snapshot
+from jdcv.store import DocumentStore
+
+DIM = 16
+
+
+def entry(seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    return {facet: {"text": f"{facet} of document {seed}", "embedding": rng.normal(size=DIM)} for facet in FACETS}
+
+
+def fill(collection, n: int, start: int = 0):
+    for i in range(start, start + n):
+        collection.add(f"cv-{i}", f"text {i}", entry(i))
+
+
+@pytest.fixture(params=["float32", "int8"])
+def store(request, tmp_path):
+    return DocumentStore(str(tmp_path), dtype=request.param)
+
+
+def test_add_and_get_round_trip(store):
+    fill(store.cvs, 3)
+    assert len(store.cvs) == 3
+    assert "cv-1" in store.cvs
+    got = store.cvs.get("cv-1")
+    expected = entry(1)
+    assert got["cv_text"] == "text 1"
+    for facet in FACETS:
+        vector = expected[facet]["embedding"] / np.linalg.norm(expected[facet]["embedding"])
+        assert got[facet]["text"] == expected[facet]["text"]
+        np.testing.assert_allclose(got[facet]["embedding"], vector, atol=0.02)
+
+
+def test_appends_are_visible_to_other_processes(store, tmp_path):
+    other = DocumentStore(str(tmp_path))
+    fill(store.cvs, 2)
+    assert other.cvs.live_ids() == ["cv-0", "cv-1"]
+    fill(other.cvs, 1, start=2)
+    assert store.cvs.live_ids() == ["cv-0", "cv-1", "cv-2"]
+
+
+def test_delete_tombstones_the_row(store):
+    fill(store.cvs, 8)
+    store.cvs.delete("cv-3")
+    assert store.cvs.layout == 0
+    assert store.cvs.ids[3] is None
+    assert store.cvs.deleted.tolist() == [i == 3 for i in range(8)]
+    assert "cv-3" not in store.cvs and store.cvs.get("cv-3") is None
+    ranking = rank(store.cvs, entry(3))
+    assert len(ranking) == 7
+    assert "cv-3" not in [r["cv_id"] for r in ranking]
+
+
+def test_compaction_renumbers_rows_into_versioned_files(store):
+    fill(store.cvs, 8)
+    before = {r["cv_id"]: r["score"] for r in rank(store.cvs, entry(100))}
+    for i in (1, 4, 6):
+        store.cvs.delete(f"cv-{i}")  # the third delete crosses a quarter and compacts
+    current = snapshot(store.cvs)
+    assert current.layout == 1
+    assert current.ids == ["cv-0", "cv-2", "cv-3", "cv-5", "cv-7"]
+    assert not current.deleted.any()
+    files = sorted(os.listdir(store.cvs.directory))
+    assert all(".1." in name for name in files), files
+    after = {r["cv_id"]: r["score"] for r in rank(store.cvs, entry(100))}
+    assert after == pytest.approx({cv_id: before[cv_id] for cv_id in after})
+    fill(store.cvs, 1, start=8)
+    assert store.cvs.rows_for(["cv-8"]).tolist() == [5]
+
+
+def test_reader_follows_compaction_by_another_process(store, tmp_path):
+    fill(store.cvs, 8)
+    reader = DocumentStore(str(tmp_path))
+    assert len(reader.cvs) == 8
+    for i in range(3):
+        store.cvs.delete(f"cv-{i}")
+    assert snapshot(reader.cvs).layout == 1
+    assert reader.cvs.live_ids() == [f"cv-{i}" for i in range(3, 8)]
+    np.testing.assert_array_equal(reader.cvs.matrix("skills"), store.cvs.matrix("skills"))
+
+
+def test_snapshot_is_isolated_from_a_concurrent_compaction(store, tmp_path):
+    fill(store.cvs, 8)
+    frozen = snapshot(store.cvs)
+    scores = score_pool(frozen, entry(100))
+    writer = DocumentStore(str(tmp_path))
+    for i in range(3):
+        writer.cvs.delete(f"cv-{i}")
+    fill(writer.cvs, 2, start=8)
+
+    # The old files are gone from the directory but stay mapped by the snapshot.
+    assert frozen.layout == 0 and len(frozen.ids) == 8
+    assert frozen.matrix("skills").shape == (8, DIM)
+    np.testing.assert_array_equal(score_pool(frozen, entry(100)), scores)
+    assert [r["cv_id"] for r in rank(frozen, entry(100))] == \
+        [frozen.ids[i] for i in np.argsort(-scores, kind="stable")]
+
+    current = snapshot(store.cvs)
+    assert current.layout == 1
+    assert current.ids == [f"cv-{i}" for i in range(3, 10)]
+    assert current.matrix("skills").shape == (7, DIM)
+    assert current.facet_files("skills")[0] != frozen.facet_files("skills")[0]
@@ -0,0 +1,128 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from benchmarks.mock_mistral import MockMistralServer
+from benchmarks.pipeline import HashEncoder
+from jdcv.embeddings import EmbeddingService
+from jdcv.extraction import DocumentExtractor
+from jdcv.llm import MistralClient
+from jdcv.parsing import DocumentError
+from jdcv.ranking import FACETS
+from jdcv.store import DocumentStore
+from jdcv.tasks import DocumentPipeline, TaskQueue
+
+CV_TEXT = b"Skills: Python, SQL\nEducation: BSc Computer Science\nExperience: Backend engineer for 4 years"
+
+
+@pytest.fixture
+def queue_for(tmp_path):
+    queues = []
+
+    def make(processor, **options):
+        options = {"workers": 1, "backoff": 0, "poll_interval": 0.05, **options}
+        queue = TaskQueue(str(tmp_path / "tasks.sqlite3"), processor, **options)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.close()
+
+
+class TextParser:
+    """Decodes text files in-process, standing in for DocumentParser's process pool."""
+
+    def parse(self, data: bytes, kind: str) -> str:
+        return data.decode("utf-8")
+
+
+def test_tasks_run_highest_priority_first(queue_for):
+    started, release, order = threading.Event(), threading.Event(), []
+
+    def processor(task, queue):
+        if task["kind"] == "blocker":
+            started.set()
+            release.wait(5)
+        order.append(task["kind"])
+        return {}
+
+    queue = queue_for(processor)
+    queue.submit("blocker", b"", "txt")
+    assert started.wait(5)
+    ids = [queue.submit(kind, b"", "txt", priority=priority) for kind, priority in
+           (("low", 0), ("high", 10), ("normal", 5), ("low-2", 0))]
+    release.set()
+    for task_id in ids:
+        assert queue.wait(task_id, timeout=5)["status"] == "done"
+    assert order == ["blocker", "high", "normal", "low", "low-2"]
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(queue_for):
+    hung = threading.Event()
+
+    def stuck(task, queue):
+        hung.set()
+        time.sleep(5)  # a worker that died without releasing its task
+
+    first = queue_for(stuck, lease=0.2)
+    task_id = first.submit("cv", b"x", "txt")
+    assert hung.wait(5)
+    first.close()
+
+    second = queue_for(lambda task, queue: {"attempt": task["attempts"]})
+    task = second.wait(task_id, timeout=5)
+    assert task["status"] == "done"
+    assert task["attempts"] == 2 and task["result"] == {"attempt": 2}
+
+
+def test_failing_task_is_retried_up_to_max_attempts(queue_for):
+    calls = []
+
+    def flaky(task, queue):
+        calls.append(task["attempts"])
+        raise RuntimeError("LLM unavailable")
+
+    queue = queue_for(flaky, max_attempts=3)
+    task = queue.wait(queue.submit("cv", b"x", "txt"), timeout=5)
+    assert task["status"] == "failed" and task["error"] == "LLM unavailable"
+    assert calls == [1, 2, 3] and task["attempts"] == 3
+
+
+def test_document_errors_are_not_retried(queue_for):
+    def unreadable(task, queue):
+        raise DocumentError("Error reading PDF file.")
+
+    queue = queue_for(unreadable, max_attempts=3)
+    task = queue.wait(queue.submit("cv", b"x", "pdf"), timeout=5)
+    assert task["status"] == "failed" and task["attempts"] == 1
+
+
+def test_retry_asks_only_for_failed_facets(queue_for, tmp_path):
+    store = DocumentStore(str(tmp_path / "store"))
+    with MockMistralServer(faults=["malformed"]) as server:
+        client = MistralClient("test-key", url=server.url, backoff_factor=0, max_concurrency=1)
+        extractor = DocumentExtractor(client, EmbeddingService(HashEncoder(dim=32)))
+        queue = queue_for(DocumentPipeline(store, extractor, TextParser()), max_attempts=3)
+        task = queue.wait(queue.submit("cv", CV_TEXT, "txt"), timeout=10)
+        client.close()
+    assert task["status"] == "done" and task["attempts"] == 2
+    # One facet's reply was malformed: the retry re-asked for that facet only.
+    assert server.requests == len(FACETS) + 1
+    assert task["doc_id"] in store.cvs
+    assert set(task["result"]["facets"]) == set(FACETS)
+
+
+def test_workers_survive_queue_errors(queue_for, tmp_path):
+    queue = queue_for(lambda task, queue: {}, workers=2)
+    queue._conn.execute("PRAGMA busy_timeout = 20")
+    # Another process holds the write lock: every claim fails with "database is locked".
+    other = sqlite3.connect(str(tmp_path / "tasks.sqlite3"), isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    time.sleep(0.3)
+    other.execute("COMMIT")
+    other.close()
+    assert all(worker.is_alive() for worker in queue._workers)
+    assert queue.wait(queue.submit("cv", b"x", "txt"), timeout=10)["status"] == "done"